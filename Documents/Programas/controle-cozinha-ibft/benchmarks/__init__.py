@@ -0,0 +1 @@
+"""Benchmarks do backend contra um Google Sheets simulado (sem credenciais nem rede)"""
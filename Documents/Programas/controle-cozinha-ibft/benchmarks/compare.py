@@ -0,0 +1,73 @@
+"""
+Comparar dois resultados de benchmarks/run.py (ex.: antes e depois de uma alteração).
+
+Uso:
+    python -m benchmarks.compare benchmarks/results/antes.json benchmarks/results/depois.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'upstream_calls_per_request')
+
+
+def _load(path: Path) -> dict:
+    report = json.loads(path.read_text())
+    return {(result['route'], result['concurrency']): result for result in report['results']}
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    if before == 0:
+        return None if after == 0 else float('inf')
+    return (after - before) / before
+
+
+def compare(base: Path, current: Path, threshold: float) -> List[str]:
+    """Imprimir a variação de cada métrica por rota; retorna as regressões acima do limite"""
+    before, after = _load(base), _load(current)
+    regressions = []
+    print(f"{'rota':<45} {'c':>3} " + ' '.join(f"{metric:>26}" for metric in METRICS) + f" {'erros':>9}")
+    for key in sorted(before.keys() & after.keys()):
+        route, concurrency = key
+        cells = []
+        for metric in METRICS:
+            old, new = before[key][metric], after[key][metric]
+            change = _change(old, new)
+            label = '' if change is None else f"{change:+.0%}"
+            cells.append(f"{old:>9.2f} → {new:>9.2f} {label:>5}")
+            # Latências só contam como regressão acima de 1 ms, para não acusar ruído em rotas instantâneas
+            if change is not None and change > threshold and (metric == METRICS[-1] or new - old > 1):
+                regressions.append(f"{route} (c={concurrency}): {metric} {old} → {new}")
+        errors = f"{before[key]['errors']}→{after[key]['errors']}"
+        print(f"{route:<45} {concurrency:>3} " + ' '.join(f"{cell:>26}" for cell in cells) + f" {errors:>9}")
+        if after[key]['errors'] > before[key]['errors']:
+            regressions.append(f"{route} (c={concurrency}): erros {before[key]['errors']} → {after[key]['errors']}")
+
+    for key in sorted(before.keys() ^ after.keys()):
+        print(f"{key[0]:<45} {key[1]:>3} presente só em {'base' if key in before else 'atual'}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Comparar dois resultados do benchmark")
+    parser.add_argument('base', type=Path, help="resultado de referência (versão anterior)")
+    parser.add_argument('current', type=Path, help="resultado a avaliar")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="piora relativa a partir da qual a métrica conta como regressão (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    regressions = compare(args.base, args.current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\nNenhuma regressão acima do limite")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,281 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional
+
+import gspread
+import requests
+
+# Métodos que a API do Google conta como leitura; os demais contam como escrita
+READ_CALLS = {
+    'Client.open_by_key', 'Spreadsheet.worksheets', 'Spreadsheet.worksheet', 'Spreadsheet.values_batch_get',
+    'Worksheet.get_all_records', 'Worksheet.get_all_values', 'Worksheet.row_values', 'Worksheet.col_values'
+}
+
+ROW_RANGE = re.compile(r'^(\d+):(\d+)$')
+
+
+def _api_error(code: int, message: str, status: str) -> gspread.exceptions.APIError:
+    """Montar o mesmo APIError que o gspread lança para uma resposta de erro da API"""
+    response = requests.Response()
+    response.status_code = code
+    response._content = json.dumps({'error': {'code': code, 'message': message, 'status': status}}).encode()
+    return gspread.exceptions.APIError(response)
+
+
+def _cell(value) -> str:
+    # Valores lidos da API vêm formatados como texto (FORMATTED_VALUE)
+    return '' if value is None else str(value)
+
+
+def _trim(row: List[str]) -> List[str]:
+    # A API omite as células vazias no fim de cada linha
+    end = len(row)
+    while end and row[end - 1] == '':
+        end -= 1
+    return row[:end]
+
+
+class Upstream:
+    """Estado compartilhado do Google Sheets simulado: latência, cotas por minuto e contagem de chamadas"""
+
+    def __init__(self, read_latency: float = 0.15, write_latency: float = 0.25, jitter: float = 0.2,
+                 reads_per_minute: int = 300, writes_per_minute: int = 300, seed: Optional[int] = None):
+        # Latências em segundos, variando ±jitter (fração); cotas <= 0 desativam o limite
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+        self.jitter = jitter
+        self.limits = {'read': reads_per_minute, 'write': writes_per_minute}
+        self.calls: Counter = Counter()
+        self.rejected: Counter = Counter()
+        self._windows: Dict[str, Deque[float]] = {'read': deque(), 'write': deque()}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def call(self, name: str):
+        """Registrar uma requisição à API: conta, aplica a cota e espera a latência simulada"""
+        kind = 'read' if name in READ_CALLS else 'write'
+        with self._lock:
+            self.calls[name] += 1
+            limit = self.limits[kind]
+            if limit > 0:
+                now = time.monotonic()
+                window = self._windows[kind]
+                while window and now - window[0] >= 60:
+                    window.popleft()
+                if len(window) >= limit:
+                    self.rejected[kind] += 1
+                    raise _api_error(
+                        429, f"Quota exceeded for quota metric '{kind.title()} requests' (simulado)",
+                        'RESOURCE_EXHAUSTED'
+                    )
+                window.append(now)
+            latency = self.read_latency if kind == 'read' else self.write_latency
+            latency *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def snapshot(self) -> Counter:
+        """Cópia das contagens por método, para calcular a diferença entre dois momentos"""
+        with self._lock:
+            return Counter(self.calls)
+
+
+# Mesmos nomes das classes do gspread: as métricas do backend classificam as chamadas pelo __qualname__
+class Worksheet:
+    """Aba simulada, guardada em memória como lista de linhas de texto"""
+
+    def __init__(self, spreadsheet: 'Spreadsheet', sheet_id: int, title: str, rows: int, cols: int):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self._rows: List[List[str]] = []
+
+    def _call(self, name: str):
+        self.spreadsheet.upstream.call(f"Worksheet.{name}")
+
+    def _range_name(self, first_row: int, last_row: int, width: int) -> str:
+        last_cell = gspread.utils.rowcol_to_a1(last_row, max(width, 1))
+        return f"'{self.title}'!A{first_row}:{last_cell}"
+
+    def _append(self, rows: List[list]) -> dict:
+        first_row = len(self._rows) + 1
+        self._rows.extend([_cell(value) for value in row] for row in rows)
+        self.row_count = max(self.row_count, len(self._rows))
+        width = max((len(row) for row in rows), default=1)
+        return {'updates': {'updatedRange': self._range_name(first_row, len(self._rows), width),
+                            'updatedRows': len(rows)}}
+
+    def _write(self, range_name: str, values: List[list]):
+        range_name = range_name.split('!')[-1]
+        match = ROW_RANGE.match(range_name)
+        if match:
+            row, col = int(match.group(1)), 1
+        else:
+            row, col = gspread.utils.a1_to_rowcol(range_name.split(':')[0])
+        for offset, values_row in enumerate(values):
+            while len(self._rows) < row + offset:
+                self._rows.append([])
+            target = self._rows[row + offset - 1]
+            target.extend([''] * (col - 1 + len(values_row) - len(target)))
+            target[col - 1:col - 1 + len(values_row)] = [_cell(value) for value in values_row]
+        self.row_count = max(self.row_count, len(self._rows))
+
+    def _values(self) -> List[List[str]]:
+        return [_trim(row) for row in self._rows]
+
+    def seed(self, rows: List[list]):
+        """Preencher a aba sem contar chamadas (dados iniciais do benchmark)"""
+        self._append(rows)
+
+    def append_row(self, values, table_range: Optional[str] = None, **kwargs) -> dict:
+        self._call('append_row')
+        return self._append([values])
+
+    def append_rows(self, values, table_range: Optional[str] = None, **kwargs) -> dict:
+        self._call('append_rows')
+        return self._append(values)
+
+    def get_all_values(self, **kwargs) -> List[List[str]]:
+        self._call('get_all_values')
+        width = max((len(row) for row in self._rows), default=0)
+        return [list(row) + [''] * (width - len(row)) for row in self._rows]
+
+    def get_all_records(self, **kwargs) -> List[dict]:
+        self._call('get_all_records')
+        values = self._values()
+        if not values:
+            return []
+        headers = values[0]
+        return [
+            dict(zip(headers, gspread.utils.numericise_all(row + [''] * (len(headers) - len(row)))))
+            for row in values[1:]
+        ]
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        self._call('row_values')
+        return _trim(self._rows[row - 1]) if 0 < row <= len(self._rows) else []
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        self._call('col_values')
+        return _trim([row[col - 1] if len(row) >= col else '' for row in self._rows])
+
+    def update(self, values=None, range_name: Optional[str] = None, **kwargs) -> dict:
+        self._call('update')
+        self._write(range_name or 'A1', values)
+        return {'updatedRange': range_name}
+
+    def batch_update(self, data, **kwargs) -> dict:
+        self._call('batch_update')
+        for entry in data:
+            self._write(entry['range'], entry['values'])
+        return {'totalUpdatedRows': len(data)}
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> dict:
+        self._call('delete_rows')
+        del self._rows[start_index - 1:end_index or start_index]
+        return {}
+
+    def clear(self) -> dict:
+        self._call('clear')
+        self._rows = []
+        return {}
+
+    def add_cols(self, cols: int):
+        self._call('add_cols')
+        self.col_count += cols
+
+
+class Spreadsheet:
+    """Planilha simulada: conjunto de abas e chamadas em lote"""
+
+    def __init__(self, upstream: Upstream, key: str):
+        self.upstream = upstream
+        self.id = key
+        self._worksheets: Dict[str, Worksheet] = {}
+        self._next_sheet_id = 0
+
+    def _call(self, name: str):
+        self.upstream.call(f"Spreadsheet.{name}")
+
+    def _by_range(self, range_name: str) -> Worksheet:
+        title = range_name.split('!')[0]
+        if title.startswith("'") and title.endswith("'"):
+            title = title[1:-1].replace("''", "'")
+        if title not in self._worksheets:
+            raise _api_error(400, f"Unable to parse range: {range_name}", 'INVALID_ARGUMENT')
+        return self._worksheets[title]
+
+    def seed_worksheet(self, title: str, headers: List[str], rows: List[list]) -> Worksheet:
+        """Criar uma aba já preenchida, sem contar chamadas"""
+        worksheet = self._create(title, len(rows) + 1, len(headers))
+        worksheet.seed([headers] + rows)
+        return worksheet
+
+    def _create(self, title: str, rows: int, cols: int) -> Worksheet:
+        self._next_sheet_id += 1
+        worksheet = Worksheet(self, self._next_sheet_id, title, rows, cols)
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    def worksheets(self, **kwargs) -> List[Worksheet]:
+        self._call('worksheets')
+        return list(self._worksheets.values())
+
+    def worksheet(self, title: str) -> Worksheet:
+        self._call('worksheet')
+        if title not in self._worksheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index: Optional[int] = None) -> Worksheet:
+        self._call('add_worksheet')
+        return self._create(title, rows, cols)
+
+    def values_batch_get(self, ranges: List[str], params=None) -> dict:
+        self._call('values_batch_get')
+        value_ranges = []
+        for range_name in ranges:
+            values = self._by_range(range_name)._values()
+            suffix = range_name.split('!')[1] if '!' in range_name else None
+            match = ROW_RANGE.match(suffix) if suffix else None
+            if match:
+                values = values[int(match.group(1)) - 1:int(match.group(2))]
+            entry = {'range': range_name, 'majorDimension': 'ROWS'}
+            if any(values):
+                entry['values'] = values
+            value_ranges.append(entry)
+        return {'spreadsheetId': self.id, 'valueRanges': value_ranges}
+
+    def batch_update(self, body: dict) -> dict:
+        self._call('batch_update')
+        by_id = {worksheet.id: worksheet for worksheet in self._worksheets.values()}
+        for request in body.get('requests', []):
+            if 'deleteDimension' not in request:
+                raise _api_error(400, f"Requisição não simulada: {list(request)}", 'INVALID_ARGUMENT')
+            grid = request['deleteDimension']['range']
+            del by_id[grid['sheetId']]._rows[grid['startIndex']:grid['endIndex']]
+        return {'replies': [{} for _ in body.get('requests', [])]}
+
+
+class Client:
+    """Cliente simulado: open_by_key devolve sempre a mesma planilha em memória"""
+
+    def __init__(self, upstream: Optional[Upstream] = None):
+        self.upstream = upstream or Upstream()
+        self._spreadsheets: Dict[str, Spreadsheet] = {}
+
+    def open_by_key(self, key: str) -> Spreadsheet:
+        self.upstream.call('Client.open_by_key')
+        if key not in self._spreadsheets:
+            self._spreadsheets[key] = Spreadsheet(self.upstream, key)
+        return self._spreadsheets[key]
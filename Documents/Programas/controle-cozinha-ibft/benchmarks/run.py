@@ -0,0 +1,408 @@
+"""
+Benchmark de todas as rotas da API contra o Google Sheets simulado.
+
+Uso (na pasta do backend):
+    python -m benchmarks.run --checkins 10000 --requests 50 --concurrency 1,10
+    python -m benchmarks.compare benchmarks/results/antes.json benchmarks/results/depois.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from benchmarks.fake_gspread import Client, Upstream
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+SHEET_ID = 'benchmark'
+
+
+class Dataset:
+    """Dados gerados para a planilha simulada e IDs usados pelas rotas de edição e remoção"""
+
+    def __init__(self, checkins: int, funcionarios: int, pratos: int, estoque: int, listas: int,
+                 deletable: int, seed: int):
+        self.rng = random.Random(seed)
+        self.today = date.today()
+        self.sizes = {
+            'estoque': estoque, 'funcionarios': funcionarios, 'pratos': pratos,
+            'checkins': checkins, 'listas_fixas': listas
+        }
+        # IDs 1..N podem ser editados; os N seguintes (deletable por entidade) são removidos pelas rotas DELETE
+        self._deletable = {
+            entity: iter(range(size + 1, size + deletable + 1))
+            for entity, size in self.sizes.items() if entity != 'checkins'
+        }
+        self.deletable = deletable
+        self._checkin_pairs: Iterator[tuple] = iter(())
+
+    def rows(self) -> Dict[str, List[list]]:
+        """Linhas de cada aba, no mesmo formato gravado pelo backend"""
+        rng = self.rng
+        timestamp = f"{self.today - timedelta(days=400):%Y-%m-%d} 08:00:00"
+        extra = self.deletable
+        estoque = [
+            [i, f"Item {i}", rng.randint(0, 60), rng.choice(['kg', 'un', 'l', 'cx']),
+             rng.choice(['Grãos', 'Carnes', 'Hortifruti', 'Laticínios', 'Limpeza']),
+             timestamp, timestamp, rng.randint(5, 20), rng.randint(20, 50)]
+            for i in range(1, self.sizes['estoque'] + extra + 1)
+        ]
+        funcionarios = [
+            [i, f"Funcionário {i}", rng.choice(['Cozinheiro', 'Auxiliar', 'Professor', 'Administrativo']),
+             str(rng.random() > 0.1), timestamp, timestamp]
+            for i in range(1, self.sizes['funcionarios'] + extra + 1)
+        ]
+        ativos = [row[0] for row in funcionarios[:self.sizes['funcionarios']] if row[3] == 'True']
+        self._checkin_pairs = self._future_pairs(ativos)
+        pratos = [
+            [i, f"Prato {i}", f"Descrição do prato {i}", f"{self.today - timedelta(days=i % 365):%Y-%m-%d}",
+             str(i <= 5), timestamp, timestamp]
+            for i in range(1, self.sizes['pratos'] + extra + 1)
+        ]
+        checkins = []
+        for i in range(1, self.sizes['checkins'] + 1):
+            funcionario_id = rng.randint(1, self.sizes['funcionarios'])
+            prato_id = rng.randint(1, self.sizes['pratos'])
+            dia = self.today - timedelta(days=rng.randint(0, 364))
+            checkins.append([
+                i, funcionario_id, f"Funcionário {funcionario_id}", prato_id, f"Prato {prato_id}",
+                f"{dia:%Y-%m-%d}", f"{rng.randint(11, 13):02d}:{rng.randint(0, 59):02d}", f"{dia:%Y-%m-%d} 12:00:00"
+            ])
+        listas = [
+            [i, f"Lista {i}", json.dumps([
+                {'id': str(j), 'nome': f"Item {j}", 'quantidade': rng.randint(1, 10)} for j in range(1, 11)
+            ], ensure_ascii=False), timestamp, timestamp]
+            for i in range(1, self.sizes['listas_fixas'] + extra + 1)
+        ]
+        return {
+            'Estoque': estoque, 'Funcionarios': funcionarios, 'Pratos': pratos,
+            'CheckIns': checkins, 'ListasCompras': listas
+        }
+
+    def existing(self, entity: str) -> int:
+        """ID de um registro que nunca é removido pelo benchmark"""
+        return self.rng.randint(1, self.sizes[entity])
+
+    def next_deletable(self, entity: str) -> int:
+        """ID ainda não removido; 0 (inexistente) quando a reserva acaba"""
+        return next(self._deletable[entity], 0)
+
+    def _future_pairs(self, funcionarios: List[int]) -> Iterator[tuple]:
+        # Check-ins novos vão para dias futuros: nunca repetem (funcionário, data) da planilha inicial
+        for days_ahead in itertools.count(1):
+            for funcionario_id in funcionarios:
+                yield funcionario_id, f"{self.today + timedelta(days=days_ahead):%Y-%m-%d}"
+
+    def next_checkin(self) -> tuple:
+        """(funcionário ativo, data) ainda sem check-in"""
+        return next(self._checkin_pairs)
+
+    def day(self, days_ago: int = 0) -> str:
+        return f"{self.today - timedelta(days=days_ago):%Y-%m-%d}"
+
+
+class Scenario:
+    """Uma rota exercitada pelo benchmark: método, caminho e corpo gerados a cada requisição"""
+
+    def __init__(self, name: str, method: str, path: Callable[[Dataset], str],
+                 body: Optional[Callable[[Dataset], object]] = None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+
+
+def _estoque_body(data: Dataset) -> dict:
+    return {'nome': f"Item novo {data.rng.randint(1, 10 ** 6)}", 'quantidade': data.rng.randint(0, 50),
+            'unidade': 'kg', 'categoria': 'Grãos', 'estoque_minimo': 10}
+
+
+def _funcionario_body(data: Dataset) -> dict:
+    return {'nome': f"Funcionário novo {data.rng.randint(1, 10 ** 6)}", 'cargo': 'Auxiliar', 'ativo': True}
+
+
+def _prato_body(data: Dataset) -> dict:
+    return {'nome': f"Prato novo {data.rng.randint(1, 10 ** 6)}", 'descricao': 'Benchmark', 'data': data.day()}
+
+
+def _checkin_body(data: Dataset) -> dict:
+    funcionario_id, dia = data.next_checkin()
+    # Só os pratos 1..5 da planilha inicial estão ativos
+    return {'funcionario_id': funcionario_id, 'prato_id': data.rng.randint(1, min(5, data.sizes['pratos'])),
+            'data': dia, 'horario': '12:00'}
+
+
+def _lista_body(data: Dataset) -> dict:
+    return {'nome': f"Lista nova {data.rng.randint(1, 10 ** 6)}",
+            'itens': [{'id': '1', 'nome': 'Arroz', 'quantidade': 2}]}
+
+
+# Corpos de criação e atualização de cada entidade editável
+BODIES = {
+    'estoque': (_estoque_body, lambda data: {'quantidade': data.rng.randint(0, 50)}),
+    'funcionarios': (_funcionario_body, lambda data: {'cargo': data.rng.choice(['Auxiliar', 'Cozinheiro'])}),
+    'pratos': (_prato_body, lambda data: {'descricao': f"Atualizado {data.rng.randint(1, 10 ** 6)}"}),
+    'listas_fixas': (_lista_body, lambda data: {'nome': f"Lista {data.rng.randint(1, 10 ** 6)}"})
+}
+
+
+def _bulk_body(entity: str) -> Callable[[Dataset], dict]:
+    create, update = BODIES[entity]
+
+    def body(data: Dataset) -> dict:
+        # Lote misto: 4 criações, 4 atualizações e 2 remoções
+        operacoes = [{'acao': 'create', 'dados': create(data)} for _ in range(4)]
+        operacoes += [{'acao': 'update', 'id': data.existing(entity), 'dados': update(data)} for _ in range(4)]
+        operacoes += [{'acao': 'delete', 'id': data.next_deletable(entity)} for _ in range(2)]
+        return {'operacoes': operacoes}
+    return body
+
+
+def _crud(entity: str, route: str) -> List[Scenario]:
+    create, update = BODIES[entity]
+    scenarios = [
+        Scenario(f"GET {route}", 'GET', lambda data: route),
+        Scenario(f"POST {route}", 'POST', lambda data: route, create),
+        Scenario(f"PUT {route}/{{id}}", 'PUT', lambda data: f"{route}/{data.existing(entity)}", update),
+        Scenario(f"DELETE {route}/{{id}}", 'DELETE', lambda data: f"{route}/{data.next_deletable(entity)}")
+    ]
+    if entity != 'listas_fixas':
+        scenarios.insert(1, Scenario(
+            f"GET {route}?limit=50&sort=-id", 'GET', lambda data: f"{route}?limit=50&sort=-id"
+        ))
+        scenarios.append(Scenario(f"POST {route}/bulk", 'POST', lambda data: f"{route}/bulk", _bulk_body(entity)))
+    return scenarios
+
+
+# Todas as rotas de main.py, exceto /api/events (stream sem fim; medido só pelo tempo até os cabeçalhos em /api/metrics)
+SCENARIOS: List[Scenario] = [
+    Scenario("GET /api/health", 'GET', lambda data: "/api/health"),
+    *_crud('estoque', "/api/estoque"),
+    *_crud('funcionarios', "/api/funcionarios"),
+    *_crud('pratos', "/api/pratos"),
+    Scenario("GET /api/checkins", 'GET', lambda data: "/api/checkins"),
+    Scenario("GET /api/checkins?limit=100&sort=-data", 'GET', lambda data: "/api/checkins?limit=100&sort=-data"),
+    Scenario("GET /api/checkins?data=", 'GET', lambda data: f"/api/checkins?data={data.day(data.rng.randint(0, 30))}"),
+    Scenario("GET /api/checkins?de=&ate=", 'GET', lambda data: f"/api/checkins?de={data.day(30)}&ate={data.day()}"),
+    Scenario("GET /api/checkins/hoje", 'GET', lambda data: "/api/checkins/hoje"),
+    Scenario("POST /api/checkins", 'POST', lambda data: "/api/checkins", _checkin_body),
+    Scenario("POST /api/checkins/bulk", 'POST', lambda data: "/api/checkins/bulk",
+             lambda data: {'operacoes': [{'acao': 'create', 'dados': _checkin_body(data)} for _ in range(10)]}),
+    Scenario("GET /api/dashboard", 'GET', lambda data: "/api/dashboard"),
+    Scenario("GET /api/relatorios/refeicoes?agrupar=prato", 'GET',
+             lambda data: f"/api/relatorios/refeicoes?de={data.day(180)}&ate={data.day()}&agrupar=prato"),
+    Scenario("GET /api/lista-compras", 'GET', lambda data: "/api/lista-compras"),
+    *_crud('listas_fixas', "/api/listas-fixas"),
+    Scenario("POST /api/cache/refresh", 'POST', lambda data: "/api/cache/refresh"),
+    Scenario("GET /api/metrics", 'GET', lambda data: "/api/metrics")
+]
+
+
+async def asgi_request(app, method: str, path: str, body: Optional[object] = None) -> int:
+    """Enviar uma requisição direto ao app ASGI (sem rede) e retornar o status da resposta"""
+    raw_path, _, query = path.partition('?')
+    payload = json.dumps(body).encode() if body is not None else b''
+    headers = [(b'host', b'benchmark')]
+    if body is not None:
+        headers += [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+        'scheme': 'http', 'path': raw_path, 'raw_path': raw_path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': headers, 'client': ('127.0.0.1', 0), 'server': ('benchmark', 80)
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': payload, 'more_body': False}
+        # Corpo já entregue: a próxima leitura só retorna quando a conexão "cai"
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await app(scope, receive, send)
+    return status
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores já ordenados)"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+async def run_scenario(app, upstream: Upstream, data: Dataset, scenario: Scenario,
+                       requests: int, concurrency: int) -> dict:
+    """Executar uma rota `requests` vezes com `concurrency` clientes simultâneos"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining: Iterator[int] = iter(range(requests))
+    calls_before = upstream.snapshot()
+
+    async def worker():
+        for _ in remaining:
+            path = scenario.path(data)
+            body = scenario.body(data) if scenario.body else None
+            started = time.perf_counter()
+            try:
+                status = await asgi_request(app, scenario.method, path, body)
+            except Exception:
+                status = 500
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    calls = upstream.snapshot() - calls_before
+    latencies.sort()
+    return {
+        'route': scenario.name,
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': sum(count for status, count in statuses.items() if status >= 400),
+        'status': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput_rps': round(requests / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0,
+        'upstream_calls_per_request': round(sum(calls.values()) / requests, 3),
+        'upstream_calls': dict(sorted(calls.items()))
+    }
+
+
+def _git_version() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _setup_environment(args):
+    """Configurar o backend Sheets com credenciais fictícias antes de importar main.py"""
+    os.environ['STORAGE_BACKEND'] = 'sheets'
+    os.environ['GOOGLE_SHEETS_CREDENTIALS_FILE'] = 'benchmark-credentials.json'
+    os.environ['GOOGLE_SHEET_ID'] = SHEET_ID
+    # As demais opções (cache, threads, write-behind...) seguem o ambiente, para comparar configurações
+    os.environ.setdefault('WARM_UP_ON_START', 'true')
+    # Por padrão o agendador do backend conhece a cota simulada
+    os.environ.setdefault('SHEETS_READS_PER_MINUTE', str(args.reads_per_minute))
+    os.environ.setdefault('SHEETS_WRITES_PER_MINUTE', str(args.writes_per_minute))
+
+
+async def run(args) -> dict:
+    _setup_environment(args)
+    from google_sheets_service import SHEET_HEADERS
+    import main
+
+    upstream = Upstream(
+        read_latency=args.read_latency, write_latency=args.write_latency, jitter=args.jitter,
+        reads_per_minute=args.reads_per_minute, writes_per_minute=args.writes_per_minute, seed=args.seed
+    )
+    client = Client(upstream)
+    spreadsheet = client.open_by_key(SHEET_ID)
+    data = Dataset(args.checkins, args.funcionarios, args.pratos, args.estoque, args.listas,
+                   deletable=args.requests * len(args.concurrency) * 3, seed=args.seed)
+    for title, rows in data.rows().items():
+        spreadsheet.seed_worksheet(title, SHEET_HEADERS[title], rows)
+    upstream.calls.clear()
+
+    # O cliente simulado entra no lugar do autorizado pelo oauth2client; a abertura das abas segue o caminho real
+    storage = main.storage
+    storage.client, storage.sheet = client, spreadsheet
+    await asyncio.get_running_loop().run_in_executor(None, storage._initialize_sheets)
+
+    results = []
+    started = time.perf_counter()
+    async with main.app.router.lifespan_context(main.app):
+        startup = {
+            'seconds': round(getattr(main.app.state, 'startup_seconds', 0), 3),
+            'upstream_calls': dict(sorted(upstream.snapshot().items()))
+        }
+        for scenario in SCENARIOS:
+            if args.only and not any(term in scenario.name for term in args.only):
+                continue
+            for concurrency in args.concurrency:
+                result = await run_scenario(main.app, upstream, data, scenario, args.requests, concurrency)
+                results.append(result)
+                print(f"{result['route']:<45} c={concurrency:<3} p50={result['p50_ms']:>8.1f}ms "
+                      f"p95={result['p95_ms']:>8.1f}ms p99={result['p99_ms']:>8.1f}ms "
+                      f"chamadas/req={result['upstream_calls_per_request']:>6.2f} erros={result['errors']}",
+                      flush=True)
+
+    return {
+        'version': _git_version(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'duration_seconds': round(time.perf_counter() - started, 1),
+        'config': {
+            'checkins': args.checkins, 'funcionarios': args.funcionarios, 'pratos': args.pratos,
+            'estoque': args.estoque, 'listas': args.listas, 'requests': args.requests,
+            'concurrency': args.concurrency, 'read_latency': args.read_latency,
+            'write_latency': args.write_latency, 'jitter': args.jitter,
+            'reads_per_minute': args.reads_per_minute, 'writes_per_minute': args.writes_per_minute,
+            'seed': args.seed,
+            'env': {name: value for name, value in sorted(os.environ.items())
+                    if name.startswith(('SHEETS_', 'CHECKIN_', 'DASHBOARD_', 'WARM_UP_'))}
+        },
+        'startup': startup,
+        'quota_rejections': dict(upstream.rejected),
+        'results': results
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark das rotas da API contra um Google Sheets simulado")
+    parser.add_argument('--checkins', type=int, default=10000, help="check-ins na planilha inicial")
+    parser.add_argument('--funcionarios', type=int, default=200)
+    parser.add_argument('--pratos', type=int, default=100)
+    parser.add_argument('--estoque', type=int, default=300)
+    parser.add_argument('--listas', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=50, help="requisições por rota e nível de concorrência")
+    parser.add_argument('--concurrency', type=lambda value: [int(n) for n in value.split(',')], default=[1, 10],
+                        help="níveis de concorrência separados por vírgula (ex.: 1,10,50)")
+    parser.add_argument('--read-latency', type=float, default=0.15, help="segundos por leitura simulada")
+    parser.add_argument('--write-latency', type=float, default=0.25, help="segundos por escrita simulada")
+    parser.add_argument('--jitter', type=float, default=0.2, help="variação relativa da latência (0.2 = ±20%%)")
+    parser.add_argument('--reads-per-minute', type=int, default=300, help="cota de leituras por minuto (0 desativa)")
+    parser.add_argument('--writes-per-minute', type=int, default=300, help="cota de escritas por minuto (0 desativa)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', action='append', help="rodar só as rotas que contêm este texto (repetível)")
+    parser.add_argument('--output', type=Path, help="arquivo JSON de saída (padrão: benchmarks/results/)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{report['version'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    if report['quota_rejections']:
+        print(f"\nChamadas recusadas por cota (429): {report['quota_rejections']}")
+    print(f"\nResultados salvos em {output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
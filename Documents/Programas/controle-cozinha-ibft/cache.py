@@ -0,0 +1,207 @@
+import bisect
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+
+def apply_change(records: List[dict], action: str, record_id: int, record: Optional[dict]) -> Tuple[bool, Optional[dict]]:
+    """Aplicar uma alteração registrada a uma lista de registros; retorna (aplicada, registro anterior).
+
+    Idempotente: criar um ID já presente, ou atualizar/remover um ausente, não muda nada.
+    """
+    # De trás para frente: os registros mais novos, os mais alterados, estão no fim
+    position = next(
+        (i for i in range(len(records) - 1, -1, -1)
+         if records[i].get('ID') and int(records[i]['ID']) == record_id),
+        None
+    )
+    if action == 'create':
+        if position is not None:
+            return False, None
+        records.append(record)
+        return True, None
+    if position is None:
+        return False, None
+    previous = records[position]
+    if action == 'update':
+        records[position] = record
+    else:
+        del records[position]
+    return True, previous
+
+
+class CachedSheet:
+    """Registros de uma planilha mantidos em memória"""
+
+    def __init__(self, records: List[dict]):
+        self.records = records
+        self.loaded_at = time.monotonic()
+
+
+class WorksheetCache:
+    """Cache em memória por planilha, com TTL configurável e escrita direta (write-through)"""
+
+    def __init__(self, ttl: float):
+        # TTL em segundos; zero ou negativo desativa o cache
+        self.ttl = ttl
+        self._sheets: Dict[str, CachedSheet] = {}
+
+    def get(self, worksheet_name: str) -> Optional[List[dict]]:
+        """Obter registros em cache, ou None se ausentes/expirados"""
+        entry = self._sheets.get(worksheet_name)
+        if entry is None or time.monotonic() - entry.loaded_at > self.ttl:
+            # Expirados continuam guardados para stale()
+            return None
+        return entry.records
+
+    def stale(self, worksheet_name: str) -> Optional[List[dict]]:
+        """Última leitura guardada, mesmo expirada (None se nunca lida ou invalidada)"""
+        entry = self._sheets.get(worksheet_name)
+        return entry.records if entry is not None else None
+
+    def set(self, worksheet_name: str, records: List[dict]):
+        """Guardar registros recém-lidos da planilha"""
+        if self.ttl > 0:
+            self._sheets[worksheet_name] = CachedSheet(records)
+
+    def append(self, worksheet_name: str, record: dict):
+        """Adicionar registro criado ao cache (se a planilha estiver em cache)"""
+        # Também na leitura expirada: continua em dia para stale()
+        records = self.stale(worksheet_name)
+        if records is not None:
+            records.append(record)
+
+    def replace(self, worksheet_name: str, record: dict):
+        """Substituir registro atualizado no cache"""
+        records = self.stale(worksheet_name)
+        if records is None:
+            return
+        for i, cached in enumerate(records):
+            if cached.get('ID') and int(cached['ID']) == int(record['ID']):
+                records[i] = record
+                return
+        # Registro não estava no cache: descartar para forçar nova leitura
+        self.invalidate(worksheet_name)
+
+    def remove(self, worksheet_name: str, record_id: int):
+        """Remover registro deletado do cache"""
+        records = self.stale(worksheet_name)
+        if records is None:
+            return
+        for i, cached in enumerate(records):
+            if cached.get('ID') and int(cached['ID']) == record_id:
+                del records[i]
+                return
+
+    def invalidate(self, worksheet_name: Optional[str] = None):
+        """Descartar o cache de uma planilha (ou de todas)"""
+        if worksheet_name is None:
+            self._sheets.clear()
+        else:
+            self._sheets.pop(worksheet_name, None)
+
+
+class RowIndex:
+    """Índice ID -> número da linha na planilha, por planilha"""
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[int, int]] = {}
+
+    def build(self, worksheet_name: str, records: List[dict]):
+        """Reconstruir o índice a partir de uma leitura completa (linha 1 é o cabeçalho)"""
+        self._rows[worksheet_name] = {
+            int(record['ID']): row_number
+            for row_number, record in enumerate(records, start=2)
+            if record.get('ID')
+        }
+
+    def get(self, worksheet_name: str, record_id: int) -> Optional[int]:
+        """Obter a linha de um ID, ou None se o índice não o conhecer"""
+        rows = self._rows.get(worksheet_name)
+        if rows is None:
+            return None
+        return rows.get(record_id)
+
+    def add(self, worksheet_name: str, record_id: int, row_number: int):
+        """Registrar a linha de um registro recém-criado"""
+        rows = self._rows.get(worksheet_name)
+        if rows is not None:
+            rows[record_id] = row_number
+
+    def remove(self, worksheet_name: str, record_id: int):
+        """Remover um ID, deslocando as linhas abaixo como faz o delete_rows"""
+        rows = self._rows.get(worksheet_name)
+        if rows is None:
+            return
+        deleted_row = rows.pop(record_id, None)
+        if deleted_row is None:
+            self.invalidate(worksheet_name)
+            return
+        for other_id, row_number in rows.items():
+            if row_number > deleted_row:
+                rows[other_id] = row_number - 1
+
+    def invalidate(self, worksheet_name: Optional[str] = None):
+        """Descartar o índice de uma planilha (ou de todas)"""
+        if worksheet_name is None:
+            self._rows.clear()
+        else:
+            self._rows.pop(worksheet_name, None)
+
+
+class DateIndex:
+    """Índice data (YYYY-MM-DD) -> registros, para consultas por dia e por período sem varrer o histórico"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self._source: Optional[List[dict]] = None
+        self._dates: List[str] = []
+        self._by_date: Dict[str, List[dict]] = {}
+
+    def covers(self, records: List[dict]) -> bool:
+        """Verificar se o índice foi construído sobre esta lista de registros"""
+        return self._source is records
+
+    def build(self, records: List[dict]):
+        """Reconstruir o índice a partir da lista de registros em cache"""
+        self._source = records
+        self._by_date = {}
+        for record in records:
+            if record.get('ID'):
+                self._by_date.setdefault(str(record[self.field]), []).append(record)
+        self._dates = sorted(self._by_date)
+
+    def add(self, record: dict):
+        """Indexar um registro recém-criado"""
+        if self._source is None:
+            return
+        data = str(record[self.field])
+        if data not in self._by_date:
+            bisect.insort(self._dates, data)
+            self._by_date[data] = []
+        self._by_date[data].append(record)
+
+    def between(self, de: str, ate: str) -> List[dict]:
+        """Registros com data entre de e ate (inclusive), em ordem de data"""
+        start = bisect.bisect_left(self._dates, de)
+        end = bisect.bisect_right(self._dates, ate)
+        return [record for data in self._dates[start:end] for record in self._by_date[data]]
+
+
+class TableVersions:
+    """Contador de versão por tabela, incrementado a cada alteração conhecida (base dos ETags)"""
+
+    def __init__(self):
+        # Prefixo por processo: versões de outro processo ou de antes de um reinício nunca coincidem
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def bump(self, table: str):
+        """Registrar uma alteração na tabela"""
+        self._versions[table] = self.get(table) + 1
+
+    def tag(self, table: str) -> str:
+        return f"{self.epoch}.{self.get(table)}"
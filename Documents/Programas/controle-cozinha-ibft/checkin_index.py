@@ -0,0 +1,99 @@
+import asyncio
+from typing import Dict, Set, Tuple
+from views import IncrementalView
+from models import Funcionario, PratoDia
+
+
+class DuplicateCheckInError(ValueError):
+    """O funcionário já tem check-in registrado nesta data"""
+
+
+class CheckinIndex(IncrementalView):
+    """Funcionários e pratos por ID e pares (funcionário, data) já registrados, mantidos a partir
+    das alterações do backend: validar um check-in não precisa ler nenhuma planilha"""
+
+    entities = ('funcionarios', 'pratos', 'checkins')
+
+    def __init__(self, backend, max_age: float = 300):
+        # max_age: a cada quantos segundos reconstruir a partir das leituras completas,
+        # para absorver alterações feitas fora deste processo
+        super().__init__(backend, max_age)
+        self._funcionarios: Dict[int, Funcionario] = {}
+        self._pratos: Dict[int, PratoDia] = {}
+        self._registrados: Set[Tuple[int, str]] = set()
+        # Check-ins validados e ainda em gravação: continuam bloqueando duplicatas durante uma reconstrução
+        self._reservados: Set[Tuple[int, str]] = set()
+
+    async def rebuild(self):
+        """Reconstruir os índices a partir das leituras completas do backend"""
+        funcionarios, pratos, checkins = await asyncio.gather(
+            self.backend.get_funcionarios(),
+            self.backend.get_pratos(),
+            self.backend.get_checkins()
+        )
+        self._funcionarios = {f.id: f for f in funcionarios}
+        self._pratos = {p.id: p for p in pratos}
+        self._registrados = {(c.funcionario_id, c.data) for c in checkins}
+
+    async def _reload_cadastros(self):
+        """Reler funcionários e pratos (do cache do backend), sem o histórico de check-ins"""
+        funcionarios, pratos = await asyncio.gather(self.backend.get_funcionarios(), self.backend.get_pratos())
+        self._funcionarios = {f.id: f for f in funcionarios}
+        self._pratos = {p.id: p for p in pratos}
+
+    def update(self, entity: str, action: str, item_id: int, item=None):
+        """Aplicar uma criação/atualização/remoção de funcionário, prato ou check-in"""
+        removed = action == 'delete'
+        if entity == 'funcionarios':
+            if removed:
+                self._funcionarios.pop(item_id, None)
+            else:
+                self._funcionarios[item_id] = item
+        elif entity == 'pratos':
+            if removed:
+                self._pratos.pop(item_id, None)
+            else:
+                self._pratos[item_id] = item
+        elif entity == 'checkins':
+            if removed:
+                self._registrados.discard((item.funcionario_id, item.data))
+            else:
+                self._registrados.add((item.funcionario_id, item.data))
+
+    async def reserve(self, checkin_data) -> Tuple[Funcionario, PratoDia]:
+        """Validar um check-in e reservar o par (funcionário, data); retorna (funcionário, prato).
+
+        Lança ValueError se o funcionário ou o prato não existir ou estiver inativo, e
+        DuplicateCheckInError se o funcionário já tiver check-in na data. Sem await entre a
+        verificação e a reserva: dois pedidos simultâneos iguais nunca passam juntos.
+        """
+        await self.ensure_loaded()
+        funcionario = self._funcionarios.get(checkin_data.funcionario_id)
+        prato = self._pratos.get(checkin_data.prato_id)
+        if not (funcionario and funcionario.ativo and prato and prato.ativo):
+            # Pode ter sido cadastrado (ou reativado) em outro processo ou direto na planilha depois
+            # da última reconstrução: conferir antes de rejeitar
+            await self._reload_cadastros()
+            funcionario = self._funcionarios.get(checkin_data.funcionario_id)
+            prato = self._pratos.get(checkin_data.prato_id)
+
+        if not funcionario:
+            raise ValueError(f"Funcionário com ID {checkin_data.funcionario_id} não encontrado")
+        if not funcionario.ativo:
+            raise ValueError(f"Funcionário com ID {checkin_data.funcionario_id} está inativo")
+        if not prato:
+            raise ValueError(f"Prato com ID {checkin_data.prato_id} não encontrado")
+        if not prato.ativo:
+            raise ValueError(f"Prato com ID {checkin_data.prato_id} está inativo")
+
+        key = (checkin_data.funcionario_id, checkin_data.data)
+        if key in self._registrados or key in self._reservados:
+            raise DuplicateCheckInError(
+                f"{funcionario.nome} já tem check-in registrado em {checkin_data.data}"
+            )
+        self._reservados.add(key)
+        return funcionario, prato
+
+    def release(self, checkin_data):
+        """Encerrar a reserva: gravado, o par já está nos registrados (via apply); com falha, fica livre"""
+        self._reservados.discard((checkin_data.funcionario_id, checkin_data.data))
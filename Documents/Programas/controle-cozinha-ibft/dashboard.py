@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from views import IncrementalView
+from models import CheckInRefeicao, DashboardResumo
+
+
+class DashboardState(IncrementalView):
+    """Resumo do dashboard mantido incrementalmente a partir das alterações do backend"""
+
+    entities = ('estoque', 'funcionarios', 'pratos', 'checkins')
+
+    def __init__(self, backend, max_age: float = 300):
+        # max_age: a cada quantos segundos reconstruir a partir das leituras completas,
+        # para absorver alterações feitas fora deste processo
+        super().__init__(backend, max_age)
+        self._data: Optional[str] = None
+        self._estoque_ids: Set[int] = set()
+        self._funcionarios_ativos: Set[int] = set()
+        self._pratos_ativos: Set[int] = set()
+        self._checkins_hoje: Dict[int, CheckInRefeicao] = {}
+
+    def _hoje(self) -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _is_outdated(self) -> bool:
+        # Virada do dia: o resumo de ontem não serve, a consulta espera pelo de hoje
+        return super()._is_outdated() or self._data != self._hoje()
+
+    async def rebuild(self):
+        """Reconstruir o resumo a partir das leituras completas do backend"""
+        data = self._hoje()
+        estoque, funcionarios, pratos, checkins = await asyncio.gather(
+            self.backend.get_estoque(),
+            self.backend.get_funcionarios(),
+            self.backend.get_pratos(),
+            self.backend.get_checkins_por_data(data)
+        )
+        self._data = data
+        self._estoque_ids = {item.id for item in estoque}
+        self._funcionarios_ativos = {f.id for f in funcionarios if f.ativo}
+        self._pratos_ativos = {p.id for p in pratos if p.ativo}
+        self._checkins_hoje = {c.id: c for c in checkins}
+
+    def update(self, entity: str, action: str, item_id: int, item=None):
+        """Aplicar uma criação/atualização/remoção ao resumo"""
+        removed = action == 'delete'
+        if entity == 'estoque':
+            if removed:
+                self._estoque_ids.discard(item_id)
+            else:
+                self._estoque_ids.add(item_id)
+        elif entity == 'funcionarios':
+            if not removed and item.ativo:
+                self._funcionarios_ativos.add(item_id)
+            else:
+                self._funcionarios_ativos.discard(item_id)
+        elif entity == 'pratos':
+            if not removed and item.ativo:
+                self._pratos_ativos.add(item_id)
+            else:
+                self._pratos_ativos.discard(item_id)
+        elif entity == 'checkins':
+            if removed:
+                self._checkins_hoje.pop(item_id, None)
+            elif item.data == self._data:
+                self._checkins_hoje[item_id] = item
+
+    async def get_resumo(self) -> DashboardResumo:
+        """Obter o resumo, reconstruindo apenas na primeira vez, na virada do dia ou após max_age"""
+        await self.ensure_loaded()
+
+        checkins_hoje: List[CheckInRefeicao] = sorted(self._checkins_hoje.values(), key=lambda c: c.id)
+        # Itens a repor vêm do conjunto mantido pela lista de compras (estoque mínimo por item)
+        estoque_baixo = await self.backend.estoque_baixo.get_itens()
+        return DashboardResumo(
+            data=self._data,
+            total_estoque=len(self._estoque_ids),
+            funcionarios_ativos=len(self._funcionarios_ativos),
+            pratos_ativos=len(self._pratos_ativos),
+            total_checkins_hoje=len(checkins_hoje),
+            estoque_baixo=estoque_baixo,
+            checkins_hoje=checkins_hoje
+        )
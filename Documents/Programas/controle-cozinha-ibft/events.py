@@ -0,0 +1,104 @@
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, List, Optional, Set, Tuple
+
+# Fim do stream (encerramento do servidor)
+_CLOSE = None
+
+
+class EventBroker:
+    """Difunde cada criação/atualização/remoção do backend aos clientes de /api/events (Server-Sent Events)"""
+
+    def __init__(self, history: int = 1000, queue_size: int = 500, heartbeat: float = 15):
+        # history: eventos guardados para quem reconecta com Last-Event-ID
+        # queue_size: eventos pendentes por cliente antes de mandá-lo recarregar tudo
+        # heartbeat: intervalo dos comentários que mantêm a conexão aberta em proxies
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        # Prefixo por processo: IDs de antes de um reinício não são confundidos com os atuais
+        self.epoch = uuid.uuid4().hex[:8]
+        self._last_id = 0
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=history)
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def _event_id(self, number: int) -> str:
+        return f"{self.epoch}-{number}"
+
+    def _reset_message(self) -> str:
+        # Leva o ID atual: a reconexão automática do navegador continua a partir daqui
+        return f"id: {self._event_id(self._last_id)}\nevent: reset\ndata: {{}}\n\n"
+
+    def publish(self, entity: str, action: str, item_id: int, item=None):
+        """Ouvinte do backend: registrar o evento e entregá-lo a todos os clientes conectados"""
+        self._last_id += 1
+        data = json.dumps({
+            'entidade': entity,
+            'acao': action,
+            'id': item_id,
+            'item': item.model_dump() if item is not None else None
+        }, ensure_ascii=False)
+        message = f"id: {self._event_id(self._last_id)}\ndata: {data}\n\n"
+        self._history.append((self._last_id, message))
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Cliente lento: em vez de acumular memória, descartar a fila e pedir que recarregue
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._reset_message())
+                queue.put_nowait(_CLOSE)
+
+    def _missed(self, last_event_id: str) -> Optional[List[str]]:
+        """Eventos posteriores a Last-Event-ID, ou None se não for possível completar a sequência"""
+        epoch, _, number = last_event_id.partition('-')
+        try:
+            number = int(number)
+        except ValueError:
+            return None
+        if epoch != self.epoch or number > self._last_id:
+            return None
+        if number < self._last_id and (not self._history or self._history[0][0] > number + 1):
+            return None
+        return [message for event_number, message in self._history if event_number > number]
+
+    async def stream(self, last_event_id: Optional[str],
+                     is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+        """Gerar o stream SSE de um cliente, retomando de Last-Event-ID quando possível"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        # Inscrever e calcular os eventos perdidos sem await no meio: nada se perde nem se repete
+        self._subscribers.add(queue)
+        missed = self._missed(last_event_id) if last_event_id else []
+        try:
+            yield "retry: 3000\n\n"
+            if missed is None:
+                yield self._reset_message()
+            else:
+                for message in missed:
+                    yield message
+
+            while not await is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if message is _CLOSE:
+                    return
+                yield message
+        finally:
+            self._subscribers.discard(queue)
+
+    def close(self):
+        """Encerrar todos os streams abertos (desligamento do servidor)"""
+        for queue in list(self._subscribers):
+            self._subscribers.discard(queue)
+            try:
+                queue.put_nowait(_CLOSE)
+            except asyncio.QueueFull:
+                queue.get_nowait()
+                queue.put_nowait(_CLOSE)
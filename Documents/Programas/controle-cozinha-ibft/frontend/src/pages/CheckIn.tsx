@@ -36,6 +36,10 @@ import { TimePicker } from '@mui/x-date-pickers/TimePicker';
 import dayjs from 'dayjs';
 import React, { useEffect, useState } from 'react';
 import { checkinAPI, CheckInRefeicao, Funcionario, funcionariosAPI, PratoDia, pratosAPI } from '../services/api';
+import { applyEvento, subscribeEvents } from '../services/events';
+
+// Período exibido na tabela: o histórico completo fica no servidor
+const DIAS_HISTORICO = 30;
 
 const CheckIn: React.FC = () => {
     const [checkins, setCheckins] = useState<CheckInRefeicao[]>([]);
@@ -56,12 +60,28 @@ const CheckIn: React.FC = () => {
 
     useEffect(() => {
         loadData();
+
+        // Check-ins de outras telas e alterações de cadastro chegam como eventos, sem recarregar as tabelas
+        return subscribeEvents(evento => {
+            if (evento.entidade === 'checkins') {
+                const checkin = evento.item as CheckInRefeicao;
+                const inicio = dayjs().subtract(DIAS_HISTORICO - 1, 'day').format('YYYY-MM-DD');
+                setCheckins(atual => applyEvento(atual, evento, () => checkin.data >= inicio));
+            } else if (evento.entidade === 'funcionarios') {
+                setFuncionarios(atual => applyEvento<Funcionario>(atual, evento, f => f.ativo));
+            } else if (evento.entidade === 'pratos') {
+                setPratos(atual => applyEvento<PratoDia>(atual, evento, p => p.ativo));
+            }
+        }, loadData);
     }, []);
 
     const loadData = async () => {
         try {
             const [checkinsRes, funcionariosRes, pratosRes] = await Promise.all([
-                checkinAPI.getAll(),
+                checkinAPI.getByPeriod(
+                    dayjs().subtract(DIAS_HISTORICO - 1, 'day').format('YYYY-MM-DD'),
+                    dayjs().format('YYYY-MM-DD')
+                ),
                 funcionariosAPI.getAll(),
                 pratosAPI.getAll(),
             ]);
@@ -103,8 +123,9 @@ const CheckIn: React.FC = () => {
         }
 
         try {
-            await checkinAPI.create(formData);
-            await loadData();
+            const response = await checkinAPI.create(formData);
+            // O mesmo check-in também chega pelo stream de eventos; applyEvento não o duplica
+            setCheckins(atual => applyEvento(atual, { entidade: 'checkins', acao: 'create', id: response.data.id, item: response.data }));
             handleCloseDialog();
             setSuccessMessage('Check-in registrado com sucesso!');
             setTimeout(() => setSuccessMessage(''), 3000);
@@ -177,7 +198,7 @@ const CheckIn: React.FC = () => {
                             <TableRow>
                                 <TableCell colSpan={4} align="center">
                                     <Typography color="textSecondary">
-                                        Nenhum check-in registrado
+                                        Nenhum check-in registrado nos últimos {DIAS_HISTORICO} dias
                                     </Typography>
                                 </TableCell>
                             </TableRow>
@@ -18,29 +18,18 @@ import {
     Typography,
 } from '@mui/material';
 import React, { useEffect, useState } from 'react';
-import { checkinAPI, CheckInRefeicao, estoqueAPI, EstoqueItem, Funcionario, funcionariosAPI, PratoDia, pratosAPI } from '../services/api';
+import { dashboardAPI, DashboardResumo } from '../services/api';
+import { subscribeEvents } from '../services/events';
 
 const Dashboard: React.FC = () => {
-    const [estoque, setEstoque] = useState<EstoqueItem[]>([]);
-    const [funcionarios, setFuncionarios] = useState<Funcionario[]>([]);
-    const [pratos, setPratos] = useState<PratoDia[]>([]);
-    const [checkinsHoje, setCheckinsHoje] = useState<CheckInRefeicao[]>([]);
+    const [resumo, setResumo] = useState<DashboardResumo | null>(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
         const loadData = async () => {
             try {
-                const [estoqueRes, funcionariosRes, pratosRes, checkinsRes] = await Promise.all([
-                    estoqueAPI.getAll(),
-                    funcionariosAPI.getAll(),
-                    pratosAPI.getAll(),
-                    checkinAPI.getToday(),
-                ]);
-
-                setEstoque(estoqueRes.data);
-                setFuncionarios(funcionariosRes.data);
-                setPratos(pratosRes.data);
-                setCheckinsHoje(checkinsRes.data);
+                const response = await dashboardAPI.get();
+                setResumo(response.data);
             } catch (error) {
                 console.error('Erro ao carregar dados:', error);
             } finally {
@@ -49,11 +38,24 @@ const Dashboard: React.FC = () => {
         };
 
         loadData();
+
+        // O resumo é mantido em memória no servidor: a cada alteração basta pedi-lo de novo,
+        // agrupando rajadas de eventos numa única requisição
+        let timer: ReturnType<typeof setTimeout> | undefined;
+        const unsubscribe = subscribeEvents(evento => {
+            if (evento.entidade === 'listas_fixas') return;
+            clearTimeout(timer);
+            timer = setTimeout(loadData, 500);
+        }, loadData);
+
+        return () => {
+            clearTimeout(timer);
+            unsubscribe();
+        };
     }, []);
 
-    const itensEstoqueBaixo = estoque.filter(item => item.quantidade < 10);
-    const funcionariosAtivos = funcionarios.filter(f => f.ativo);
-    const pratosAtivos = pratos.filter(p => p.ativo);
+    const itensEstoqueBaixo = resumo?.estoque_baixo ?? [];
+    const checkinsHoje = resumo?.checkins_hoje ?? [];
     const hoje = new Date().toLocaleDateString('pt-BR');
 
     if (loading) {
@@ -82,7 +84,7 @@ const Dashboard: React.FC = () => {
                                         Itens no Estoque
                                     </Typography>
                                     <Typography variant="h4">
-                                        {estoque.length}
+                                        {resumo?.total_estoque ?? 0}
                                     </Typography>
                                 </Box>
                             </Box>
@@ -98,7 +100,7 @@ const Dashboard: React.FC = () => {
                                         Funcionários Ativos
                                     </Typography>
                                     <Typography variant="h4">
-                                        {funcionariosAtivos.length}
+                                        {resumo?.funcionarios_ativos ?? 0}
                                     </Typography>
                                 </Box>
                             </Box>
@@ -114,7 +116,7 @@ const Dashboard: React.FC = () => {
                                         Pratos Ativos
                                     </Typography>
                                     <Typography variant="h4">
-                                        {pratosAtivos.length}
+                                        {resumo?.pratos_ativos ?? 0}
                                     </Typography>
                                 </Box>
                             </Box>
@@ -130,7 +132,7 @@ const Dashboard: React.FC = () => {
                                         Check-ins Hoje
                                     </Typography>
                                     <Typography variant="h4">
-                                        {checkinsHoje.length}
+                                        {resumo?.total_checkins_hoje ?? 0}
                                     </Typography>
                                 </Box>
                             </Box>
@@ -36,6 +36,9 @@ import {
 import React, { useCallback, useEffect, useState } from 'react';
 import { estoqueAPI, EstoqueItem } from '../services/api';
 
+// Mesmo padrão do servidor para itens sem estoque mínimo definido
+const ESTOQUE_MINIMO_PADRAO = 10;
+
 const Estoque: React.FC = () => {
     const [estoque, setEstoque] = useState<EstoqueItem[]>([]);
     const [filteredEstoque, setFilteredEstoque] = useState<EstoqueItem[]>([]);
@@ -49,6 +52,8 @@ const Estoque: React.FC = () => {
         quantidade: 0,
         unidade: '',
         categoria: '',
+        estoque_minimo: ESTOQUE_MINIMO_PADRAO,
+        estoque_alvo: ESTOQUE_MINIMO_PADRAO,
     });
 
     const theme = useTheme();
@@ -115,6 +120,8 @@ const Estoque: React.FC = () => {
                 quantidade: item.quantidade,
                 unidade: item.unidade,
                 categoria: item.categoria,
+                estoque_minimo: item.estoque_minimo,
+                estoque_alvo: item.estoque_alvo,
             });
         } else {
             setEditingItem(null);
@@ -123,6 +130,8 @@ const Estoque: React.FC = () => {
                 quantidade: 0,
                 unidade: '',
                 categoria: '',
+                estoque_minimo: ESTOQUE_MINIMO_PADRAO,
+                estoque_alvo: ESTOQUE_MINIMO_PADRAO,
             });
         }
         setOpenDialog(true);
@@ -136,6 +145,8 @@ const Estoque: React.FC = () => {
             quantidade: 0,
             unidade: '',
             categoria: '',
+            estoque_minimo: ESTOQUE_MINIMO_PADRAO,
+            estoque_alvo: ESTOQUE_MINIMO_PADRAO,
         });
     };
 
@@ -164,9 +175,10 @@ const Estoque: React.FC = () => {
         }
     };
 
-    const getStatusColor = (quantidade: number) => {
-        if (quantidade < 5) return 'error';
-        if (quantidade < 10) return 'warning';
+    // Abaixo do estoque mínimo do item: alerta; abaixo da metade do mínimo: crítico
+    const getStatusColor = (item: EstoqueItem) => {
+        if (item.quantidade < item.estoque_minimo / 2) return 'error';
+        if (item.quantidade < item.estoque_minimo) return 'warning';
         return 'success';
     };
 
@@ -291,8 +303,8 @@ const Estoque: React.FC = () => {
                                     <TableCell align="center">{item.categoria}</TableCell>
                                     <TableCell align="center">
                                         <Chip
-                                            label={item.quantidade < 10 ? 'Baixo' : 'Normal'}
-                                            color={getStatusColor(item.quantidade)}
+                                            label={item.quantidade < item.estoque_minimo ? 'Baixo' : 'Normal'}
+                                            color={getStatusColor(item)}
                                             size="small"
                                         />
                                     </TableCell>
@@ -361,6 +373,24 @@ const Estoque: React.FC = () => {
                             margin="normal"
                             placeholder="Ex: kg, litros, unidades"
                         />
+                        <TextField
+                            fullWidth
+                            label="Estoque Mínimo"
+                            type="number"
+                            value={formData.estoque_minimo}
+                            onChange={(e) => setFormData({ ...formData, estoque_minimo: parseInt(e.target.value) || 0 })}
+                            margin="normal"
+                            helperText="Abaixo desta quantidade o item entra na lista de compras"
+                        />
+                        <TextField
+                            fullWidth
+                            label="Estoque Alvo"
+                            type="number"
+                            value={formData.estoque_alvo}
+                            onChange={(e) => setFormData({ ...formData, estoque_alvo: parseInt(e.target.value) || 0 })}
+                            margin="normal"
+                            helperText="Quantidade desejada após a compra"
+                        />
                         <FormControl fullWidth margin="normal">
                             <InputLabel>Categoria</InputLabel>
                             <Select
@@ -38,31 +38,56 @@ import {
 } from '@mui/material';
 import jsPDF from 'jspdf';
 import React, { useEffect, useState } from 'react';
-import { estoqueAPI, EstoqueItem } from '../services/api';
-
-interface ShoppingListItem {
-    id: string;
-    nome: string;
-    quantidade: number;
-    unidade: string;
-    categoria: string;
-    comprado: boolean;
-}
-
-interface FixedShoppingList {
-    id: string;
-    nome: string;
-    itens: ShoppingListItem[];
-    dataCriacao: string;
-}
+import { ItemListaCompras, ItemListaFixa, listaComprasAPI, ListaFixa, listasFixasAPI } from '../services/api';
+
+// Chave onde versões anteriores guardavam as listas fixas, só no navegador
+const LEGACY_LISTS_KEY = 'shoppingLists';
+
+// Importação única compartilhada: o StrictMode executa o efeito de carga duas vezes
+let legacyImport: Promise<ListaFixa[]> | null = null;
+
+// Enviar ao servidor as listas guardadas no navegador que ele ainda não tem (pelo nome) e apagar a cópia local
+const importLegacyLists = (existing: ListaFixa[]): Promise<ListaFixa[]> => {
+    if (!legacyImport) {
+        legacyImport = (async () => {
+            const saved = JSON.parse(localStorage.getItem(LEGACY_LISTS_KEY) || '[]') as {
+                nome: string;
+                itens?: Partial<ItemListaFixa>[];
+            }[];
+            const names = new Set(existing.map(list => list.nome));
+            const created: ListaFixa[] = [];
+            for (let position = 0; position < saved.length; position++) {
+                const list = saved[position];
+                if (names.has(list.nome)) continue;
+                const itens = (list.itens || []).map((item, index) => ({
+                    id: String(item.id ?? `${Date.now()}_${index}`),
+                    nome: item.nome || '',
+                    quantidade: item.quantidade ?? 1,
+                    unidade: item.unidade || '',
+                    categoria: item.categoria || '',
+                    comprado: Boolean(item.comprado),
+                }));
+                const response = await listasFixasAPI.create({ nome: list.nome, itens });
+                created.push(response.data);
+                // Se a importação falhar no meio, a próxima carga retoma das listas ainda não enviadas
+                localStorage.setItem(LEGACY_LISTS_KEY, JSON.stringify(saved.slice(position + 1)));
+            }
+            localStorage.removeItem(LEGACY_LISTS_KEY);
+            return created;
+        })().finally(() => {
+            legacyImport = null;
+        });
+    }
+    return legacyImport;
+};
 
 const ListaCompras: React.FC = () => {
     const [loading, setLoading] = useState(true);
-    const [fixedLists, setFixedLists] = useState<FixedShoppingList[]>([]);
-    const [variableItems, setVariableItems] = useState<ShoppingListItem[]>([]);
+    const [fixedLists, setFixedLists] = useState<ListaFixa[]>([]);
+    const [variableItems, setVariableItems] = useState<ItemListaCompras[]>([]);
     const [openDialog, setOpenDialog] = useState(false);
     const [openAddItemDialog, setOpenAddItemDialog] = useState(false);
-    const [selectedListId, setSelectedListId] = useState<string>('');
+    const [selectedListId, setSelectedListId] = useState<number | null>(null);
     const [newListName, setNewListName] = useState('');
     const [newItem, setNewItem] = useState({
         nome: '',
@@ -84,17 +109,21 @@ const ListaCompras: React.FC = () => {
 
     const loadData = async () => {
         try {
-            // Carregar estoque
-            const response = await estoqueAPI.getAll();
-
-            // Carregar listas fixas (simulado - em produção viria da API)
-            const savedLists = localStorage.getItem('shoppingLists');
-            if (savedLists) {
-                setFixedLists(JSON.parse(savedLists));
+            // Listas fixas e lista variável (itens abaixo do estoque mínimo) vêm prontas do servidor
+            const [listasResponse, variavelResponse] = await Promise.all([
+                listasFixasAPI.getAll(),
+                listaComprasAPI.get(),
+            ]);
+            let listas = listasResponse.data;
+            if (localStorage.getItem(LEGACY_LISTS_KEY)) {
+                try {
+                    listas = [...listas, ...(await importLegacyLists(listas))];
+                } catch (error) {
+                    console.error('Erro ao importar listas salvas no navegador:', error);
+                }
             }
-
-            // Gerar lista variável baseada em estoque baixo
-            generateVariableList(response.data);
+            setFixedLists(listas);
+            setVariableItems(variavelResponse.data);
         } catch (error) {
             console.error('Erro ao carregar dados:', error);
         } finally {
@@ -102,38 +131,30 @@ const ListaCompras: React.FC = () => {
         }
     };
 
-    const generateVariableList = (estoqueData: EstoqueItem[]) => {
-        const lowStockItems = estoqueData
-            .filter(item => item.quantidade < 10)
-            .map(item => ({
-                id: `var_${item.id}`,
-                nome: item.nome,
-                quantidade: Math.max(1, 10 - item.quantidade), // Quantidade sugerida
-                unidade: item.unidade,
-                categoria: item.categoria,
-                comprado: false,
-            }));
-        setVariableItems(lowStockItems);
+    // Gravar os itens de uma lista no servidor e atualizar o estado local com a resposta
+    const saveListItems = async (listId: number, itens: ItemListaFixa[]) => {
+        try {
+            const response = await listasFixasAPI.update(listId, { itens });
+            setFixedLists(lists => lists.map(list => (list.id === listId ? response.data : list)));
+        } catch (error) {
+            console.error('Erro ao salvar lista:', error);
+        }
     };
 
-    const handleCreateFixedList = () => {
+    const handleCreateFixedList = async () => {
         if (!newListName.trim()) return;
 
-        const newList: FixedShoppingList = {
-            id: Date.now().toString(),
-            nome: newListName,
-            itens: [],
-            dataCriacao: new Date().toISOString(),
-        };
-
-        const updatedLists = [...fixedLists, newList];
-        setFixedLists(updatedLists);
-        localStorage.setItem('shoppingLists', JSON.stringify(updatedLists));
-        setNewListName('');
-        setOpenDialog(false);
+        try {
+            const response = await listasFixasAPI.create({ nome: newListName });
+            setFixedLists([...fixedLists, response.data]);
+            setNewListName('');
+            setOpenDialog(false);
+        } catch (error) {
+            console.error('Erro ao criar lista:', error);
+        }
     };
 
-    const handleOpenAddItemDialog = (listId: string) => {
+    const handleOpenAddItemDialog = (listId: number) => {
         setSelectedListId(listId);
         setNewItem({
             nome: '',
@@ -146,7 +167,7 @@ const ListaCompras: React.FC = () => {
 
     const handleCloseAddItemDialog = () => {
         setOpenAddItemDialog(false);
-        setSelectedListId('');
+        setSelectedListId(null);
         setNewItem({
             nome: '',
             quantidade: 1,
@@ -155,71 +176,53 @@ const ListaCompras: React.FC = () => {
         });
     };
 
-    const handleAddItemToList = () => {
-        if (!newItem.nome.trim() || !selectedListId) return;
-
-        const updatedLists = fixedLists.map(list => {
-            if (list.id === selectedListId) {
-                const newShoppingItem: ShoppingListItem = {
-                    id: Date.now().toString(),
-                    nome: newItem.nome,
-                    quantidade: newItem.quantidade,
-                    unidade: newItem.unidade,
-                    categoria: newItem.categoria,
-                    comprado: false,
-                };
-                return {
-                    ...list,
-                    itens: [...list.itens, newShoppingItem]
-                };
-            }
-            return list;
-        });
-        setFixedLists(updatedLists);
-        localStorage.setItem('shoppingLists', JSON.stringify(updatedLists));
+    const handleAddItemToList = async () => {
+        if (!newItem.nome.trim() || selectedListId === null) return;
+
+        const list = fixedLists.find(list => list.id === selectedListId);
+        if (list) {
+            const newShoppingItem: ItemListaFixa = {
+                id: Date.now().toString(),
+                nome: newItem.nome,
+                quantidade: newItem.quantidade,
+                unidade: newItem.unidade,
+                categoria: newItem.categoria,
+                comprado: false,
+            };
+            await saveListItems(list.id, [...list.itens, newShoppingItem]);
+        }
         handleCloseAddItemDialog();
     };
 
-    const handleDeleteFixedList = (listId: string) => {
+    const handleDeleteFixedList = async (listId: number) => {
         if (window.confirm('Tem certeza que deseja excluir esta lista?')) {
-            const updatedLists = fixedLists.filter(list => list.id !== listId);
-            setFixedLists(updatedLists);
-            localStorage.setItem('shoppingLists', JSON.stringify(updatedLists));
+            try {
+                await listasFixasAPI.delete(listId);
+                setFixedLists(fixedLists.filter(list => list.id !== listId));
+            } catch (error) {
+                console.error('Erro ao excluir lista:', error);
+            }
         }
     };
 
 
-    const handleRemoveItemFromList = (listId: string, itemId: string) => {
-        const updatedLists = fixedLists.map(list => {
-            if (list.id === listId) {
-                return {
-                    ...list,
-                    itens: list.itens.filter(item => item.id !== itemId)
-                };
-            }
-            return list;
-        });
-        setFixedLists(updatedLists);
-        localStorage.setItem('shoppingLists', JSON.stringify(updatedLists));
+    const handleRemoveItemFromList = (listId: number, itemId: string) => {
+        const list = fixedLists.find(list => list.id === listId);
+        if (list) {
+            saveListItems(listId, list.itens.filter(item => item.id !== itemId));
+        }
     };
 
-    const handleToggleItemPurchased = (listId: string, itemId: string) => {
-        const updatedLists = fixedLists.map(list => {
-            if (list.id === listId) {
-                return {
-                    ...list,
-                    itens: list.itens.map(item =>
-                        item.id === itemId ? { ...item, comprado: !item.comprado } : item
-                    )
-                };
-            }
-            return list;
-        });
-        setFixedLists(updatedLists);
-        localStorage.setItem('shoppingLists', JSON.stringify(updatedLists));
+    const handleToggleItemPurchased = (listId: number, itemId: string) => {
+        const list = fixedLists.find(list => list.id === listId);
+        if (list) {
+            saveListItems(listId, list.itens.map(item =>
+                item.id === itemId ? { ...item, comprado: !item.comprado } : item
+            ));
+        }
     };
 
-    const generatePDF = (list: FixedShoppingList) => {
+    const generatePDF = (list: ListaFixa) => {
         const doc = new jsPDF();
 
         // Configurações do PDF
@@ -443,17 +446,17 @@ const ListaCompras: React.FC = () => {
                     ) : (
                         <Paper sx={{ p: 2 }}>
                             <Typography variant="subtitle1" gutterBottom>
-                                Itens com estoque baixo (menos de 10 unidades):
+                                Itens abaixo do estoque mínimo:
                             </Typography>
                             <List>
                                 {variableItems.map((item) => (
-                                    <ListItem key={item.id}>
+                                    <ListItem key={item.estoque_id}>
                                         <ListItemIcon>
                                             <WarningIcon color="warning" />
                                         </ListItemIcon>
                                         <ListItemText
-                                            primary={`${item.nome} (${item.quantidade} ${item.unidade})`}
-                                            secondary={`Categoria: ${item.categoria} - Quantidade sugerida: ${item.quantidade}`}
+                                            primary={`${item.nome} (${item.quantidade_sugerida} ${item.unidade})`}
+                                            secondary={`Categoria: ${item.categoria} - Em estoque: ${item.quantidade_atual} (mínimo ${item.estoque_minimo}) - Quantidade sugerida: ${item.quantidade_sugerida}`}
                                         />
                                     </ListItem>
                                 ))}
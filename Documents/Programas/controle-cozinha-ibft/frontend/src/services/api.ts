@@ -1,12 +1,48 @@
-import axios from 'axios';
+import axios, { AxiosResponse } from 'axios';
 
-const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
+export const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
 
 const api = axios.create({
     baseURL: API_BASE_URL,
     headers: {
         'Content-Type': 'application/json',
     },
+    // 304 Not Modified é tratado pelo cache de ETags abaixo
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+});
+
+// Cache de respostas GET com ETag: reenvia If-None-Match e reaproveita o corpo quando o servidor responde 304
+const etagCache = new Map<string, { etag: string; data: unknown; headers: AxiosResponse['headers'] }>();
+
+const cacheKey = (url?: string, params?: unknown) => `${url}?${JSON.stringify(params ?? {})}`;
+
+const isGet = (method?: string) => (method ?? 'get').toLowerCase() === 'get';
+
+api.interceptors.request.use((config) => {
+    if (isGet(config.method)) {
+        const cached = etagCache.get(cacheKey(config.url, config.params));
+        if (cached && config.headers) {
+            config.headers['If-None-Match'] = cached.etag;
+        }
+    }
+    return config;
+});
+
+api.interceptors.response.use((response) => {
+    const { config } = response;
+    if (!isGet(config.method)) {
+        return response;
+    }
+    const key = cacheKey(config.url, config.params);
+    const cached = etagCache.get(key);
+    if (response.status === 304 && cached) {
+        return { ...response, status: 200, data: cached.data, headers: cached.headers };
+    }
+    const etag = response.headers['etag'];
+    if (etag) {
+        etagCache.set(key, { etag, data: response.data, headers: response.headers });
+    }
+    return response;
 });
 
 // Interfaces para tipagem
@@ -18,6 +54,8 @@ export interface EstoqueItem {
     categoria: string;
     data_criacao: string;
     data_atualizacao: string;
+    estoque_minimo: number;
+    estoque_alvo: number;
 }
 
 export interface Funcionario {
@@ -50,42 +88,134 @@ export interface CheckInRefeicao {
     data_criacao: string;
 }
 
+export interface DashboardResumo {
+    data: string;
+    total_estoque: number;
+    funcionarios_ativos: number;
+    pratos_ativos: number;
+    total_checkins_hoje: number;
+    estoque_baixo: EstoqueItem[];
+    checkins_hoje: CheckInRefeicao[];
+}
+
+// Item da lista de compras variável, calculada no servidor
+export interface ItemListaCompras {
+    estoque_id: number;
+    nome: string;
+    unidade: string;
+    categoria: string;
+    quantidade_atual: number;
+    estoque_minimo: number;
+    estoque_alvo: number;
+    quantidade_sugerida: number;
+}
+
+export interface ItemListaFixa {
+    id: string;
+    nome: string;
+    quantidade: number;
+    unidade: string;
+    categoria: string;
+    comprado: boolean;
+}
+
+export interface ListaFixa {
+    id: number;
+    nome: string;
+    itens: ItemListaFixa[];
+    data_criacao: string;
+    data_atualizacao: string;
+}
+
+// Operações em lote (POST /<entidade>/bulk): um resultado por operação, na mesma ordem
+export interface OperacaoLote {
+    acao: 'create' | 'update' | 'delete';
+    id?: number;
+    dados?: Record<string, unknown>;
+}
+
+export interface ResultadoOperacao<T> {
+    acao: string;
+    id: number | null;
+    sucesso: boolean;
+    item: T | null;
+    erro: string | null;
+}
+
+// Paginação, ordenação e projeção opcionais nas listagens
+// (o próximo cursor vem no cabeçalho X-Next-Cursor)
+export interface ListParams {
+    limit?: number;
+    cursor?: string;
+    sort?: string;
+    fields?: string;
+}
+
 // APIs para Estoque
 export const estoqueAPI = {
-    getAll: () => api.get<EstoqueItem[]>('/estoque'),
-    create: (data: Omit<EstoqueItem, 'id' | 'data_criacao' | 'data_atualizacao'>) =>
+    getAll: (params?: ListParams) => api.get<EstoqueItem[]>('/estoque', { params }),
+    create: (data: Omit<EstoqueItem, 'id' | 'data_criacao' | 'data_atualizacao' | 'estoque_minimo' | 'estoque_alvo'>
+        & Partial<Pick<EstoqueItem, 'estoque_minimo' | 'estoque_alvo'>>) =>
         api.post<EstoqueItem>('/estoque', data),
     update: (id: number, data: Partial<Omit<EstoqueItem, 'id' | 'data_criacao' | 'data_atualizacao'>>) =>
         api.put<EstoqueItem>(`/estoque/${id}`, data),
     delete: (id: number) => api.delete(`/estoque/${id}`),
+    bulk: (operacoes: OperacaoLote[]) =>
+        api.post<ResultadoOperacao<EstoqueItem>[]>('/estoque/bulk', { operacoes }),
 };
 
 // APIs para Funcionários
 export const funcionariosAPI = {
-    getAll: () => api.get<Funcionario[]>('/funcionarios'),
+    getAll: (params?: ListParams) => api.get<Funcionario[]>('/funcionarios', { params }),
     create: (data: Omit<Funcionario, 'id' | 'data_criacao' | 'data_atualizacao'>) =>
         api.post<Funcionario>('/funcionarios', data),
     update: (id: number, data: Partial<Omit<Funcionario, 'id' | 'data_criacao' | 'data_atualizacao'>>) =>
         api.put<Funcionario>(`/funcionarios/${id}`, data),
     delete: (id: number) => api.delete(`/funcionarios/${id}`),
+    bulk: (operacoes: OperacaoLote[]) =>
+        api.post<ResultadoOperacao<Funcionario>[]>('/funcionarios/bulk', { operacoes }),
 };
 
 // APIs para Pratos do Dia
 export const pratosAPI = {
-    getAll: () => api.get<PratoDia[]>('/pratos'),
+    getAll: (params?: ListParams) => api.get<PratoDia[]>('/pratos', { params }),
     create: (data: Omit<PratoDia, 'id' | 'data_criacao' | 'data_atualizacao'>) =>
         api.post<PratoDia>('/pratos', data),
     update: (id: number, data: Partial<Omit<PratoDia, 'id' | 'data_criacao' | 'data_atualizacao'>>) =>
         api.put<PratoDia>(`/pratos/${id}`, data),
     delete: (id: number) => api.delete(`/pratos/${id}`),
+    bulk: (operacoes: OperacaoLote[]) =>
+        api.post<ResultadoOperacao<PratoDia>[]>('/pratos/bulk', { operacoes }),
 };
 
 // APIs para Check-ins
 export const checkinAPI = {
-    getAll: () => api.get<CheckInRefeicao[]>('/checkins'),
+    getAll: (params?: ListParams) => api.get<CheckInRefeicao[]>('/checkins', { params }),
     create: (data: Omit<CheckInRefeicao, 'id' | 'funcionario_nome' | 'prato_nome' | 'data_criacao'>) =>
         api.post<CheckInRefeicao>('/checkins', data),
     getToday: () => api.get<CheckInRefeicao[]>('/checkins/hoje'),
+    getByDate: (data: string) => api.get<CheckInRefeicao[]>('/checkins', { params: { data } }),
+    getByPeriod: (de: string, ate: string) => api.get<CheckInRefeicao[]>('/checkins', { params: { de, ate } }),
+    bulk: (operacoes: OperacaoLote[]) =>
+        api.post<ResultadoOperacao<CheckInRefeicao>[]>('/checkins/bulk', { operacoes }),
+};
+
+// API do Dashboard (resumo calculado no servidor)
+export const dashboardAPI = {
+    get: () => api.get<DashboardResumo>('/dashboard'),
+};
+
+// APIs da Lista de Compras
+export const listaComprasAPI = {
+    get: () => api.get<ItemListaCompras[]>('/lista-compras'),
+};
+
+export const listasFixasAPI = {
+    getAll: () => api.get<ListaFixa[]>('/listas-fixas'),
+    create: (data: { nome: string; itens?: ItemListaFixa[] }) => api.post<ListaFixa>('/listas-fixas', data),
+    update: (id: number, data: { nome?: string; itens?: ItemListaFixa[] }) =>
+        api.put<ListaFixa>(`/listas-fixas/${id}`, data),
+    delete: (id: number) => api.delete(`/listas-fixas/${id}`),
 };
 
 export default api;
@@ -0,0 +1,66 @@
+import { API_BASE_URL } from './api';
+
+// Evento enviado pelo servidor em /api/events a cada criação, atualização ou remoção
+export interface EventoAlteracao {
+    entidade: 'estoque' | 'funcionarios' | 'pratos' | 'checkins' | 'listas_fixas';
+    acao: 'create' | 'update' | 'delete';
+    id: number;
+    item: unknown;
+}
+
+interface Inscricao {
+    onEvento: (evento: EventoAlteracao) => void;
+    // Chamado quando eventos podem ter sido perdidos (servidor reiniciado, cliente atrasado): recarregar tudo
+    onReset?: () => void;
+}
+
+const inscricoes = new Set<Inscricao>();
+let source: EventSource | null = null;
+
+const conectar = () => {
+    // Uma única conexão compartilhada por todas as telas; o navegador reconecta sozinho com Last-Event-ID
+    source = new EventSource(`${API_BASE_URL}/events`);
+    source.onmessage = (message) => {
+        const evento: EventoAlteracao = JSON.parse(message.data);
+        inscricoes.forEach(inscricao => inscricao.onEvento(evento));
+    };
+    source.addEventListener('reset', () => {
+        inscricoes.forEach(inscricao => inscricao.onReset?.());
+    });
+};
+
+export const subscribeEvents = (
+    onEvento: (evento: EventoAlteracao) => void,
+    onReset?: () => void
+): (() => void) => {
+    const inscricao = { onEvento, onReset };
+    inscricoes.add(inscricao);
+    if (!source) {
+        conectar();
+    }
+
+    return () => {
+        inscricoes.delete(inscricao);
+        if (inscricoes.size === 0 && source) {
+            source.close();
+            source = null;
+        }
+    };
+};
+
+// Aplicar um evento a uma lista mantida em memória; `manter` filtra itens que não devem aparecer (ex.: inativos)
+export const applyEvento = <T extends { id: number }>(
+    lista: T[],
+    evento: EventoAlteracao,
+    manter: (item: T) => boolean = () => true
+): T[] => {
+    const semItem = lista.filter(item => item.id !== evento.id);
+    if (evento.acao === 'delete' || !manter(evento.item as T)) {
+        return semItem;
+    }
+    const existente = lista.findIndex(item => item.id === evento.id);
+    if (existente === -1) {
+        return [...lista, evento.item as T];
+    }
+    return lista.map(item => (item.id === evento.id ? (evento.item as T) : item));
+};
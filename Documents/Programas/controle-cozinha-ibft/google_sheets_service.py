@@ -1,440 +1,1664 @@
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import os
-from typing import List, Optional
-from datetime import datetime
-import pandas as pd
-from models import EstoqueItem, Funcionario, PratoDia, CheckInRefeicao
+import asyncio
+import functools
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+from cache import DateIndex, RowIndex, WorksheetCache, apply_change
+from id_allocator import IdAllocator
+from journal import JournalEntry, WriteJournal
+from metrics import cache_requests, current_operation, sheets_call_duration, sheets_calls, sheets_errors, track_operations
+from write_behind import WriteBehindQueue
+from models import (
+    ESTOQUE_MINIMO_PADRAO, EstoqueItem, Funcionario, PratoDia, CheckInRefeicao, ItemListaFixa, ListaFixa,
+    ResultadoOperacao
+)
+from pagination import paginate, parse_fields, parse_sort
+from scheduler import UpstreamScheduler
+from shared_cache import SharedCache
+from storage import ENTITIES, StorageBackend
 
-class GoogleSheetsService:
+logger = logging.getLogger(__name__)
+
+# Cabeçalhos de cada planilha, na ordem das colunas
+SHEET_HEADERS = {
+    'Estoque': ['ID', 'Nome', 'Quantidade', 'Unidade', 'Categoria', 'Data Criação', 'Data Atualização',
+                'Estoque Mínimo', 'Estoque Alvo'],
+    'Funcionarios': ['ID', 'Nome', 'Cargo', 'Ativo', 'Data Criação', 'Data Atualização'],
+    'Pratos': ['ID', 'Nome', 'Descrição', 'Data', 'Ativo', 'Data Criação', 'Data Atualização'],
+    'CheckIns': ['ID', 'Funcionario ID', 'Funcionario Nome', 'Prato ID', 'Prato Nome', 'Data', 'Horário', 'Data Criação'],
+    # Itens de cada lista gravados como JSON numa única célula
+    'ListasCompras': ['ID', 'Nome', 'Itens', 'Data Criação', 'Data Atualização']
+}
+
+# Tipo de cada chamada ao Google Sheets, para as métricas (demais: 'other')
+SHEETS_CALL_KINDS = {
+    'Worksheet.get_all_values': 'read',
+    'Worksheet.row_values': 'read',
+    'Worksheet.col_values': 'read',
+    'GoogleSheetsService._batch_get_values': 'read',
+    'Worksheet.append_row': 'append',
+    'Worksheet.append_rows': 'append',
+    'Worksheet.update': 'update',
+    'Worksheet.batch_update': 'update',
+    'Worksheet.delete_rows': 'delete',
+    'Worksheet.clear': 'delete',
+    # Usado apenas para remover faixas de linhas (deleteDimension)
+    'Spreadsheet.batch_update': 'delete',
+    'GoogleSheetsService._open_worksheet': 'metadata',
+    'GoogleSheetsService._add_worksheet': 'append'
+}
+
+# Partições mensais de check-ins (CHECKIN_PARTITIONS=monthly): CheckIns_AAAA_MM, com as colunas de CheckIns
+CHECKIN_PARTITION = re.compile(r'^CheckIns_(\d{4})_(\d{2})$')
+CHECKIN_DATE_COLUMN = SHEET_HEADERS['CheckIns'].index('Data')
+
+# Alterações recentes guardadas por aba para reaplicar a uma leitura que começou antes delas
+RECENT_WRITES = 1000
+
+def _checkin_partition(data: str) -> str:
+    """Aba mensal de um check-in, pela data (YYYY-MM-DD)"""
+    return f"CheckIns_{data[:4]}_{data[5:7]}"
+
+def _partition_month(worksheet_name: str) -> str:
+    """Mês (YYYY-MM) de uma partição de check-ins"""
+    year, month = CHECKIN_PARTITION.match(worksheet_name).groups()
+    return f"{year}-{month}"
+
+def _sheet_headers(worksheet_name: str) -> List[str]:
+    if CHECKIN_PARTITION.match(worksheet_name):
+        return SHEET_HEADERS['CheckIns']
+    return SHEET_HEADERS[worksheet_name]
+
+# Registro de reservas de blocos de IDs (usado apenas com vários processos)
+COUNTERS_SHEET = 'Contadores'
+COUNTERS_HEADERS = ['Planilha', 'Maior ID', 'Tamanho do Bloco']
+
+# Colunas numéricas; as demais são lidas como texto, do jeito que a API as devolve
+NUMERIC_COLUMNS = {'ID', 'Quantidade', 'Estoque Mínimo', 'Estoque Alvo', 'Funcionario ID', 'Prato ID'}
+
+def _number(value):
+    """Converter o texto de uma célula numérica (vazio e texto inválido ficam como estão)"""
+    if value == '' or not isinstance(value, str):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+def _decode_values(values: List[list]) -> List[dict]:
+    """Montar registros a partir de get_all_values/values_batch_get, resolvendo as colunas uma única vez"""
+    if not values:
+        return []
+    headers = list(values[0])
+    width = len(headers)
+    numeric = [header for header in headers if header in NUMERIC_COLUMNS]
+    padding = [''] * width
+    records = []
+    for row in values[1:]:
+        # A API omite células vazias no fim das linhas
+        record = dict(zip(headers, row if len(row) >= width else list(row) + padding[len(row):]))
+        for header in numeric:
+            record[header] = _number(record[header])
+        records.append(record)
+    return records
+
+# Conversão de registros da planilha em modelos
+def _int_or_default(value, default: int) -> int:
+    # Células vazias (ou colunas ausentes em planilhas antigas) usam o padrão
+    return default if value in ('', None) else int(value)
+
+def _estoque_from_record(record: dict) -> EstoqueItem:
+    estoque_minimo = _int_or_default(record.get('Estoque Mínimo'), ESTOQUE_MINIMO_PADRAO)
+    return EstoqueItem(
+        id=int(record['ID']),
+        nome=record['Nome'],
+        quantidade=int(record['Quantidade']),
+        unidade=record['Unidade'],
+        categoria=record['Categoria'],
+        data_criacao=record['Data Criação'],
+        data_atualizacao=record['Data Atualização'],
+        estoque_minimo=estoque_minimo,
+        estoque_alvo=_int_or_default(record.get('Estoque Alvo'), estoque_minimo)
+    )
+
+def _funcionario_from_record(record: dict) -> Funcionario:
+    return Funcionario(
+        id=int(record['ID']),
+        nome=record['Nome'],
+        cargo=record['Cargo'],
+        ativo=str(record['Ativo']).lower() == 'true',
+        data_criacao=record['Data Criação'],
+        data_atualizacao=record['Data Atualização']
+    )
+
+def _prato_from_record(record: dict) -> PratoDia:
+    return PratoDia(
+        id=int(record['ID']),
+        nome=record['Nome'],
+        descricao=record['Descrição'],
+        data=record['Data'],
+        ativo=str(record['Ativo']).lower() == 'true',
+        data_criacao=record['Data Criação'],
+        data_atualizacao=record['Data Atualização']
+    )
+
+def _checkin_from_record(record: dict) -> CheckInRefeicao:
+    return CheckInRefeicao(
+        id=int(record['ID']),
+        funcionario_id=int(record['Funcionario ID']),
+        funcionario_nome=record['Funcionario Nome'],
+        prato_id=int(record['Prato ID']),
+        prato_nome=record['Prato Nome'],
+        data=record['Data'],
+        horario=record['Horário'],
+        data_criacao=record['Data Criação']
+    )
+
+def _lista_fixa_from_record(record: dict) -> ListaFixa:
+    return ListaFixa(
+        id=int(record['ID']),
+        nome=str(record['Nome']),
+        itens=[ItemListaFixa(**item) for item in json.loads(record['Itens'] or '[]')],
+        data_criacao=record['Data Criação'],
+        data_atualizacao=record['Data Atualização']
+    )
+
+# Montagem de registros a partir dos dados recebidos pela API (criação e atualização parcial)
+def _new_estoque_record(item_id: int, item_data, timestamp: str) -> dict:
+    return {
+        'ID': item_id,
+        'Nome': item_data.nome,
+        'Quantidade': item_data.quantidade,
+        'Unidade': item_data.unidade,
+        'Categoria': item_data.categoria,
+        'Data Criação': timestamp,
+        'Data Atualização': timestamp,
+        'Estoque Mínimo': item_data.estoque_minimo,
+        'Estoque Alvo': item_data.estoque_alvo if item_data.estoque_alvo is not None else item_data.estoque_minimo
+    }
+
+def _update_estoque_record(record: dict, item_data, timestamp: str) -> dict:
+    updated = dict(record)
+    if item_data.nome is not None:
+        updated['Nome'] = item_data.nome
+    if item_data.quantidade is not None:
+        updated['Quantidade'] = item_data.quantidade
+    if item_data.unidade is not None:
+        updated['Unidade'] = item_data.unidade
+    if item_data.categoria is not None:
+        updated['Categoria'] = item_data.categoria
+    if item_data.estoque_minimo is not None:
+        updated['Estoque Mínimo'] = item_data.estoque_minimo
+    if item_data.estoque_alvo is not None:
+        updated['Estoque Alvo'] = item_data.estoque_alvo
+    updated['Data Atualização'] = timestamp
+    return updated
+
+def _new_funcionario_record(funcionario_id: int, funcionario_data, timestamp: str) -> dict:
+    return {
+        'ID': funcionario_id,
+        'Nome': funcionario_data.nome,
+        'Cargo': funcionario_data.cargo,
+        'Ativo': str(funcionario_data.ativo),
+        'Data Criação': timestamp,
+        'Data Atualização': timestamp
+    }
+
+def _update_funcionario_record(record: dict, funcionario_data, timestamp: str) -> dict:
+    updated = dict(record)
+    if funcionario_data.nome is not None:
+        updated['Nome'] = funcionario_data.nome
+    if funcionario_data.cargo is not None:
+        updated['Cargo'] = funcionario_data.cargo
+    if funcionario_data.ativo is not None:
+        updated['Ativo'] = str(funcionario_data.ativo)
+    updated['Data Atualização'] = timestamp
+    return updated
+
+def _new_prato_record(prato_id: int, prato_data, timestamp: str) -> dict:
+    return {
+        'ID': prato_id,
+        'Nome': prato_data.nome,
+        'Descrição': prato_data.descricao,
+        'Data': prato_data.data,
+        'Ativo': str(prato_data.ativo),
+        'Data Criação': timestamp,
+        'Data Atualização': timestamp
+    }
+
+def _update_prato_record(record: dict, prato_data, timestamp: str) -> dict:
+    updated = dict(record)
+    if prato_data.nome is not None:
+        updated['Nome'] = prato_data.nome
+    if prato_data.descricao is not None:
+        updated['Descrição'] = prato_data.descricao
+    if prato_data.data is not None:
+        updated['Data'] = prato_data.data
+    if prato_data.ativo is not None:
+        updated['Ativo'] = str(prato_data.ativo)
+    updated['Data Atualização'] = timestamp
+    return updated
+
+def _new_checkin_record(checkin_id: int, checkin_data, funcionario: Funcionario, prato: PratoDia,
+                        timestamp: str) -> dict:
+    return {
+        'ID': checkin_id,
+        'Funcionario ID': checkin_data.funcionario_id,
+        'Funcionario Nome': funcionario.nome,
+        'Prato ID': checkin_data.prato_id,
+        'Prato Nome': prato.nome,
+        'Data': checkin_data.data,
+        'Horário': checkin_data.horario,
+        'Data Criação': timestamp
+    }
+
+# Planilha -> (novo registro, atualização parcial) das entidades editáveis
+RECORD_BUILDERS = {
+    'Estoque': (_new_estoque_record, _update_estoque_record),
+    'Funcionarios': (_new_funcionario_record, _update_funcionario_record),
+    'Pratos': (_new_prato_record, _update_prato_record)
+}
+
+def _itens_to_cell(itens) -> str:
+    return json.dumps([item.model_dump() for item in itens], ensure_ascii=False)
+
+RECORD_CONVERTERS = {
+    'Estoque': _estoque_from_record,
+    'Funcionarios': _funcionario_from_record,
+    'Pratos': _prato_from_record,
+    'CheckIns': _checkin_from_record,
+    'ListasCompras': _lista_fixa_from_record
+}
+
+# Entidade da API -> planilha
+ENTITY_WORKSHEETS = {
+    'estoque': 'Estoque',
+    'funcionarios': 'Funcionarios',
+    'pratos': 'Pratos',
+    'checkins': 'CheckIns',
+    'listas_fixas': 'ListasCompras'
+}
+WORKSHEET_ENTITIES = {worksheet: entity for entity, worksheet in ENTITY_WORKSHEETS.items()}
+
+def _worksheet_entity(worksheet_name: str) -> str:
+    if CHECKIN_PARTITION.match(worksheet_name):
+        return 'checkins'
+    return WORKSHEET_ENTITIES[worksheet_name]
+
+@track_operations
+class GoogleSheetsService(StorageBackend):
     def __init__(self):
+        super().__init__()
         self.credentials_file = os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE")
         self.sheet_id = os.getenv("GOOGLE_SHEET_ID")
         self.client = None
         self.sheet = None
+        # Abas já abertas, reaproveitadas em vez de consultar os metadados a cada chamada
+        self._worksheets = {}
+        self.cache = WorksheetCache(ttl=float(os.getenv("SHEETS_CACHE_TTL", 30)))
+        self.row_index = RowIndex()
+        # Índice de datas por aba de check-ins (CheckIns ou cada partição mensal)
+        self._checkin_dates: Dict[str, DateIndex] = {}
+        # Últimos registros lidos de cada planilha, para detectar edições externas nas releituras
+        self._loaded_records: Dict[str, List[dict]] = {}
+        # Geração de escrita por aba e as alterações recentes (geração, ação, id, registro): uma leitura
+        # que termina depois de uma escrita feita durante ela não desfaz a escrita no cache
+        self._write_generation: Dict[str, int] = {}
+        self._recent_writes: Dict[str, Deque[tuple]] = {}
+        # Trecho JSON de cada registro já serializado, por planilha: id(registro) -> (registro, bytes)
+        self._json_fragments: Dict[str, Dict[int, tuple]] = {}
+        self._worksheet_locks = {}
+        
+        # Chamadas ao gspread são síncronas: rodam num pool de threads limitado,
+        # com semáforo de concorrência e timeout por chamada
+        self.max_workers = int(os.getenv("SHEETS_MAX_WORKERS", 4))
+        self.call_timeout = float(os.getenv("SHEETS_CALL_TIMEOUT", 15))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sheets")
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._client_lock = threading.RLock()
+        
+        # Cota da API (por minuto, por conta de serviço), novas tentativas em 429/5xx e leituras compartilhadas
+        self.scheduler = UpstreamScheduler(
+            reads_per_minute=int(os.getenv("SHEETS_READS_PER_MINUTE", 60)),
+            writes_per_minute=int(os.getenv("SHEETS_WRITES_PER_MINUTE", 60)),
+            burst=int(os.getenv("SHEETS_BURST", 10)),
+            max_retries=int(os.getenv("SHEETS_MAX_RETRIES", 5)),
+            backoff_base=float(os.getenv("SHEETS_BACKOFF_BASE", 1)),
+            backoff_max=float(os.getenv("SHEETS_BACKOFF_MAX", 32))
+        )
+        
+        # Modo opcional: os processos (workers) do mesmo servidor compartilham leituras, alterações e IDs
+        # por um arquivo SQLite local, em vez de cada um ler a planilha e alocar IDs por conta própria
+        self.shared = None
+        shared_path = os.getenv("SHEETS_SHARED_CACHE_PATH")
+        if shared_path:
+            self.shared = SharedCache(shared_path)
+            # Versão compartilhada de cada aba já refletida no cache deste processo
+            self._shared_seen: Dict[str, int] = {}
+            self._applying_shared = False
+            # Registros de alterações deste processo ainda em andamento na thread do cache compartilhado
+            self._shared_tasks: Set[asyncio.Task] = set()
+            # Abas cujo contador de IDs compartilhado deve ser conferido com o maior ID da planilha
+            self._shared_reseed: Set[str] = set()
+            self.add_listener(self._share_change)
+        
+        # IDs alocados em memória; com SHEETS_ID_BLOCK_SIZE > 0, faixas são reservadas na planilha
+        # e, com o cache compartilhado, cada ID é reservado no arquivo local (um por vez, sem lacunas,
+        # a partir de um contador semeado uma vez com o maior ID da planilha)
+        self.id_block_size = int(os.getenv("SHEETS_ID_BLOCK_SIZE", 0))
+        if self.shared is not None and self.id_block_size == 0:
+            self.id_allocator = IdAllocator(block_size=1, reserve_block=self._reserve_shared_ids)
+        else:
+            self.id_allocator = IdAllocator(block_size=self.id_block_size, reserve_block=self._reserve_id_block)
+        
+        # Modo opcional: toda alteração vai primeiro para um diário local e é aplicada à planilha em
+        # segundo plano; sem conexão, as leituras usam o último conteúdo lido mais as pendências
+        self.journal = None
+        journal_path = os.getenv("SHEETS_JOURNAL_PATH")
+        if journal_path:
+            self.journal = WriteJournal(
+                journal_path,
+                self._apply_journal,
+                interval=float(os.getenv("SHEETS_JOURNAL_INTERVAL", 2)),
+                max_items=int(os.getenv("SHEETS_JOURNAL_MAX_ITEMS", 50))
+            )
+        
+        # Modo opcional: check-ins confirmados na hora e gravados depois, em lotes (o diário já faz isso)
+        self.checkin_queue = None
+        if os.getenv("CHECKIN_WRITE_BEHIND", "false").lower() == "true" and self.journal is None:
+            self.checkin_queue = WriteBehindQueue(
+                self._flush_checkins,
+                interval=float(os.getenv("CHECKIN_FLUSH_INTERVAL", 5)),
+                max_items=int(os.getenv("CHECKIN_FLUSH_MAX_ITEMS", 20))
+            )
+        
+        # Modo opcional: check-ins em abas mensais criadas na primeira gravação do mês; a aba
+        # CheckIns continua sendo lida como histórico anterior às partições
+        self.partition_checkins = os.getenv("CHECKIN_PARTITIONS", "none").lower() == "monthly"
+        self._checkin_partitions: Set[str] = set()
+        # Datas (menor, maior) da aba CheckIns: None enquanto não lida, () se vazia
+        self._legacy_checkin_range: Optional[tuple] = None
+        self._partition_lock = asyncio.Lock()
         
         if not self.credentials_file or not self.sheet_id:
             raise ValueError("GOOGLE_SHEETS_CREDENTIALS_FILE e GOOGLE_SHEET_ID devem estar definidos no .env")
     
     def _get_client(self):
         """Obtém o cliente do Google Sheets, conectando apenas quando necessário"""
-        if self.client is None:
-            # Configurar credenciais
-            scope = [
-                'https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            creds = ServiceAccountCredentials.from_json_keyfile_name(
-                self.credentials_file, scope
-            )
-            
-            self.client = gspread.authorize(creds)
-            self.sheet = self.client.open_by_key(self.sheet_id)
-            
-            # Inicializar planilhas se não existirem
-            self._initialize_sheets()
+        # RLock: _initialize_sheets chama _get_client novamente na mesma thread
+        with self._client_lock:
+            if self.client is None:
+                # Importado só aqui: o backend SQLite sem espelho nunca carrega o oauth2client
+                from oauth2client.service_account import ServiceAccountCredentials
+                
+                # Configurar credenciais
+                scope = [
+                    'https://spreadsheets.google.com/feeds',
+                    'https://www.googleapis.com/auth/drive'
+                ]
+                
+                creds = ServiceAccountCredentials.from_json_keyfile_name(
+                    self.credentials_file, scope
+                )
+                
+                self.client = gspread.authorize(creds)
+                self.sheet = self.client.open_by_key(self.sheet_id)
+                
+                # Inicializar planilhas se não existirem
+                self._initialize_sheets()
         
         return self.client, self.sheet
     
     def _initialize_sheets(self):
         """Inicializar planilhas com cabeçalhos se não existirem"""
         client, sheet = self._get_client()
-        sheets_to_create = {
-            'Estoque': ['ID', 'Nome', 'Quantidade', 'Unidade', 'Categoria', 'Data Criação', 'Data Atualização'],
-            'Funcionarios': ['ID', 'Nome', 'Cargo', 'Ativo', 'Data Criação', 'Data Atualização'],
-            'Pratos': ['ID', 'Nome', 'Descrição', 'Data', 'Ativo', 'Data Criação', 'Data Atualização'],
-            'CheckIns': ['ID', 'Funcionario ID', 'Funcionario Nome', 'Prato ID', 'Prato Nome', 'Data', 'Horário', 'Data Criação']
-        }
+        
+        sheets_to_create = dict(SHEET_HEADERS)
+        if self.id_block_size > 0:
+            sheets_to_create[COUNTERS_SHEET] = COUNTERS_HEADERS
+        
+        # Uma única leitura de metadados abre todas as abas existentes
+        self._worksheets = {worksheet.title: worksheet for worksheet in sheet.worksheets()}
+        self._checkin_partitions = {title for title in self._worksheets if CHECKIN_PARTITION.match(title)}
+        existing = [name for name in sheets_to_create if name in self._worksheets]
         
         for sheet_name, headers in sheets_to_create.items():
-            try:
-                worksheet = sheet.worksheet(sheet_name)
-                # Verificar se já tem dados
-                if not worksheet.get_all_values():
-                    worksheet.append_row(headers)
-            except gspread.WorksheetNotFound:
-                worksheet = sheet.add_worksheet(title=sheet_name, rows=1000, cols=len(headers))
+            if sheet_name not in self._worksheets:
+                self._worksheets[sheet_name] = self._create_worksheet(sheet_name, headers)
+        
+        if not existing:
+            return
+        # Cabeçalhos das abas existentes: só a linha 1 de cada, numa única requisição
+        response = sheet.values_batch_get([gspread.utils.absolute_range_name(name, '1:1') for name in existing])
+        for sheet_name, value_range in zip(existing, response['valueRanges']):
+            headers = sheets_to_create[sheet_name]
+            worksheet = self._worksheets[sheet_name]
+            current_headers = (value_range.get('values') or [[]])[0]
+            if not current_headers:
                 worksheet.append_row(headers)
+            elif current_headers != headers and headers[:len(current_headers)] == current_headers:
+                # Planilha de uma versão anterior: acrescentar as colunas novas no fim
+                if worksheet.col_count < len(headers):
+                    worksheet.add_cols(len(headers) - worksheet.col_count)
+                worksheet.update(range_name='A1', values=[headers])
     
-    def _get_next_id(self, worksheet_name: str) -> int:
-        """Obter próximo ID disponível para uma planilha"""
+    async def _run(self, func, *args, **kwargs):
+        """Executar uma chamada do gspread pelo agendador: cota, novas tentativas e leituras compartilhadas"""
+        call_name = getattr(func, '__qualname__', str(func))
+        kind = SHEETS_CALL_KINDS.get(call_name, 'other')
+        call = functools.partial(self._call, functools.partial(func, *args, **kwargs), call_name, kind)
+        if kind not in ('read', 'metadata'):
+            # update e batch_update regravam os mesmos valores: seguros para repetir após um 5xx
+            return await self.scheduler.submit('write', call, idempotent=kind == 'update')
+
+        # Leituras idênticas simultâneas (mesma aba, mesma chamada) compartilham uma única requisição
+        key = (call_name, id(getattr(func, '__self__', None)), repr(args), repr(sorted(kwargs.items())))
+        result = await self.scheduler.submit('read', call, key=key, idempotent=True)
+        # Cada chamador recebe a própria lista: o backend estende e edita as listas lidas
+        return list(result) if isinstance(result, list) else result
+
+    async def _call(self, call, call_name: str, kind: str):
+        """Executar uma chamada bloqueante do gspread no pool de threads, com timeout"""
+        # Métricas: método público de origem, tipo e nome da chamada
+        operation = current_operation.get() or 'interna'
+        sheets_calls.inc(operation, kind, call_name)
+        func = call.func
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            started = time.perf_counter()
+            try:
+                if kind not in ('read', 'metadata'):
+                    # Escritas sem timeout: a thread não é interrompida e concluiria a gravação depois de a
+                    # rota responder erro, sem atualizar cache e índices (e o cliente repetiria, duplicando)
+                    return await loop.run_in_executor(self._executor, call)
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, call), timeout=self.call_timeout
+                )
+            except asyncio.TimeoutError:
+                sheets_errors.inc(operation, 'TimeoutError')
+                raise TimeoutError(
+                    f"Tempo esgotado ({self.call_timeout:g}s) aguardando o Google Sheets em {getattr(func, '__name__', func)}"
+                )
+            except Exception as e:
+                sheets_errors.inc(operation, type(e).__name__)
+                raise
+            finally:
+                sheets_call_duration.observe(time.perf_counter() - started, operation, kind)
+    
+    def _add_worksheet(self, worksheet_name: str, cols: int):
+        """Criar uma aba vazia (chamada bloqueante)"""
+        client, sheet = self._get_client()
+        return sheet.add_worksheet(title=worksheet_name, rows=1000, cols=cols)
+    
+    def _create_worksheet(self, worksheet_name: str, headers: List[str]):
+        """Criar uma aba com a linha de cabeçalho (chamada bloqueante)"""
+        worksheet = self._add_worksheet(worksheet_name, len(headers))
+        worksheet.append_row(headers)
+        return worksheet
+    
+    def _open_worksheet(self, worksheet_name: str):
+        """Abrir uma aba da planilha, reaproveitando o objeto já obtido (chamada bloqueante)"""
         client, sheet = self._get_client()
-        worksheet = sheet.worksheet(worksheet_name)
-        records = worksheet.get_all_records()
-        if not records:
-            return 1
-        return max(int(record['ID']) for record in records) + 1
+        worksheet = self._worksheets.get(worksheet_name)
+        if worksheet is None:
+            worksheet = sheet.worksheet(worksheet_name)
+            self._worksheets[worksheet_name] = worksheet
+        return worksheet
+    
+    async def _get_worksheet(self, worksheet_name: str):
+        """Obter uma aba da planilha sem bloquear o event loop"""
+        worksheet = self._worksheets.get(worksheet_name)
+        if worksheet is not None:
+            # Aba já aberta: nenhuma chamada ao Google Sheets
+            return worksheet
+        return await self._run(self._open_worksheet, worksheet_name)
+    
+    def start(self):
+        """Iniciar tarefas de fundo (fila de check-ins e reaplicação do diário, se ativadas)"""
+        if self.checkin_queue is not None:
+            self.checkin_queue.start()
+        if self.journal is not None:
+            self.journal.start()
+    
+    async def stop(self):
+        """Gravar check-ins pendentes e encerrar o pool de threads (o diário guarda o que faltar aplicar)"""
+        if self.checkin_queue is not None:
+            await self.checkin_queue.stop()
+        if self.journal is not None:
+            await self.journal.stop()
+        if self.shared is not None:
+            await self._flush_shared()
+            await self.shared.close()
+        self.close()
+    
+    def close(self):
+        """Encerrar o pool de threads do gspread"""
+        self._executor.shutdown(wait=False)
+    
+    async def _get_records(self, worksheet_name: str) -> List[dict]:
+        """Obter registros de uma planilha, usando o cache quando válido"""
+        versions = await self._sync_shared([worksheet_name]) if self.shared is not None else None
+        records = self.cache.get(worksheet_name)
+        if records is None and versions is not None:
+            records = await self._load_shared(worksheet_name, versions[worksheet_name])
+            if records is not None:
+                cache_requests.inc(worksheet_name, 'shared')
+                return records
+        cache_requests.inc(worksheet_name, 'miss' if records is None else 'hit')
+        if records is None:
+            generation = self._generation(worksheet_name)
+            try:
+                worksheet = await self._get_worksheet(worksheet_name)
+                records = await self._read_records(worksheet)
+            except Exception:
+                records = self._offline_records(worksheet_name)
+                if records is None:
+                    raise
+            else:
+                if versions is not None:
+                    await self._publish_shared(worksheet_name, versions[worksheet_name], records)
+                self._store_records(worksheet_name, records, generation)
+        return records
+    
+    def _offline_records(self, worksheet_name: str) -> Optional[List[dict]]:
+        """Com o diário, a última leitura (mais as alterações pendentes) quando a planilha está inacessível"""
+        if self.journal is None:
+            return None
+        stale = self.cache.stale(worksheet_name)
+        if stale is None:
+            return None
+        logger.warning("Google Sheets inacessível: usando a última leitura de %s", worksheet_name)
+        records = list(stale)
+        self._store_records(worksheet_name, records)
+        return records
+    
+    async def _read_records(self, worksheet) -> List[dict]:
+        """Ler todas as linhas de uma aba como registros (valores brutos, sem o get_all_records do gspread)"""
+        return _decode_values(await self._run(worksheet.get_all_values))
+    
+    async def _entity_records(self, entity: str) -> List[dict]:
+        """Registros de uma entidade (check-ins: todas as abas de check-ins, em ordem de mês)"""
+        if entity == 'checkins':
+            by_worksheet = await self._get_checkin_records()
+            return [record for records in by_worksheet.values() for record in records]
+        return await self._get_records(ENTITY_WORKSHEETS[entity])
+    
+    async def _get_records_many(self, *worksheet_names: str) -> Dict[str, List[dict]]:
+        """Obter registros de várias planilhas, lendo as que não estão em cache numa única chamada"""
+        versions = await self._sync_shared(list(worksheet_names)) if self.shared is not None else None
+        result = {name: self.cache.get(name) for name in worksheet_names}
+        for name, records in result.items():
+            if records is None and versions is not None:
+                result[name] = await self._load_shared(name, versions[name])
+                if result[name] is not None:
+                    cache_requests.inc(name, 'shared')
+                    continue
+            cache_requests.inc(name, 'miss' if result[name] is None else 'hit')
+        missing = [name for name, records in result.items() if records is None]
+        if missing:
+            try:
+                result.update(await self._load_snapshot(missing, versions))
+            except Exception:
+                offline = {name: self._offline_records(name) for name in missing}
+                if any(records is None for records in offline.values()):
+                    raise
+                result.update(offline)
+        return result
+    
+    def _batch_get_values(self, worksheet_names: List[str]) -> List[List[list]]:
+        """Ler o conteúdo de várias abas numa única requisição (values_batch_get, chamada bloqueante)"""
+        client, sheet = self._get_client()
+        response = sheet.values_batch_get([gspread.utils.absolute_range_name(name) for name in worksheet_names])
+        # Abas vazias vêm sem a chave 'values'
+        return [value_range.get('values', []) for value_range in response['valueRanges']]
+    
+    async def _load_snapshot(self, worksheet_names: List[str],
+                             shared_versions: Optional[Dict[str, int]] = None) -> Dict[str, List[dict]]:
+        """Recarregar várias planilhas de uma vez, atualizando cache, índices e versões.
+
+        shared_versions: versões do cache compartilhado obtidas antes da leitura, com as quais ela é publicada.
+        """
+        generations = {name: self._generation(name) for name in worksheet_names}
+        values = await self._run(self._batch_get_values, worksheet_names)
+        snapshot = {}
+        for name, sheet_values in zip(worksheet_names, values):
+            records = _decode_values(sheet_values)
+            if shared_versions is not None:
+                await self._publish_shared(name, shared_versions[name], records)
+            self._store_records(name, records, generations[name])
+            snapshot[name] = records
+        return snapshot
+    
+    def _store_records(self, worksheet_name: str, records: List[dict], generation: Optional[int] = None):
+        """Guardar uma leitura completa no cache e reconstruir o índice de linhas.
+
+        generation: geração de escrita da aba quando a leitura começou; as alterações feitas desde então
+        são reaplicadas à leitura, que pode ter sido feita antes delas chegarem à planilha.
+        """
+        complete = generation is None or self._reapply_writes(worksheet_name, records, generation)
+        self.row_index.build(worksheet_name, records)
+        is_checkins = _worksheet_entity(worksheet_name) == 'checkins'
+        if is_checkins and self.checkin_queue is not None:
+            # Check-ins já confirmados mas ainda na fila continuam visíveis (na aba em que serão gravados)
+            for row in self.checkin_queue.pending:
+                if self._checkin_worksheet_for(row[CHECKIN_DATE_COLUMN]) == worksheet_name:
+                    apply_change(records, 'create', int(row[0]), self._row_to_record(worksheet_name, row))
+        if self.journal is not None:
+            # Alterações já confirmadas e ainda no diário continuam valendo sobre a leitura
+            self.journal.overlay(worksheet_name, records, functools.partial(self._row_to_record, worksheet_name))
+        if worksheet_name == 'CheckIns' and self.partition_checkins:
+            dates = [str(record['Data']) for record in records if record.get('ID')]
+            self._legacy_checkin_range = (min(dates), max(dates)) if dates else ()
+        self.cache.set(worksheet_name, records)
+        self._observe_reload(worksheet_name, records)
+        if not complete:
+            # Alterações demais durante a leitura para reaplicar: a próxima consulta lê de novo
+            self.cache.invalidate(worksheet_name)
+    
+    def _generation(self, worksheet_name: str) -> int:
+        """Geração de escrita atual de uma aba (incrementada a cada alteração aplicada ao cache)"""
+        return self._write_generation.get(worksheet_name, 0)
+    
+    def _track_write(self, worksheet_name: str, action: str, record_id: int, record: Optional[dict] = None):
+        """Registrar uma alteração aplicada ao cache ('create', 'update' ou 'delete')"""
+        generation = self._generation(worksheet_name) + 1
+        self._write_generation[worksheet_name] = generation
+        if worksheet_name not in self._recent_writes:
+            self._recent_writes[worksheet_name] = deque(maxlen=RECENT_WRITES)
+        self._recent_writes[worksheet_name].append((generation, action, record_id, record))
+    
+    def _reapply_writes(self, worksheet_name: str, records: List[dict], generation: int) -> bool:
+        """Reaplicar a uma leitura as alterações feitas depois de seu início; False se algumas já foram descartadas"""
+        current = self._generation(worksheet_name)
+        if current == generation:
+            return True
+        recent = [write for write in self._recent_writes.get(worksheet_name, ()) if write[0] > generation]
+        for _, action, record_id, record in recent:
+            apply_change(records, action, record_id, record)
+        return len(recent) == current - generation
+    
+    def _observe_reload(self, worksheet_name: str, records: List[dict]):
+        """Mudar a versão se uma releitura completa trouxe conteúdo diferente do conhecido (edição externa)"""
+        # A lista anterior é a mesma do cache, mantida em dia pela escrita direta deste processo
+        previous = self._loaded_records.get(worksheet_name)
+        self._loaded_records[worksheet_name] = records
+        if previous is not None and previous != records:
+            self.versions.bump(_worksheet_entity(worksheet_name))
+    
+    def _cache_append(self, worksheet_name: str, row: list):
+        """Incluir uma linha criada no cache (e no índice de datas, para check-ins)"""
+        record = self._row_to_record(worksheet_name, row)
+        self.cache.append(worksheet_name, record)
+        self._track_write(worksheet_name, 'create', int(record['ID']), record)
+        if _worksheet_entity(worksheet_name) == 'checkins':
+            self._date_index(worksheet_name).add(record)
+    
+    def _cache_replace(self, worksheet_name: str, record: dict):
+        """Substituir no cache um registro atualizado"""
+        self.cache.replace(worksheet_name, record)
+        self._track_write(worksheet_name, 'update', int(record['ID']), record)
+    
+    def _cache_remove(self, worksheet_name: str, record_id: int):
+        """Remover do cache um registro deletado"""
+        self.cache.remove(worksheet_name, record_id)
+        self._track_write(worksheet_name, 'delete', record_id)
+    
+    def _date_index(self, worksheet_name: str) -> DateIndex:
+        if worksheet_name not in self._checkin_dates:
+            self._checkin_dates[worksheet_name] = DateIndex('Data')
+        return self._checkin_dates[worksheet_name]
+    
+    # Cache compartilhado entre processos (SHEETS_SHARED_CACHE_PATH)
+    async def _sync_shared(self, worksheet_names: List[str]) -> Dict[str, int]:
+        """Aplicar ao cache as alterações feitas por outros processos; retorna as versões compartilhadas"""
+        versions = await self.shared.versions(worksheet_names)
+        for name, version in versions.items():
+            seen = self._shared_seen.get(name)
+            if seen is None or seen == version:
+                continue
+            changes = await self.shared.changes(name, seen, version)
+            if changes is None or self.cache.stale(name) is None:
+                # Aba recarregada por outro processo ou alterações já descartadas: ler de novo
+                self._shared_seen.pop(name)
+                self.cache.invalidate(name)
+                self.row_index.invalidate(name)
+                continue
+            self._apply_shared_changes(name, changes)
+            self._shared_seen[name] = version
+        return versions
+    
+    def _apply_shared_changes(self, worksheet_name: str, changes):
+        """Aplicar alterações de outros processos ao cache e avisar os ouvintes (dashboard, eventos...)"""
+        records = self.cache.stale(worksheet_name)
+        entity = _worksheet_entity(worksheet_name)
+        convert = RECORD_CONVERTERS[ENTITY_WORKSHEETS[entity]]
+        notifications = []
+        for origin, action, record_id, record in changes:
+            if origin == self.shared.origin:
+                continue
+            applied, previous = apply_change(records, action, record_id, record)
+            if not applied:
+                continue
+            self._track_write(worksheet_name, action, record_id, record)
+            if action == 'create':
+                self.row_index.add(worksheet_name, record_id, len(records) + 1)
+                if entity == 'checkins':
+                    self._date_index(worksheet_name).add(record)
+            elif action == 'delete':
+                self.row_index.remove(worksheet_name, record_id)
+                self._checkin_dates.pop(worksheet_name, None)
+            notifications.append((action, record_id, convert(record if record is not None else previous)))
+        
+        # Sem registrar de novo no cache compartilhado o que veio dele
+        self._applying_shared = True
+        try:
+            for action, record_id, item in notifications:
+                self._notify(entity, action, record_id, item)
+        finally:
+            self._applying_shared = False
+    
+    async def _load_shared(self, worksheet_name: str, version: int) -> Optional[List[dict]]:
+        """Usar a leitura recente de outro processo (mais as alterações posteriores) em vez de ler a planilha"""
+        generation = self._generation(worksheet_name)
+        loaded = await self.shared.load(worksheet_name, self.cache.ttl)
+        if loaded is None:
+            return None
+        read_version, records = loaded
+        changes = await self.shared.changes(worksheet_name, read_version, version)
+        if changes is None:
+            return None
+        for _, action, record_id, record in changes:
+            apply_change(records, action, record_id, record)
+        self._shared_seen[worksheet_name] = version
+        self._store_records(worksheet_name, records, generation)
+        return records
+    
+    async def _publish_shared(self, worksheet_name: str, version: int, records: List[dict]):
+        """Oferecer aos outros processos uma leitura da planilha (antes das pendências deste processo)"""
+        self._shared_seen[worksheet_name] = version
+        await self.shared.publish(worksheet_name, version, records)
+    
+    def _share_change(self, entity: str, action: str, item_id: int, item=None):
+        """Ouvinte: registrar no cache compartilhado uma alteração feita por este processo"""
+        if self._applying_shared:
+            return
+        worksheet_name = self._checkin_worksheet_for(item.data) if entity == 'checkins' else ENTITY_WORKSHEETS[entity]
+        record = None
+        if action != 'delete':
+            record = next(
+                (record for record in reversed(self.cache.stale(worksheet_name) or [])
+                 if record.get('ID') and int(record['ID']) == item_id),
+                None
+            )
+        # O ouvinte não pode esperar: a gravação segue na thread do cache e _flush_shared aguarda por ela
+        task = asyncio.ensure_future(self._record_shared_change(worksheet_name, action, item_id, record))
+        self._shared_tasks.add(task)
+        task.add_done_callback(self._shared_task_done)
+    
+    async def _record_shared_change(self, worksheet_name: str, action: str, item_id: int, record: Optional[dict]):
+        if record is None and action != 'delete':
+            # Registro fora do cache deste processo: os outros recarregam a aba
+            await self.shared.invalidate(worksheet_name)
+            return
+        version = await self.shared.record_change(worksheet_name, action, item_id, record)
+        if self._shared_seen.get(worksheet_name) == version - 1:
+            # Nenhuma alteração de outro processo no meio: o cache local já está nesta versão
+            self._shared_seen[worksheet_name] = version
+    
+    def _shared_task_done(self, task: asyncio.Task):
+        self._shared_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # Só o cache dos outros processos fica desatualizado (até o TTL); a escrita na planilha já foi feita
+            logger.error("Falha ao registrar alteração no cache compartilhado", exc_info=task.exception())
+    
+    async def _flush_shared(self):
+        """Esperar o registro das alterações deste processo no cache compartilhado"""
+        if self.shared is not None and self._shared_tasks:
+            await asyncio.gather(*self._shared_tasks, return_exceptions=True)
+    
+    async def _notify_written(self, entity: str, action: str, item_id: int, item=None):
+        """Avisar os ouvintes de uma escrita e, com o cache compartilhado, só retornar depois de registrá-la lá:
+        uma leitura logo em seguida em outro processo já a enxerga"""
+        self._notify(entity, action, item_id, item)
+        await self._flush_shared()
+    
+    async def _reserve_shared_ids(self, worksheet_name: str, get_max_id, size: int):
+        """Reservar IDs no cache compartilhado (transação local, sem chamar o Google Sheets); o maior ID da
+        planilha só é lido para semear o contador ou conferi-lo depois de uma recarga"""
+        if worksheet_name in self._shared_reseed:
+            ids = await self.shared.reserve_ids(worksheet_name, size, await get_max_id())
+            self._shared_reseed.discard(worksheet_name)
+            return ids
+        ids = await self.shared.reserve_ids(worksheet_name, size)
+        if ids is None:
+            ids = await self.shared.reserve_ids(worksheet_name, size, await get_max_id())
+        return ids
+    
+    def _row_to_record(self, worksheet_name: str, row: list) -> dict:
+        """Converter uma linha gravada por este processo em registro (mesmo formato das leituras)"""
+        headers = _sheet_headers(worksheet_name)
+        # row_values omite as células vazias no fim da linha
+        return dict(zip(headers, list(row) + [''] * (len(headers) - len(row))))
+    
+    def _record_to_row(self, worksheet_name: str, record: dict) -> list:
+        """Converter um registro em linha da planilha, na ordem das colunas"""
+        return [record.get(header, '') for header in _sheet_headers(worksheet_name)]
+    
+    def _worksheet_lock(self, worksheet_name: str) -> asyncio.Lock:
+        """Lock por planilha: serializa mutações que dependem do número da linha"""
+        if worksheet_name not in self._worksheet_locks:
+            self._worksheet_locks[worksheet_name] = asyncio.Lock()
+        return self._worksheet_locks[worksheet_name]
+    
+    async def _locate_record(self, worksheet, worksheet_name: str, record_id: int):
+        """Encontrar (linha, registro) de um ID; com o diário, só o registro (a linha é resolvida na reaplicação)"""
+        if self.journal is None:
+            return await self._locate_row(worksheet, worksheet_name, record_id)
+        for record in await self._get_records(worksheet_name):
+            if record.get('ID') and int(record['ID']) == record_id:
+                return None, dict(record)
+        return None
+    
+    async def _locate_row(self, worksheet, worksheet_name: str, record_id: int):
+        """Encontrar (linha, registro) de um ID na planilha, usando o índice e relendo só se estiver desatualizado"""
+        row_number = self.row_index.get(worksheet_name, record_id)
+        if row_number is not None:
+            # Confirmar com a leitura de uma única linha que o índice continua válido
+            row = await self._run(worksheet.row_values, row_number)
+            if row and str(row[0]) == str(record_id):
+                # Mesmo formato das leituras completas, para regravar números como números
+                return row_number, _decode_values([_sheet_headers(worksheet_name), row])[0]
+        
+        # Índice ausente ou desatualizado (ex.: linhas removidas por outro processo)
+        generation = self._generation(worksheet_name)
+        records = await self._read_records(worksheet)
+        # A busca usa as linhas como estão na planilha; o cache recebe uma cópia com as pendências
+        row_number = next(
+            (number for number, record in enumerate(records, start=2)
+             if record.get('ID') and int(record['ID']) == record_id),
+            None
+        )
+        self._store_records(worksheet_name, list(records), generation)
+        if row_number is None:
+            return None
+        return row_number, dict(records[row_number - 2])
+    
+    async def _append_record(self, worksheet, worksheet_name: str, row: list):
+        """Adicionar uma linha ao fim da planilha, atualizando cache e índice"""
+        if self.journal is not None:
+            await self.journal.append(worksheet_name, 'append', int(row[0]), row)
+            self._cache_append(worksheet_name, row)
+            return
+        async with self._worksheet_lock(worksheet_name):
+            response = await self._run(worksheet.append_row, row)
+            self._cache_append(worksheet_name, row)
+            self._index_appended_rows(worksheet_name, [row], response)
+    
+    def _index_appended_rows(self, worksheet_name: str, rows: List[list], response):
+        """Registrar no índice as linhas gravadas por append_row/append_rows"""
+        try:
+            updated_range = response['updates']['updatedRange'].split('!')[-1]
+            first_row, _ = gspread.utils.a1_to_rowcol(updated_range.split(':')[0])
+        except (KeyError, TypeError, gspread.exceptions.IncorrectCellLabel):
+            self.row_index.invalidate(worksheet_name)
+            return
+        for offset, row in enumerate(rows):
+            self.row_index.add(worksheet_name, int(row[0]), first_row + offset)
+    
+    async def _delete_record(self, worksheet, worksheet_name: str, record_id: int) -> Optional[dict]:
+        """Remover a linha de um ID; retorna o registro removido, ou None se não existir"""
+        async with self._worksheet_lock(worksheet_name):
+            located = await self._locate_record(worksheet, worksheet_name, record_id)
+            if located is None:
+                return None
+            row_number, record = located
+            if self.journal is not None:
+                await self.journal.append(worksheet_name, 'delete', record_id)
+            else:
+                await self._run(worksheet.delete_rows, row_number)
+                self.row_index.remove(worksheet_name, record_id)
+            self._cache_remove(worksheet_name, record_id)
+            return record
+    
+    async def _write_record(self, worksheet, worksheet_name: str, row_number: int, record: dict):
+        """Gravar a linha inteira de um registro numa única chamada (range update)"""
+        if self.journal is not None:
+            await self.journal.append(worksheet_name, 'update', int(record['ID']), record)
+            return
+        last_cell = gspread.utils.rowcol_to_a1(row_number, len(_sheet_headers(worksheet_name)))
+        await self._run(
+            worksheet.update,
+            range_name=f"A{row_number}:{last_cell}",
+            values=[self._record_to_row(worksheet_name, record)]
+        )
+    
+    async def _write_records(self, worksheet, worksheet_name: str, records_by_row: Dict[int, dict]):
+        """Gravar várias linhas inteiras numa única chamada (batch_update)"""
+        last_column = len(_sheet_headers(worksheet_name))
+        await self._run(worksheet.batch_update, [
+            {
+                'range': f"A{row_number}:{gspread.utils.rowcol_to_a1(row_number, last_column)}",
+                'values': [self._record_to_row(worksheet_name, record)]
+            }
+            for row_number, record in records_by_row.items()
+        ])
+    
+    async def _delete_rows(self, worksheet, row_numbers):
+        """Remover várias linhas numa única chamada, agrupando faixas contíguas de baixo para cima"""
+        ranges = []
+        for row_number in sorted(row_numbers, reverse=True):
+            if ranges and ranges[-1][0] == row_number + 1:
+                ranges[-1][0] = row_number
+            else:
+                ranges.append([row_number, row_number])
+        # De baixo para cima, cada remoção não desloca as linhas das seguintes
+        requests = [
+            {'deleteDimension': {'range': {
+                'sheetId': worksheet.id, 'dimension': 'ROWS', 'startIndex': start - 1, 'endIndex': end
+            }}}
+            for start, end in ranges
+        ]
+        await self._run(worksheet.spreadsheet.batch_update, {'requests': requests})
+    
+    async def _apply_journal(self, entries: List[JournalEntry]):
+        """Aplicar alterações do diário em ordem: entradas seguidas da mesma aba e ação viram uma única chamada"""
+        groups: List[List[JournalEntry]] = []
+        for entry in entries:
+            if groups and (groups[-1][0].planilha, groups[-1][0].acao) == (entry.planilha, entry.acao):
+                groups[-1].append(entry)
+            else:
+                groups.append([entry])
+        for group in groups:
+            await self._apply_journal_group(group)
+            await self.journal.complete(group)
+    
+    async def _apply_journal_group(self, group: List[JournalEntry]):
+        worksheet_name, action = group[0].planilha, group[0].acao
+        worksheet = await self._get_checkin_worksheet(worksheet_name) if CHECKIN_PARTITION.match(worksheet_name) \
+            else await self._get_worksheet(worksheet_name)
+        # Sem o lock da aba: com o diário, esta tarefa é a única que grava na planilha, e as
+        # escritas das rotas (que usam o lock só para o cache) não esperam pelo Google
+        if action == 'append':
+            rows = [entry.dados for entry in group]
+            if any(entry.incerta for entry in group):
+                # O ID da coluna A mostra o que já chegou à planilha numa tentativa anterior
+                existing_ids = set(await self._run(worksheet.col_values, 1))
+                rows = [row for row in rows if str(row[0]) not in existing_ids]
+                if not rows:
+                    return
+            response = await self._run(worksheet.append_rows, rows, table_range='A1')
+            self._index_appended_rows(worksheet_name, rows, response)
+            return
+        
+        # Atualizações regravam a linha inteira e remoções procuram o ID: reaplicar não duplica nada
+        located_rows: Dict[int, JournalEntry] = {}
+        for entry in group:
+            located = await self._locate_row(worksheet, worksheet_name, entry.registro_id)
+            if located is not None:
+                located_rows[located[0]] = entry
+            # Sem a linha: removida direto na planilha (ou remoção já aplicada)
+        if not located_rows:
+            return
+        if action == 'update':
+            await self._write_records(
+                worksheet, worksheet_name, {row_number: entry.dados for row_number, entry in located_rows.items()}
+            )
+        else:
+            await self._delete_rows(worksheet, located_rows)
+            for entry in located_rows.values():
+                self.row_index.remove(worksheet_name, entry.registro_id)
+    
+    async def journal_status(self) -> dict:
+        """Pendências do diário local de escrita"""
+        if self.journal is None:
+            return await super().journal_status()
+        return self.journal.status()
+    
+    async def refresh_cache(self, worksheet_name: Optional[str] = None) -> List[str]:
+        """Recarregar o cache a partir da planilha (uma ou todas)"""
+        if worksheet_name is not None and worksheet_name not in SHEET_HEADERS and worksheet_name not in self._checkin_partitions:
+            raise ValueError(f"Planilha {worksheet_name} não existe")
+        
+        names = [worksheet_name] if worksheet_name else list(SHEET_HEADERS)
+        if 'CheckIns' in names and self.partition_checkins:
+            # O ID dos check-ins é único entre todas as abas: recarregar também as partições
+            names += sorted(self._checkin_partitions)
+        for name in names:
+            self.cache.invalidate(name)
+            self.id_allocator.reset(name)
+            # Abas recriadas na planilha mudam de ID: abrir de novo na próxima escrita
+            self._worksheets.pop(name, None)
+            if self.shared is not None:
+                # Os outros processos passam a usar esta nova leitura
+                await self.shared.invalidate(name)
+                self._shared_reseed.add(name)
+        # Todas as planilhas numa única requisição
+        await self._load_snapshot(names, await self.shared.versions(names) if self.shared is not None else None)
+        return names
+    
+    async def warm_up(self):
+        """Conectar e carregar todas as planilhas no cache numa única requisição"""
+        await self._get_records_many(*SHEET_HEADERS)
+        await super().warm_up()
+    
+    async def _get_max_id(self, worksheet_name: str) -> int:
+        """Obter o maior ID existente numa planilha (0 se vazia)"""
+        if worksheet_name == 'CheckIns':
+            records = await self._entity_records('checkins')
+        else:
+            records = await self._get_records(worksheet_name)
+        return max((int(record['ID']) for record in records if record.get('ID')), default=0)
+    
+    async def _get_next_id(self, worksheet_name: str) -> int:
+        """Obter próximo ID disponível para uma planilha"""
+        return await self.id_allocator.allocate(
+            worksheet_name, lambda: self._get_max_id(worksheet_name)
+        )
+    
+    async def _reserve_id_block(self, worksheet_name: str, get_max_id, size: int):
+        """Reservar uma faixa de IDs registrando-a na planilha de contadores"""
+        max_id = await get_max_id()
+        counters = await self._get_worksheet(COUNTERS_SHEET)
+        
+        # O append é atômico no Google Sheets: a linha recebida ordena as reservas
+        # entre processos, e cada faixa começa depois da anterior da mesma planilha
+        response = await self._run(counters.append_row, [worksheet_name, max_id, size], table_range='A1')
+        updated_range = response['updates']['updatedRange'].split('!')[-1]
+        ticket_row, _ = gspread.utils.a1_to_rowcol(updated_range.split(':')[0])
+        
+        rows = await self._run(counters.get_all_values)
+        while len(rows) < ticket_row:
+            # Leitura compartilhada iniciada antes do append: ler de novo
+            rows = await self._run(counters.get_all_values)
+        
+        end = 0
+        for row in rows[1:ticket_row]:
+            if row and row[0] == worksheet_name:
+                start = max(int(row[1]), end) + 1
+                end = start + int(row[2]) - 1
+        return start, end
+    
+    async def export_rows(self, worksheet_name: str, rows: List[list]):
+        """Substituir todo o conteúdo de uma planilha (usado como espelho de outro backend)"""
+        if worksheet_name == 'CheckIns' and self.partition_checkins:
+            # Cada check-in vai para a partição do seu mês; partições sem linhas e a aba antiga ficam vazias
+            groups: Dict[str, List[list]] = {name: [] for name in ['CheckIns', *self._checkin_partitions]}
+            for row in rows:
+                groups.setdefault(_checkin_partition(str(row[CHECKIN_DATE_COLUMN])), []).append(row)
+            for name, group in groups.items():
+                await self._export_worksheet(name, group)
+            return
+        await self._export_worksheet(worksheet_name, rows)
+    
+    async def _export_worksheet(self, worksheet_name: str, rows: List[list]):
+        worksheet = await self._get_checkin_worksheet(worksheet_name) if CHECKIN_PARTITION.match(worksheet_name) \
+            else await self._get_worksheet(worksheet_name)
+        async with self._worksheet_lock(worksheet_name):
+            await self._run(worksheet.clear)
+            await self._run(
+                worksheet.update, range_name='A1', values=[_sheet_headers(worksheet_name)] + rows
+            )
+            self.cache.invalidate(worksheet_name)
+            self.row_index.invalidate(worksheet_name)
+            if self.shared is not None:
+                await self.shared.invalidate(worksheet_name)
     
-    def _get_current_timestamp(self) -> str:
-        """Obter timestamp atual formatado"""
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    async def list_page(self, entity: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                        sort: Optional[str] = None, fields: Optional[str] = None):
+        """Paginar direto sobre os registros em cache, montando modelos só para a página"""
+        getter, model = ENTITIES[entity]
+        worksheet_name = ENTITY_WORKSHEETS[entity]
+        # Campos do modelo e colunas da planilha estão na mesma ordem
+        field_headers = dict(zip(model.model_fields, SHEET_HEADERS[worksheet_name]))
+        field, descending = parse_sort(sort, list(field_headers))
+        selected = parse_fields(fields, list(field_headers))
+        
+        records = [record for record in await self._entity_records(entity) if record.get('ID')]
+        page, next_cursor = paginate(
+            records, field, descending, limit, cursor,
+            lambda record, name: record[field_headers[name]],
+            lambda record: int(record['ID'])
+        )
+        convert = RECORD_CONVERTERS[worksheet_name]
+        return [convert(record).model_dump(include=selected) for record in page], next_cursor
+    
+    async def _serialize_list(self, entity: str) -> bytes:
+        """Montar o JSON da lista a partir dos registros em cache, reaproveitando o trecho de cada registro inalterado"""
+        worksheet_name = ENTITY_WORKSHEETS[entity]
+        convert = RECORD_CONVERTERS[worksheet_name]
+        previous = self._json_fragments.get(worksheet_name, {})
+        # Registros alterados são substituídos por novos dicts: a identidade do dict identifica o trecho
+        fragments = {}
+        for record in await self._entity_records(entity):
+            if not record.get('ID'):
+                continue
+            entry = previous.get(id(record))
+            if entry is None or entry[0] is not record:
+                entry = (record, convert(record).model_dump_json().encode())
+            fragments[id(record)] = entry
+        self._json_fragments[worksheet_name] = fragments
+        return b'[' + b','.join(fragment for _, fragment in fragments.values()) + b']'
+
+    async def get_version(self, entity: str, de: Optional[str] = None, ate: Optional[str] = None) -> str:
+        """Versão da entidade, recarregando antes a planilha se o cache expirou (detecta edições externas);
+        check-ins de um período só recarregam as abas que podem ter datas nele"""
+        if entity == 'checkins':
+            worksheet_names = list(await self._get_checkin_records(de, ate))
+        else:
+            await self._entity_records(entity)
+            worksheet_names = [ENTITY_WORKSHEETS[entity]]
+        if self.shared is not None:
+            # Com vários workers, o ETag vem do cache compartilhado: o mesmo em qualquer processo
+            return await self.shared.tag(worksheet_names)
+        return await super().get_version(entity)
+    
+    # Criação, atualização e remoção comuns às entidades editáveis
+    async def _create_entity(self, entity: str, data):
+        """Criar um registro a partir dos dados da API e avisar os ouvintes"""
+        worksheet_name = ENTITY_WORKSHEETS[entity]
+        new_record, _ = RECORD_BUILDERS[worksheet_name]
+        worksheet = await self._get_worksheet(worksheet_name)
+        record_id = await self._get_next_id(worksheet_name)
+        
+        record = new_record(record_id, data, self._get_current_timestamp())
+        await self._append_record(worksheet, worksheet_name, self._record_to_row(worksheet_name, record))
+        
+        created = RECORD_CONVERTERS[worksheet_name](record)
+        await self._notify_written(entity, 'create', record_id, created)
+        return created
+    
+    async def _update_entity(self, entity: str, record_id: int, data, not_found: str):
+        """Atualizar apenas os campos fornecidos, montando a linha final localmente"""
+        worksheet_name = ENTITY_WORKSHEETS[entity]
+        _, update_record = RECORD_BUILDERS[worksheet_name]
+        worksheet = await self._get_worksheet(worksheet_name)
+        
+        async with self._worksheet_lock(worksheet_name):
+            located = await self._locate_record(worksheet, worksheet_name, record_id)
+            if located is None:
+                raise ValueError(not_found)
+            row_number, record = located
+            
+            updated_record = update_record(record, data, self._get_current_timestamp())
+            await self._write_record(worksheet, worksheet_name, row_number, updated_record)
+            self._cache_replace(worksheet_name, updated_record)
+        
+        updated = RECORD_CONVERTERS[worksheet_name](updated_record)
+        await self._notify_written(entity, 'update', record_id, updated)
+        return updated
+    
+    async def _delete_entity(self, entity: str, record_id: int, not_found: str):
+        """Remover a linha de um registro e avisar os ouvintes"""
+        worksheet_name = ENTITY_WORKSHEETS[entity]
+        worksheet = await self._get_worksheet(worksheet_name)
+        
+        record = await self._delete_record(worksheet, worksheet_name, record_id)
+        if record is None:
+            raise ValueError(not_found)
+        await self._notify_written(entity, 'delete', record_id, RECORD_CONVERTERS[worksheet_name](record))
+    
+    async def bulk(self, entity: str, operations) -> List[ResultadoOperacao]:
+        """Aplicar um lote com poucas chamadas: uma leitura, um batch_update, uma remoção compactada e um append_rows"""
+        if self.journal is not None:
+            # Cada operação vai para o diário; a reaplicação já agrupa as chamadas à planilha
+            return await super().bulk(entity, operations)
+        if entity == 'checkins':
+            return await self._bulk_checkins(operations)
+        
+        worksheet_name = ENTITY_WORKSHEETS[entity]
+        new_record, update_record = RECORD_BUILDERS[worksheet_name]
+        convert = RECORD_CONVERTERS[worksheet_name]
+        worksheet = await self._get_worksheet(worksheet_name)
+        timestamp = self._get_current_timestamp()
+        results: List[Optional[ResultadoOperacao]] = [None] * len(operations)
+        changes = []
+        
+        async with self._worksheet_lock(worksheet_name):
+            if any(action != 'create' for action, _, _ in operations):
+                # Uma leitura completa dá números de linha válidos para todas as operações do lote
+                generation = self._generation(worksheet_name)
+                records = await self._read_records(worksheet)
+                self.row_index.build(worksheet_name, records)
+                self._observe_reload(worksheet_name, records)
+                
+                updated: Dict[int, dict] = {}
+                deleted: Dict[int, dict] = {}
+                # Operações aplicadas em cada etapa: (posição, ação, id, linha, item)
+                stages = {'update': [], 'delete': []}
+                for index, (action, record_id, data) in enumerate(operations):
+                    if action == 'create':
+                        continue
+                    row_number = self.row_index.get(worksheet_name, record_id)
+                    if row_number is None or row_number in deleted:
+                        results[index] = ResultadoOperacao(
+                            acao=action, id=record_id, sucesso=False,
+                            erro=f"Registro com ID {record_id} não encontrado"
+                        )
+                        continue
+                    current = updated.get(row_number, records[row_number - 2])
+                    if action == 'update':
+                        updated[row_number] = update_record(current, data, timestamp)
+                        stages['update'].append((index, action, record_id, row_number, convert(updated[row_number])))
+                    else:
+                        # Atualizações anteriores do mesmo ID não são gravadas e seguem o resultado da remoção
+                        if updated.pop(row_number, None) is not None:
+                            superseded = [entry for entry in stages['update'] if entry[3] == row_number]
+                            stages['update'] = [entry for entry in stages['update'] if entry[3] != row_number]
+                            stages['delete'].extend(superseded)
+                        deleted[row_number] = current
+                        stages['delete'].append((index, action, record_id, row_number, convert(current)))
+                
+                error, failed_stage = None, None
+                try:
+                    if updated:
+                        failed_stage = 'update'
+                        await self._write_records(worksheet, worksheet_name, updated)
+                    if deleted:
+                        failed_stage = 'delete'
+                        await self._delete_rows(worksheet, deleted)
+                except Exception as e:
+                    error = e
+                
+                for stage in ('update', 'delete'):
+                    # Se as atualizações falharam, as remoções nem foram tentadas
+                    failed = error is not None and (failed_stage == 'update' or stage == 'delete')
+                    for index, action, record_id, _, item in stages[stage]:
+                        if failed:
+                            results[index] = ResultadoOperacao(acao=action, id=record_id, sucesso=False, erro=str(error))
+                        else:
+                            results[index] = ResultadoOperacao(
+                                acao=action, id=record_id, sucesso=True,
+                                item=item.model_dump() if action == 'update' else None
+                            )
+                            changes.append((action, record_id, item))
+                
+                if error is None:
+                    # Cache e índice passam a refletir as linhas gravadas e as removidas
+                    for row_number, record in updated.items():
+                        records[row_number - 2] = record
+                    records = [
+                        record for row_number, record in enumerate(records, start=2) if row_number not in deleted
+                    ]
+                    complete = self._reapply_writes(worksheet_name, records, generation)
+                    self.cache.set(worksheet_name, records)
+                    self.row_index.build(worksheet_name, records)
+                    self._loaded_records[worksheet_name] = records
+                    for record in updated.values():
+                        self._track_write(worksheet_name, 'update', int(record['ID']), record)
+                    for record in deleted.values():
+                        self._track_write(worksheet_name, 'delete', int(record['ID']))
+                    if not complete:
+                        self.cache.invalidate(worksheet_name)
+                else:
+                    # Estado da planilha incerto: a próxima leitura recarrega tudo
+                    self.cache.invalidate(worksheet_name)
+                    self.row_index.invalidate(worksheet_name)
+                    if self.shared is not None:
+                        await self.shared.invalidate(worksheet_name)
+            
+            creates = [(index, data) for index, (action, _, data) in enumerate(operations) if action == 'create']
+            if creates:
+                rows, created = [], []
+                for index, data in creates:
+                    record = new_record(await self._get_next_id(worksheet_name), data, timestamp)
+                    rows.append(self._record_to_row(worksheet_name, record))
+                    created.append((index, convert(record)))
+                try:
+                    response = await self._run(worksheet.append_rows, rows, table_range='A1')
+                except Exception as e:
+                    for index, _ in created:
+                        results[index] = ResultadoOperacao(acao='create', sucesso=False, erro=str(e))
+                else:
+                    for row in rows:
+                        self._cache_append(worksheet_name, row)
+                    self._index_appended_rows(worksheet_name, rows, response)
+                    for index, item in created:
+                        results[index] = ResultadoOperacao(acao='create', id=item.id, sucesso=True, item=item.model_dump())
+                        changes.append(('create', item.id, item))
+        
+        for action, record_id, item in changes:
+            self._notify(entity, action, record_id, item)
+        await self._flush_shared()
+        return results
     
     # Métodos para Estoque
     async def get_estoque(self) -> List[EstoqueItem]:
         """Obter todos os itens do estoque"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Estoque')
-        records = worksheet.get_all_records()
+        records = await self._get_records('Estoque')
         
         estoque_items = []
         for record in records:
             if record.get('ID'):  # Pular linhas vazias
-                estoque_items.append(EstoqueItem(
-                    id=int(record['ID']),
-                    nome=record['Nome'],
-                    quantidade=int(record['Quantidade']),
-                    unidade=record['Unidade'],
-                    categoria=record['Categoria'],
-                    data_criacao=record['Data Criação'],
-                    data_atualizacao=record['Data Atualização']
-                ))
+                estoque_items.append(_estoque_from_record(record))
         
         return estoque_items
     
     async def create_estoque_item(self, item_data) -> EstoqueItem:
         """Criar novo item no estoque"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Estoque')
-        item_id = self._get_next_id('Estoque')
-        timestamp = self._get_current_timestamp()
-        
-        new_item = EstoqueItem(
-            id=item_id,
-            nome=item_data.nome,
-            quantidade=item_data.quantidade,
-            unidade=item_data.unidade,
-            categoria=item_data.categoria,
-            data_criacao=timestamp,
-            data_atualizacao=timestamp
-        )
-        
-        worksheet.append_row([
-            new_item.id,
-            new_item.nome,
-            new_item.quantidade,
-            new_item.unidade,
-            new_item.categoria,
-            new_item.data_criacao,
-            new_item.data_atualizacao
-        ])
-        
-        return new_item
+        return await self._create_entity('estoque', item_data)
     
     async def update_estoque_item(self, item_id: int, item_data) -> EstoqueItem:
         """Atualizar item do estoque"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Estoque')
-        records = worksheet.get_all_records()
-        
-        for i, record in enumerate(records, start=2):  # Começar da linha 2 (pular cabeçalho)
-            if int(record['ID']) == item_id:
-                # Atualizar apenas campos fornecidos
-                if item_data.nome is not None:
-                    worksheet.update_cell(i, 2, item_data.nome)
-                if item_data.quantidade is not None:
-                    worksheet.update_cell(i, 3, item_data.quantidade)
-                if item_data.unidade is not None:
-                    worksheet.update_cell(i, 4, item_data.unidade)
-                if item_data.categoria is not None:
-                    worksheet.update_cell(i, 5, item_data.categoria)
-                
-                worksheet.update_cell(i, 7, self._get_current_timestamp())
-                
-                # Retornar item atualizado
-                updated_record = worksheet.row_values(i)
-                return EstoqueItem(
-                    id=int(updated_record[0]),
-                    nome=updated_record[1],
-                    quantidade=int(updated_record[2]),
-                    unidade=updated_record[3],
-                    categoria=updated_record[4],
-                    data_criacao=updated_record[5],
-                    data_atualizacao=updated_record[6]
-                )
-        
-        raise ValueError(f"Item com ID {item_id} não encontrado")
+        return await self._update_entity('estoque', item_id, item_data, f"Item com ID {item_id} não encontrado")
     
     async def delete_estoque_item(self, item_id: int):
         """Deletar item do estoque"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Estoque')
-        records = worksheet.get_all_records()
-        
-        for i, record in enumerate(records, start=2):
-            if int(record['ID']) == item_id:
-                worksheet.delete_rows(i)
-                return
-        
-        raise ValueError(f"Item com ID {item_id} não encontrado")
+        await self._delete_entity('estoque', item_id, f"Item com ID {item_id} não encontrado")
     
     # Métodos para Funcionários
     async def get_funcionarios(self) -> List[Funcionario]:
         """Obter todos os funcionários"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Funcionarios')
-        records = worksheet.get_all_records()
+        records = await self._get_records('Funcionarios')
         
         funcionarios = []
         for record in records:
             if record.get('ID'):
-                funcionarios.append(Funcionario(
-                    id=int(record['ID']),
-                    nome=record['Nome'],
-                    cargo=record['Cargo'],
-                    ativo=record['Ativo'].lower() == 'true',
-                    data_criacao=record['Data Criação'],
-                    data_atualizacao=record['Data Atualização']
-                ))
+                funcionarios.append(_funcionario_from_record(record))
         
         return funcionarios
     
     async def create_funcionario(self, funcionario_data) -> Funcionario:
         """Criar novo funcionário"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Funcionarios')
-        funcionario_id = self._get_next_id('Funcionarios')
-        timestamp = self._get_current_timestamp()
-        
-        new_funcionario = Funcionario(
-            id=funcionario_id,
-            nome=funcionario_data.nome,
-            cargo=funcionario_data.cargo,
-            ativo=funcionario_data.ativo,
-            data_criacao=timestamp,
-            data_atualizacao=timestamp
-        )
-        
-        worksheet.append_row([
-            new_funcionario.id,
-            new_funcionario.nome,
-            new_funcionario.cargo,
-            str(new_funcionario.ativo),
-            new_funcionario.data_criacao,
-            new_funcionario.data_atualizacao
-        ])
-        
-        return new_funcionario
+        return await self._create_entity('funcionarios', funcionario_data)
     
     async def update_funcionario(self, funcionario_id: int, funcionario_data) -> Funcionario:
         """Atualizar funcionário"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Funcionarios')
-        records = worksheet.get_all_records()
-        
-        for i, record in enumerate(records, start=2):
-            if int(record['ID']) == funcionario_id:
-                if funcionario_data.nome is not None:
-                    worksheet.update_cell(i, 2, funcionario_data.nome)
-                if funcionario_data.cargo is not None:
-                    worksheet.update_cell(i, 3, funcionario_data.cargo)
-                if funcionario_data.ativo is not None:
-                    worksheet.update_cell(i, 4, str(funcionario_data.ativo))
-                
-                worksheet.update_cell(i, 6, self._get_current_timestamp())
-                
-                updated_record = worksheet.row_values(i)
-                return Funcionario(
-                    id=int(updated_record[0]),
-                    nome=updated_record[1],
-                    cargo=updated_record[2],
-                    ativo=updated_record[3].lower() == 'true',
-                    data_criacao=updated_record[4],
-                    data_atualizacao=updated_record[5]
-                )
-        
-        raise ValueError(f"Funcionário com ID {funcionario_id} não encontrado")
+        return await self._update_entity(
+            'funcionarios', funcionario_id, funcionario_data, f"Funcionário com ID {funcionario_id} não encontrado"
+        )
     
     async def delete_funcionario(self, funcionario_id: int):
         """Deletar funcionário"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Funcionarios')
-        records = worksheet.get_all_records()
-        
-        for i, record in enumerate(records, start=2):
-            if int(record['ID']) == funcionario_id:
-                worksheet.delete_rows(i)
-                return
-        
-        raise ValueError(f"Funcionário com ID {funcionario_id} não encontrado")
+        await self._delete_entity('funcionarios', funcionario_id, f"Funcionário com ID {funcionario_id} não encontrado")
     
     # Métodos para Pratos do Dia
     async def get_pratos(self) -> List[PratoDia]:
         """Obter todos os pratos do dia"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Pratos')
-        records = worksheet.get_all_records()
+        records = await self._get_records('Pratos')
         
         pratos = []
         for record in records:
             if record.get('ID'):
-                pratos.append(PratoDia(
-                    id=int(record['ID']),
-                    nome=record['Nome'],
-                    descricao=record['Descrição'],
-                    data=record['Data'],
-                    ativo=record['Ativo'].lower() == 'true',
-                    data_criacao=record['Data Criação'],
-                    data_atualizacao=record['Data Atualização']
-                ))
+                pratos.append(_prato_from_record(record))
         
         return pratos
     
     async def create_prato(self, prato_data) -> PratoDia:
         """Criar novo prato do dia"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Pratos')
-        prato_id = self._get_next_id('Pratos')
-        timestamp = self._get_current_timestamp()
-        
-        new_prato = PratoDia(
-            id=prato_id,
-            nome=prato_data.nome,
-            descricao=prato_data.descricao,
-            data=prato_data.data,
-            ativo=prato_data.ativo,
-            data_criacao=timestamp,
-            data_atualizacao=timestamp
-        )
-        
-        worksheet.append_row([
-            new_prato.id,
-            new_prato.nome,
-            new_prato.descricao,
-            new_prato.data,
-            str(new_prato.ativo),
-            new_prato.data_criacao,
-            new_prato.data_atualizacao
-        ])
-        
-        return new_prato
+        return await self._create_entity('pratos', prato_data)
     
     async def update_prato(self, prato_id: int, prato_data) -> PratoDia:
         """Atualizar prato do dia"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Pratos')
-        records = worksheet.get_all_records()
-        
-        for i, record in enumerate(records, start=2):
-            if int(record['ID']) == prato_id:
-                if prato_data.nome is not None:
-                    worksheet.update_cell(i, 2, prato_data.nome)
-                if prato_data.descricao is not None:
-                    worksheet.update_cell(i, 3, prato_data.descricao)
-                if prato_data.data is not None:
-                    worksheet.update_cell(i, 4, prato_data.data)
-                if prato_data.ativo is not None:
-                    worksheet.update_cell(i, 5, str(prato_data.ativo))
-                
-                worksheet.update_cell(i, 7, self._get_current_timestamp())
-                
-                updated_record = worksheet.row_values(i)
-                return PratoDia(
-                    id=int(updated_record[0]),
-                    nome=updated_record[1],
-                    descricao=updated_record[2],
-                    data=updated_record[3],
-                    ativo=updated_record[4].lower() == 'true',
-                    data_criacao=updated_record[5],
-                    data_atualizacao=updated_record[6]
-                )
-        
-        raise ValueError(f"Prato com ID {prato_id} não encontrado")
+        return await self._update_entity('pratos', prato_id, prato_data, f"Prato com ID {prato_id} não encontrado")
     
     async def delete_prato(self, prato_id: int):
         """Deletar prato do dia"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('Pratos')
-        records = worksheet.get_all_records()
-        
-        for i, record in enumerate(records, start=2):
-            if int(record['ID']) == prato_id:
-                worksheet.delete_rows(i)
-                return
-        
-        raise ValueError(f"Prato com ID {prato_id} não encontrado")
+        await self._delete_entity('pratos', prato_id, f"Prato com ID {prato_id} não encontrado")
     
     # Métodos para Check-ins de Refeições
+    def _checkin_worksheet_for(self, data: str) -> str:
+        """Aba em que um check-in desta data é gravado"""
+        return _checkin_partition(str(data)) if self.partition_checkins else 'CheckIns'
+    
+    def _checkin_worksheets(self, de: Optional[str] = None, ate: Optional[str] = None) -> List[str]:
+        """Abas de check-ins que podem ter datas entre de e ate (todas, sem período), em ordem de mês"""
+        if not self.partition_checkins:
+            return ['CheckIns']
+        names = []
+        legacy = self._legacy_checkin_range
+        # A aba anterior às partições só é lida se ainda não se conhece seu período ou se ele cruza o pedido
+        if legacy is None or (legacy and (de is None or legacy[1] >= de) and (ate is None or legacy[0] <= ate)):
+            names.append('CheckIns')
+        first, last = (de or '0000-01')[:7], (ate or '9999-12')[:7]
+        names += [
+            name for name in sorted(self._checkin_partitions)
+            if first <= _partition_month(name) <= last
+        ]
+        return names
+    
+    async def _get_checkin_records(self, de: Optional[str] = None, ate: Optional[str] = None) -> Dict[str, List[dict]]:
+        """Registros das abas de check-ins do período, lendo as que não estão em cache numa única chamada"""
+        # Conectar antes: as partições existentes são descobertas junto com as abas
+        await self._get_worksheet('CheckIns')
+        if self.shared is not None and self.partition_checkins:
+            # Partições criadas por outro processo depois da conexão
+            self._checkin_partitions.update(
+                name for name in await self.shared.worksheets() if CHECKIN_PARTITION.match(name)
+            )
+        return await self._get_records_many(*self._checkin_worksheets(de, ate))
+    
+    async def _get_checkin_worksheet(self, worksheet_name: str):
+        """Obter a aba de check-ins, criando a partição do mês na primeira gravação (virada automática)"""
+        worksheet = self._worksheets.get(worksheet_name)
+        if worksheet is not None:
+            return worksheet
+        if not CHECKIN_PARTITION.match(worksheet_name):
+            return await self._get_worksheet(worksheet_name)
+        async with self._partition_lock:
+            if worksheet_name in self._worksheets:
+                return self._worksheets[worksheet_name]
+            if worksheet_name in self._checkin_partitions:
+                return await self._get_worksheet(worksheet_name)
+            try:
+                worksheet = await self._run(self._add_worksheet, worksheet_name, len(SHEET_HEADERS['CheckIns']))
+            except gspread.exceptions.APIError:
+                # Criada ao mesmo tempo por outro processo: abrir a existente
+                worksheet = await self._run(self._open_worksheet, worksheet_name)
+            else:
+                await self._run(worksheet.append_row, SHEET_HEADERS['CheckIns'])
+                # Partição nova: vazia, sem precisar ler
+                if self.shared is not None:
+                    versions = await self.shared.versions([worksheet_name])
+                    await self._publish_shared(worksheet_name, versions[worksheet_name], [])
+                self._store_records(worksheet_name, [])
+            self._worksheets[worksheet_name] = worksheet
+            self._checkin_partitions.add(worksheet_name)
+            return worksheet
+    
     async def get_checkins(self) -> List[CheckInRefeicao]:
         """Obter todos os check-ins de refeições"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('CheckIns')
-        records = worksheet.get_all_records()
+        records = await self._entity_records('checkins')
         
         checkins = []
         for record in records:
             if record.get('ID'):
-                checkins.append(CheckInRefeicao(
-                    id=int(record['ID']),
-                    funcionario_id=int(record['Funcionario ID']),
-                    funcionario_nome=record['Funcionario Nome'],
-                    prato_id=int(record['Prato ID']),
-                    prato_nome=record['Prato Nome'],
-                    data=record['Data'],
-                    horario=record['Horário'],
-                    data_criacao=record['Data Criação']
-                ))
+                checkins.append(_checkin_from_record(record))
         
         return checkins
     
     async def create_checkin(self, checkin_data) -> CheckInRefeicao:
         """Criar novo check-in de refeição"""
-        client, sheet = self._get_client()
-
-        worksheet = sheet.worksheet('CheckIns')
-        checkin_id = self._get_next_id('CheckIns')
+        # Validação, nomes e duplicidade vêm do índice em memória
+        await self._sync_checkin_index([checkin_data])
+        funcionario, prato = await self.checkin_index.reserve(checkin_data)
+        try:
+            worksheet_name = self._checkin_worksheet_for(checkin_data.data)
+            # Também com write-behind: a partição precisa existir para as leituras enxergarem a fila
+            worksheet = await self._get_checkin_worksheet(worksheet_name)
+            checkin_id = await self._get_next_id('CheckIns')
+            record = _new_checkin_record(checkin_id, checkin_data, funcionario, prato, self._get_current_timestamp())
+            row = self._record_to_row('CheckIns', record)
+            new_checkin = _checkin_from_record(record)
+            
+            if self.checkin_queue is not None:
+                # Write-behind: confirmar agora e deixar a gravação para o próximo lote
+                self.checkin_queue.put(row)
+                self._cache_append(worksheet_name, row)
+            else:
+                await self._append_record(worksheet, worksheet_name, row)
+            await self._notify_written('checkins', 'create', new_checkin.id, new_checkin)
+        finally:
+            self.checkin_index.release(checkin_data)
+        
+        return new_checkin
+    
+    async def _bulk_checkins(self, operations) -> List[ResultadoOperacao]:
+        """Criar vários check-ins validando pelo índice em memória e gravando num único append_rows"""
+        timestamp = self._get_current_timestamp()
+        results: List[Optional[ResultadoOperacao]] = [None] * len(operations)
+        rows, created, reserved = [], [], []
+        await self._sync_checkin_index([checkin_data for _, _, checkin_data in operations])
+        try:
+            for index, (_, _, checkin_data) in enumerate(operations):
+                try:
+                    # Duplicatas dentro do próprio lote também são recusadas pela reserva
+                    funcionario, prato = await self.checkin_index.reserve(checkin_data)
+                except ValueError as e:
+                    results[index] = ResultadoOperacao(acao='create', sucesso=False, erro=str(e))
+                    continue
+                reserved.append(checkin_data)
+                record = _new_checkin_record(await self._get_next_id('CheckIns'), checkin_data, funcionario, prato, timestamp)
+                rows.append(self._record_to_row('CheckIns', record))
+                created.append((index, _checkin_from_record(record)))
+            return await self._write_bulk_checkins(rows, created, results)
+        finally:
+            for checkin_data in reserved:
+                self.checkin_index.release(checkin_data)
+    
+    async def _sync_checkin_index(self, checkins):
+        """Levar ao índice de check-ins o que outros processos gravaram (o índice não lê as planilhas)"""
+        if self.shared is not None:
+            worksheet_names = {self._checkin_worksheet_for(checkin_data.data) for checkin_data in checkins}
+            await self._sync_shared(['Funcionarios', 'Pratos', *sorted(worksheet_names)])
+    
+    def _group_checkin_rows(self, rows: List[list]) -> Dict[str, List[int]]:
+        """Posições das linhas de check-in por aba de destino"""
+        groups: Dict[str, List[int]] = {}
+        for position, row in enumerate(rows):
+            groups.setdefault(self._checkin_worksheet_for(row[CHECKIN_DATE_COLUMN]), []).append(position)
+        return groups
+    
+    async def _write_bulk_checkins(self, rows: List[list], created, results) -> List[ResultadoOperacao]:
+        """Gravar as linhas validadas de _bulk_checkins (um append_rows por aba) e notificar os check-ins criados"""
+        failed = set()
+        for worksheet_name, positions in self._group_checkin_rows(rows).items():
+            group = [rows[position] for position in positions]
+            try:
+                worksheet = await self._get_checkin_worksheet(worksheet_name)
+                if self.checkin_queue is not None:
+                    for row in group:
+                        self.checkin_queue.put(row)
+                        self._cache_append(worksheet_name, row)
+                    continue
+                async with self._worksheet_lock(worksheet_name):
+                    response = await self._run(worksheet.append_rows, group, table_range='A1')
+                    for row in group:
+                        self._cache_append(worksheet_name, row)
+                    self._index_appended_rows(worksheet_name, group, response)
+            except Exception as e:
+                for position in positions:
+                    index, _ = created[position]
+                    results[index] = ResultadoOperacao(acao='create', sucesso=False, erro=str(e))
+                    failed.add(position)
+        
+        for position, (index, checkin) in enumerate(created):
+            if position in failed:
+                continue
+            results[index] = ResultadoOperacao(acao='create', id=checkin.id, sucesso=True, item=checkin.model_dump())
+            self._notify('checkins', 'create', checkin.id, checkin)
+        await self._flush_shared()
+        return results
+    
+    async def _flush_checkins(self, rows: List[list], retrying: bool):
+        """Gravar um lote de check-ins enfileirados com um único append_rows por aba"""
+        for worksheet_name, positions in self._group_checkin_rows(rows).items():
+            group = [rows[position] for position in positions]
+            worksheet = await self._get_checkin_worksheet(worksheet_name)
+            async with self._worksheet_lock(worksheet_name):
+                if retrying:
+                    # A tentativa anterior pode ter chegado à planilha apesar do erro
+                    existing_ids = set(await self._run(worksheet.col_values, 1))
+                    group = [row for row in group if str(row[0]) not in existing_ids]
+                    if not group:
+                        continue
+                response = await self._run(worksheet.append_rows, group, table_range='A1')
+                self._index_appended_rows(worksheet_name, group, response)
+    
+    async def get_checkins_por_periodo(self, de: str, ate: str) -> List[CheckInRefeicao]:
+        """Obter check-ins entre duas datas (inclusive), lendo só as abas do período, pelo índice de datas"""
+        selected = []
+        by_worksheet = await self._get_checkin_records(de, ate)
+        for worksheet_name, records in by_worksheet.items():
+            dates = self._date_index(worksheet_name)
+            if not dates.covers(records):
+                dates.build(records)
+            selected.extend(dates.between(de, ate))
+        if len(by_worksheet) > 1:
+            # A aba anterior às partições pode ter datas dos mesmos meses
+            selected.sort(key=lambda record: str(record['Data']))
+        return [_checkin_from_record(record) for record in selected]
+    
+    # Métodos para Listas de Compras Fixas
+    async def get_listas_fixas(self) -> List[ListaFixa]:
+        """Obter todas as listas de compras fixas"""
+        records = await self._get_records('ListasCompras')
+        return [_lista_fixa_from_record(record) for record in records if record.get('ID')]
+    
+    async def create_lista_fixa(self, lista_data) -> ListaFixa:
+        """Criar nova lista de compras fixa"""
+        worksheet = await self._get_worksheet('ListasCompras')
+        lista_id = await self._get_next_id('ListasCompras')
         timestamp = self._get_current_timestamp()
         
-        # Buscar dados do funcionário e prato
-        funcionarios = await self.get_funcionarios()
-        pratos = await self.get_pratos()
-        
-        funcionario = next((f for f in funcionarios if f.id == checkin_data.funcionario_id), None)
-        prato = next((p for p in pratos if p.id == checkin_data.prato_id), None)
-        
-        if not funcionario:
-            raise ValueError(f"Funcionário com ID {checkin_data.funcionario_id} não encontrado")
-        if not prato:
-            raise ValueError(f"Prato com ID {checkin_data.prato_id} não encontrado")
-        
-        new_checkin = CheckInRefeicao(
-            id=checkin_id,
-            funcionario_id=checkin_data.funcionario_id,
-            funcionario_nome=funcionario.nome,
-            prato_id=checkin_data.prato_id,
-            prato_nome=prato.nome,
-            data=checkin_data.data,
-            horario=checkin_data.horario,
-            data_criacao=timestamp
+        new_lista = ListaFixa(
+            id=lista_id,
+            nome=lista_data.nome,
+            itens=lista_data.itens,
+            data_criacao=timestamp,
+            data_atualizacao=timestamp
         )
         
-        worksheet.append_row([
-            new_checkin.id,
-            new_checkin.funcionario_id,
-            new_checkin.funcionario_nome,
-            new_checkin.prato_id,
-            new_checkin.prato_nome,
-            new_checkin.data,
-            new_checkin.horario,
-            new_checkin.data_criacao
-        ])
+        row = [
+            new_lista.id,
+            new_lista.nome,
+            _itens_to_cell(new_lista.itens),
+            new_lista.data_criacao,
+            new_lista.data_atualizacao
+        ]
+        await self._append_record(worksheet, 'ListasCompras', row)
+        await self._notify_written('listas_fixas', 'create', new_lista.id, new_lista)
         
-        return new_checkin
+        return new_lista
+    
+    async def update_lista_fixa(self, lista_id: int, lista_data) -> ListaFixa:
+        """Atualizar nome e/ou itens de uma lista fixa"""
+        worksheet = await self._get_worksheet('ListasCompras')
+        
+        async with self._worksheet_lock('ListasCompras'):
+            located = await self._locate_record(worksheet, 'ListasCompras', lista_id)
+            if located is None:
+                raise ValueError(f"Lista com ID {lista_id} não encontrada")
+            row_number, record = located
+            
+            updated_record = dict(record)
+            if lista_data.nome is not None:
+                updated_record['Nome'] = lista_data.nome
+            if lista_data.itens is not None:
+                updated_record['Itens'] = _itens_to_cell(lista_data.itens)
+            updated_record['Data Atualização'] = self._get_current_timestamp()
+            
+            await self._write_record(worksheet, 'ListasCompras', row_number, updated_record)
+            self._cache_replace('ListasCompras', updated_record)
+        
+        updated = _lista_fixa_from_record(updated_record)
+        await self._notify_written('listas_fixas', 'update', lista_id, updated)
+        return updated
     
-    async def get_checkins_por_data(self, data: str) -> List[CheckInRefeicao]:
-        """Obter check-ins de uma data específica"""
-        checkins = await self.get_checkins()
-        return [checkin for checkin in checkins if checkin.data == data]
+    async def delete_lista_fixa(self, lista_id: int):
+        """Deletar lista de compras fixa"""
+        worksheet = await self._get_worksheet('ListasCompras')
+        
+        record = await self._delete_record(worksheet, 'ListasCompras', lista_id)
+        if record is None:
+            raise ValueError(f"Lista com ID {lista_id} não encontrada")
+        await self._notify_written('listas_fixas', 'delete', lista_id, _lista_fixa_from_record(record))
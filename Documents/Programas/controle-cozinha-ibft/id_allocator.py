@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+# Leitura do maior ID existente na planilha
+GetMaxId = Callable[[], Awaitable[int]]
+
+# Reserva de bloco: (planilha, leitura do maior ID, tamanho) -> (primeiro ID, último ID); a reserva decide se
+# precisa do maior ID
+ReserveBlock = Callable[[str, GetMaxId, int], Awaitable[Tuple[int, int]]]
+
+
+class IdAllocator:
+    """Alocador de IDs por planilha: semeado uma vez, mantido em memória e seguro sob concorrência"""
+
+    def __init__(self, block_size: int = 0, reserve_block: Optional[ReserveBlock] = None):
+        # block_size > 0 reserva faixas de IDs compartilhadas entre processos
+        self.block_size = block_size
+        self._reserve_block = reserve_block
+        self._next: Dict[str, int] = {}
+        self._block_end: Dict[str, int] = {}
+        self._floor: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        if self.block_size > 0 and self._reserve_block is None:
+            raise ValueError("reserve_block é obrigatório quando block_size > 0")
+
+    def _get_lock(self, worksheet_name: str) -> asyncio.Lock:
+        if worksheet_name not in self._locks:
+            self._locks[worksheet_name] = asyncio.Lock()
+        return self._locks[worksheet_name]
+
+    async def allocate(self, worksheet_name: str, get_max_id: GetMaxId) -> int:
+        """Obter o próximo ID da planilha; get_max_id só é chamado ao semear ou, se a reserva pedir, num novo bloco"""
+        async with self._get_lock(worksheet_name):
+            next_id = self._next.get(worksheet_name)
+
+            if self.block_size > 0:
+                if next_id is None or next_id > self._block_end[worksheet_name]:
+                    next_id, self._block_end[worksheet_name] = await self._reserve_block(
+                        worksheet_name, get_max_id, self.block_size
+                    )
+            elif next_id is None:
+                next_id = max(await get_max_id() + 1, self._floor.get(worksheet_name, 1))
+
+            self._next[worksheet_name] = next_id + 1
+            return next_id
+
+    def is_seeded(self, worksheet_name: str) -> bool:
+        """Verificar se a planilha já tem próximo ID em memória (sem precisar do maior ID)"""
+        return worksheet_name in self._next
+
+    def reset(self, worksheet_name: Optional[str] = None):
+        """Forçar nova semeadura, sem nunca voltar atrás de IDs já entregues"""
+        names = [worksheet_name] if worksheet_name else list(self._next)
+        for name in names:
+            if self.block_size > 0:
+                # Faixas reservadas continuam válidas; não há o que semear de novo
+                continue
+            if name in self._next:
+                self._floor[name] = self._next.pop(name)
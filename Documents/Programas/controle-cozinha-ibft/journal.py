@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JournalInUseError(RuntimeError):
+    """O arquivo do diário já está aberto por outro processo"""
+
+
+class JournalEntry:
+    """Uma alteração confirmada ao cliente e ainda não aplicada à planilha"""
+
+    def __init__(self, seq: int, chave: str, planilha: str, acao: str, registro_id: int, dados,
+                 criado_em: str, incerta: bool = False):
+        self.seq = seq
+        # Chave de idempotência da alteração; na planilha, o ID do registro (coluna A) identifica se já foi aplicada
+        self.chave = chave
+        self.planilha = planilha
+        # 'append' (dados: linha), 'update' (dados: registro completo) ou 'delete' (sem dados)
+        self.acao = acao
+        self.registro_id = registro_id
+        self.dados = dados
+        self.criado_em = criado_em
+        # Já pode ter chegado à planilha (tentativa com erro ou processo reiniciado): conferir antes de reaplicar
+        self.incerta = incerta
+
+
+# Aplicação de um lote, em ordem: (entradas) -> None; marca as aplicadas com complete() e lança exceção ao falhar
+ApplyBatch = Callable[[List[JournalEntry]], Awaitable[None]]
+
+
+class WriteJournal:
+    """Diário local de alterações (SQLite com gravação síncrona no disco) reaplicadas ao Google Sheets em
+    segundo plano: uma escrita é confirmada assim que chega ao diário, mesmo com o Google fora do ar"""
+
+    def __init__(self, path: str, apply_batch: ApplyBatch, interval: float = 2, max_items: int = 50,
+                 retry_delay: float = 2, max_retry_delay: float = 60):
+        self.path = path
+        self.apply_batch = apply_batch
+        self.interval = interval
+        self.max_items = max_items
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # Uma única thread: as gravações chegam ao disco na ordem em que foram pedidas
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diario")
+        # Um processo por arquivo: dois reaplicando as mesmas pendências gravariam tudo duas vezes.
+        # O lock exclusivo fica com esta conexão até o encerramento; outro processo falha ao abrir
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=0)
+        self.conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("BEGIN EXCLUSIVE")
+            self.conn.execute("COMMIT")
+        except sqlite3.OperationalError:
+            self.conn.close()
+            self._executor.shutdown(wait=False)
+            raise JournalInUseError(
+                f"Diário {path} em uso por outro processo: com vários workers, cada um precisa do seu arquivo"
+            ) from None
+        # FULL: cada commit é sincronizado com o disco antes de a escrita ser confirmada
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS diario (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                chave TEXT NOT NULL UNIQUE,
+                planilha TEXT NOT NULL,
+                acao TEXT NOT NULL,
+                registro_id INTEGER NOT NULL,
+                dados TEXT,
+                criado_em TEXT NOT NULL
+            )
+        """)
+        # Pendências de uma execução anterior: não se sabe se chegaram à planilha antes do encerramento
+        self._pending: List[JournalEntry] = [
+            JournalEntry(seq, chave, planilha, acao, registro_id, json.loads(dados) if dados else None,
+                         criado_em, incerta=True)
+            for seq, chave, planilha, acao, registro_id, dados, criado_em in self.conn.execute(
+                "SELECT seq, chave, planilha, acao, registro_id, dados, criado_em FROM diario ORDER BY seq"
+            )
+        ]
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self.last_error: Optional[str] = None
+        self.last_applied: Optional[str] = None
+
+    @property
+    def pending(self) -> List[JournalEntry]:
+        """Alterações ainda não aplicadas, em ordem"""
+        return list(self._pending)
+
+    def _insert(self, chave: str, planilha: str, acao: str, registro_id: int, dados: Optional[str],
+                criado_em: str) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO diario (chave, planilha, acao, registro_id, dados, criado_em) VALUES (?, ?, ?, ?, ?, ?)",
+            (chave, planilha, acao, registro_id, dados, criado_em)
+        )
+        return cursor.lastrowid
+
+    async def append(self, planilha: str, acao: str, registro_id: int, dados=None) -> JournalEntry:
+        """Gravar uma alteração no diário (retorna depois do fsync) e agendar sua aplicação"""
+        chave = uuid.uuid4().hex
+        criado_em = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        payload = json.dumps(dados, ensure_ascii=False) if dados is not None else None
+        loop = asyncio.get_running_loop()
+        seq = await loop.run_in_executor(
+            self._executor, self._insert, chave, planilha, acao, registro_id, payload, criado_em
+        )
+        entry = JournalEntry(seq, chave, planilha, acao, registro_id, dados, criado_em)
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_items:
+            self._wakeup.set()
+        return entry
+
+    def _delete(self, seqs: List[int]):
+        self.conn.executemany("DELETE FROM diario WHERE seq = ?", [(seq,) for seq in seqs])
+
+    async def complete(self, entries: List[JournalEntry]):
+        """Remover do diário alterações já aplicadas à planilha"""
+        seqs = {entry.seq for entry in entries}
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._delete, list(seqs))
+        self._pending = [entry for entry in self._pending if entry.seq not in seqs]
+        self.last_applied = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def overlay(self, planilha: str, records: List[dict], row_to_record: Callable[[list], dict]):
+        """Aplicar sobre uma leitura da planilha as alterações pendentes dela (na própria lista)"""
+        for entry in self._pending:
+            if entry.planilha != planilha:
+                continue
+            position = next(
+                (i for i, record in enumerate(records)
+                 if record.get('ID') and int(record['ID']) == entry.registro_id),
+                None
+            )
+            if entry.acao == 'append':
+                if position is None:
+                    records.append(row_to_record(entry.dados))
+            elif entry.acao == 'update':
+                if position is not None:
+                    records[position] = dict(entry.dados)
+            elif position is not None:
+                del records[position]
+
+    def status(self) -> Dict:
+        """Pendências e situação da reaplicação"""
+        return {
+            'ativo': True,
+            'pendentes': len(self._pending),
+            'mais_antigo': self._pending[0].criado_em if self._pending else None,
+            'falhas_seguidas': self._failures,
+            'ultimo_erro': self.last_error,
+            'ultima_aplicacao': self.last_applied
+        }
+
+    def start(self):
+        """Iniciar a reaplicação em segundo plano"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Parar a reaplicação; o que estiver pendente continua no diário para a próxima execução"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.submit(self.conn.close).result()
+        self._executor.shutdown(wait=False)
+
+    async def replay(self):
+        """Aplicar as pendências à planilha em lotes de até max_items, na ordem do diário"""
+        while self._pending:
+            batch = self._pending[:self.max_items]
+            try:
+                await self.apply_batch(batch)
+            except Exception:
+                # O lote pode ter sido aplicado em parte: o que sobrou é conferido antes de reaplicar
+                for entry in self._pending[:len(batch)]:
+                    entry.incerta = True
+                raise
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+            try:
+                await self.replay()
+                self._failures = 0
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Google fora do ar ou recusando: as alterações ficam no diário e a próxima tentativa espera mais
+                self._failures += 1
+                self.last_error = str(e)
+                delay = min(self.retry_delay * 2 ** (self._failures - 1), self.max_retry_delay)
+                logger.exception("Falha ao aplicar %d alteração(ões) do diário; nova tentativa em %.1fs",
+                                 len(self._pending), delay)
+                await asyncio.sleep(delay)
@@ -0,0 +1,57 @@
+from typing import Dict, List
+from views import IncrementalView
+from models import EstoqueItem, ItemListaCompras
+
+
+def precisa_repor(item: EstoqueItem) -> bool:
+    """Item abaixo do próprio estoque mínimo"""
+    return item.quantidade < item.estoque_minimo
+
+
+def quantidade_sugerida(item: EstoqueItem) -> int:
+    """Quantidade a comprar para voltar ao estoque alvo (nunca abaixo do mínimo e pelo menos 1)"""
+    return max(1, max(item.estoque_alvo, item.estoque_minimo) - item.quantidade)
+
+
+class EstoqueBaixo(IncrementalView):
+    """Conjunto de itens abaixo do estoque mínimo, atualizado a cada gravação no estoque"""
+
+    entities = ('estoque',)
+
+    def __init__(self, backend, max_age: float = 300):
+        # max_age: a cada quantos segundos reconstruir a partir da leitura completa do estoque
+        super().__init__(backend, max_age)
+        self._itens: Dict[int, EstoqueItem] = {}
+
+    async def rebuild(self):
+        """Reconstruir o conjunto a partir da leitura completa do estoque"""
+        estoque = await self.backend.get_estoque()
+        self._itens = {item.id: item for item in estoque if precisa_repor(item)}
+
+    def update(self, entity: str, action: str, item_id: int, item=None):
+        """Aplicar uma criação/atualização/remoção de item do estoque"""
+        if action != 'delete' and precisa_repor(item):
+            self._itens[item_id] = item
+        else:
+            self._itens.pop(item_id, None)
+
+    async def get_itens(self) -> List[EstoqueItem]:
+        """Itens do estoque abaixo do mínimo, ordenados por ID"""
+        await self.ensure_loaded()
+        return sorted(self._itens.values(), key=lambda item: item.id)
+
+    async def get_lista(self) -> List[ItemListaCompras]:
+        """Lista de compras variável: itens a repor com a quantidade sugerida"""
+        return [
+            ItemListaCompras(
+                estoque_id=item.id,
+                nome=item.nome,
+                unidade=item.unidade,
+                categoria=item.categoria,
+                quantidade_atual=item.quantidade,
+                estoque_minimo=item.estoque_minimo,
+                estoque_alvo=item.estoque_alvo,
+                quantidade_sugerida=quantidade_sugerida(item)
+            )
+            for item in await self.get_itens()
+        ]
@@ -1,17 +1,62 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ValidationError
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+import logging
+import math
 import os
+import time
 from dotenv import load_dotenv
-from google_sheets_service import GoogleSheetsService
-from models import EstoqueItem, Funcionario, PratoDia, CheckInRefeicao
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from storage import ENTITY_WRITERS, LIST_ADAPTERS, create_storage
+from checkin_index import DuplicateCheckInError
+from events import EventBroker
+from metrics import MetricsMiddleware, http_errors, registry, route_label
+from pagination import InvalidQueryError, MAX_PAGE_SIZE, paginate_models
+from scheduler import UpstreamBusyError
+from models import (
+    ESTOQUE_MINIMO_PADRAO, EstoqueItem, Funcionario, PratoDia, CheckInRefeicao, DashboardResumo,
+    ItemListaCompras, ItemListaFixa, ListaFixa, RelatorioRefeicoes, ResultadoOperacao, StatusDiario
+)
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
-app = FastAPI(title="Controle de Cozinha IBFT", version="1.0.0")
+# Mensagens no mesmo log do uvicorn (visível sem configurar logging)
+logger = logging.getLogger("uvicorn.error")
+
+# Inicializar backend de armazenamento (Google Sheets ou SQLite, via STORAGE_BACKEND)
+storage = create_storage()
+
+# Alterações do backend difundidas em tempo real em /api/events
+events = EventBroker()
+storage.add_listener(events.publish)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Conectar e pré-carregar o armazenamento antes de aceitar requisições; gravar pendências ao encerrar"""
+    started = time.perf_counter()
+    if os.getenv("WARM_UP_ON_START", "true").lower() == "true":
+        try:
+            await storage.warm_up()
+        except Exception:
+            # Sem conexão na subida a API continua no ar: as leituras tentam de novo sob demanda
+            logger.exception("Falha ao pré-carregar o armazenamento")
+    storage.start()
+    app.state.startup_seconds = time.perf_counter() - started
+    logger.info("Armazenamento pronto em %.2fs", app.state.startup_seconds)
+    
+    yield
+    
+    events.close()
+    await storage.stop()
+
+app = FastAPI(title="Controle de Cozinha IBFT", version="1.0.0", lifespan=lifespan)
 
 # Configurar CORS
 app.add_middleware(
@@ -20,10 +65,92 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
 )
 
-# Inicializar serviço do Google Sheets
-google_sheets = GoogleSheetsService()
+# Latência por rota, exposta em /api/metrics
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(StarletteHTTPException)
+async def count_http_error(request: Request, exc: StarletteHTTPException):
+    """Contar erros pelo tipo da exceção que os originou (os handlers convertem tudo em HTTPException)"""
+    cause = exc.__cause__ or exc.__context__
+    if isinstance(cause, UpstreamBusyError):
+        # Cota do Google Sheets esgotada: 503 com Retry-After em vez de um 500 genérico
+        exc = StarletteHTTPException(
+            status_code=503, detail=str(cause), headers={"Retry-After": str(math.ceil(cause.retry_after))}
+        )
+    http_errors.inc(route_label(request.scope), str(exc.status_code), type(cause or exc).__name__)
+    return await http_exception_handler(request, exc)
+
+@app.exception_handler(RequestValidationError)
+async def count_validation_error(request: Request, exc: RequestValidationError):
+    """Contar erros de validação da requisição"""
+    http_errors.inc(route_label(request.scope), "422", type(exc).__name__)
+    return await request_validation_exception_handler(request, exc)
+
+# Datas nos parâmetros de consulta: YYYY-MM-DD
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+class ListParams:
+    """Parâmetros de paginação (limit/cursor), ordenação (sort=campo ou -campo) e projeção (fields=a,b)"""
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.fields = fields
+    
+    @property
+    def requested(self) -> bool:
+        return any(value is not None for value in (self.limit, self.cursor, self.sort, self.fields))
+
+def page_response(items: List[dict], next_cursor: Optional[str]) -> JSONResponse:
+    """Resposta paginada: itens no corpo e próximo cursor no cabeçalho X-Next-Cursor"""
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return JSONResponse(items, headers=headers)
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Verificar se o cliente já tem esta versão (cabeçalho If-None-Match)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip() for tag in header.split(",")}
+    # Comparação fraca: W/"x" equivale a "x"
+    return etag in tags or f"W/{etag}" in tags or "*" in tags
+
+async def conditional_get(request: Request, response: Response, entity: str, load,
+                          de: Optional[str] = None, ate: Optional[str] = None):
+    """Responder 304 se o ETag do cliente continua válido; senão carregar e anexar o ETag.
+
+    de/ate: período consultado, para a versão só conferir as abas de check-ins que ele cobre.
+    """
+    # A versão é lida antes dos dados: uma alteração no meio gera, no máximo, um 200 a mais
+    etag = f'"{await storage.get_version(entity, de, ate)}"'
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    result = await load()
+    target = result if isinstance(result, Response) else response
+    target.headers["ETag"] = etag
+    return result
+
+def json_body(body: bytes) -> Response:
+    """Resposta com JSON já serializado (sem passar de novo pelo response_model)"""
+    return Response(content=body, media_type="application/json")
+
+async def list_entity(entity: str, params: ListParams):
+    """Listar uma entidade inteira (JSON em cache por versão) ou, se pedido, uma página projetada"""
+    if not params.requested:
+        return json_body(await storage.list_json(entity))
+    items, next_cursor = await storage.list_page(
+        entity, params.limit, params.cursor, params.sort, params.fields
+    )
+    return page_response(items, next_cursor)
 
 # Modelos Pydantic para validação
 class EstoqueItemCreate(BaseModel):
@@ -31,12 +158,16 @@ class EstoqueItemCreate(BaseModel):
     quantidade: int
     unidade: str
     categoria: str
+    estoque_minimo: int = ESTOQUE_MINIMO_PADRAO
+    estoque_alvo: Optional[int] = None  # padrão: igual ao estoque mínimo
 
 class EstoqueItemUpdate(BaseModel):
     nome: Optional[str] = None
     quantidade: Optional[int] = None
     unidade: Optional[str] = None
     categoria: Optional[str] = None
+    estoque_minimo: Optional[int] = None
+    estoque_alvo: Optional[int] = None
 
 class FuncionarioCreate(BaseModel):
     nome: str
@@ -66,12 +197,72 @@ class CheckInRefeicaoCreate(BaseModel):
     data: str
     horario: str
 
+class ListaFixaCreate(BaseModel):
+    nome: str
+    itens: List[ItemListaFixa] = []
+
+class ListaFixaUpdate(BaseModel):
+    nome: Optional[str] = None
+    itens: Optional[List[ItemListaFixa]] = None
+
+class OperacaoLote(BaseModel):
+    acao: Literal['create', 'update', 'delete']
+    id: Optional[int] = None
+    dados: dict = {}
+
+class Lote(BaseModel):
+    operacoes: List[OperacaoLote]
+
+# Operações em lote: limite por requisição e modelos de criação/atualização de cada entidade
+MAX_BULK_OPERATIONS = 500
+BULK_MODELS = {
+    'estoque': (EstoqueItemCreate, EstoqueItemUpdate),
+    'funcionarios': (FuncionarioCreate, FuncionarioUpdate),
+    'pratos': (PratoDiaCreate, PratoDiaUpdate),
+    'checkins': (CheckInRefeicaoCreate, None)
+}
+
+async def run_bulk(entity: str, lote: Lote) -> List[ResultadoOperacao]:
+    """Validar cada operação e aplicar as válidas num único lote; retorna um resultado por operação"""
+    if len(lote.operacoes) > MAX_BULK_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {MAX_BULK_OPERATIONS} operações por lote")
+    
+    create_model, update_model = BULK_MODELS[entity]
+    results: List[Optional[ResultadoOperacao]] = [None] * len(lote.operacoes)
+    positions, operations = [], []
+    for index, operacao in enumerate(lote.operacoes):
+        error, data = None, None
+        if operacao.acao not in ENTITY_WRITERS[entity]:
+            error = f"Operação {operacao.acao} não suportada para {entity}"
+        elif operacao.acao != 'create' and operacao.id is None:
+            error = f"Operação {operacao.acao} exige o campo id"
+        elif operacao.acao != 'delete':
+            try:
+                data = (create_model if operacao.acao == 'create' else update_model)(**operacao.dados)
+            except ValidationError as e:
+                error = str(e)
+        
+        if error is not None:
+            results[index] = ResultadoOperacao(acao=operacao.acao, id=operacao.id, sucesso=False, erro=error)
+        else:
+            positions.append(index)
+            operations.append((operacao.acao, operacao.id if operacao.acao != 'create' else None, data))
+    
+    if operations:
+        for index, result in zip(positions, await storage.bulk(entity, operations)):
+            results[index] = result
+    return results
+
 # Rotas para Estoque
 @app.get("/api/estoque", response_model=List[EstoqueItem])
-async def get_estoque():
+async def get_estoque(request: Request, response: Response, params: ListParams = Depends()):
     """Obter todos os itens do estoque"""
     try:
-        return await google_sheets.get_estoque()
+        return await conditional_get(
+            request, response, "estoque", lambda: list_entity("estoque", params)
+        )
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -79,7 +270,7 @@ async def get_estoque():
 async def create_estoque_item(item: EstoqueItemCreate):
     """Adicionar novo item ao estoque"""
     try:
-        return await google_sheets.create_estoque_item(item)
+        return await storage.create_estoque_item(item)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -87,7 +278,7 @@ async def create_estoque_item(item: EstoqueItemCreate):
 async def update_estoque_item(item_id: int, item: EstoqueItemUpdate):
     """Atualizar item do estoque"""
     try:
-        return await google_sheets.update_estoque_item(item_id, item)
+        return await storage.update_estoque_item(item_id, item)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -95,17 +286,31 @@ async def update_estoque_item(item_id: int, item: EstoqueItemUpdate):
 async def delete_estoque_item(item_id: int):
     """Remover item do estoque"""
     try:
-        await google_sheets.delete_estoque_item(item_id)
+        await storage.delete_estoque_item(item_id)
         return {"message": "Item removido com sucesso"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/estoque/bulk", response_model=List[ResultadoOperacao])
+async def bulk_estoque(lote: Lote):
+    """Criar, atualizar e remover itens do estoque num único lote"""
+    try:
+        return await run_bulk("estoque", lote)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Rotas para Funcionários
 @app.get("/api/funcionarios", response_model=List[Funcionario])
-async def get_funcionarios():
+async def get_funcionarios(request: Request, response: Response, params: ListParams = Depends()):
     """Obter todos os funcionários"""
     try:
-        return await google_sheets.get_funcionarios()
+        return await conditional_get(
+            request, response, "funcionarios", lambda: list_entity("funcionarios", params)
+        )
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -113,7 +318,7 @@ async def get_funcionarios():
 async def create_funcionario(funcionario: FuncionarioCreate):
     """Adicionar novo funcionário"""
     try:
-        return await google_sheets.create_funcionario(funcionario)
+        return await storage.create_funcionario(funcionario)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -121,7 +326,7 @@ async def create_funcionario(funcionario: FuncionarioCreate):
 async def update_funcionario(funcionario_id: int, funcionario: FuncionarioUpdate):
     """Atualizar funcionário"""
     try:
-        return await google_sheets.update_funcionario(funcionario_id, funcionario)
+        return await storage.update_funcionario(funcionario_id, funcionario)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -129,17 +334,31 @@ async def update_funcionario(funcionario_id: int, funcionario: FuncionarioUpdate
 async def delete_funcionario(funcionario_id: int):
     """Remover funcionário"""
     try:
-        await google_sheets.delete_funcionario(funcionario_id)
+        await storage.delete_funcionario(funcionario_id)
         return {"message": "Funcionário removido com sucesso"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/funcionarios/bulk", response_model=List[ResultadoOperacao])
+async def bulk_funcionarios(lote: Lote):
+    """Criar, atualizar e remover funcionários num único lote"""
+    try:
+        return await run_bulk("funcionarios", lote)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Rotas para Pratos do Dia
 @app.get("/api/pratos", response_model=List[PratoDia])
-async def get_pratos():
+async def get_pratos(request: Request, response: Response, params: ListParams = Depends()):
     """Obter todos os pratos do dia"""
     try:
-        return await google_sheets.get_pratos()
+        return await conditional_get(
+            request, response, "pratos", lambda: list_entity("pratos", params)
+        )
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -147,7 +366,7 @@ async def get_pratos():
 async def create_prato(prato: PratoDiaCreate):
     """Adicionar novo prato do dia"""
     try:
-        return await google_sheets.create_prato(prato)
+        return await storage.create_prato(prato)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -155,7 +374,7 @@ async def create_prato(prato: PratoDiaCreate):
 async def update_prato(prato_id: int, prato: PratoDiaUpdate):
     """Atualizar prato do dia"""
     try:
-        return await google_sheets.update_prato(prato_id, prato)
+        return await storage.update_prato(prato_id, prato)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -163,17 +382,51 @@ async def update_prato(prato_id: int, prato: PratoDiaUpdate):
 async def delete_prato(prato_id: int):
     """Remover prato do dia"""
     try:
-        await google_sheets.delete_prato(prato_id)
+        await storage.delete_prato(prato_id)
         return {"message": "Prato removido com sucesso"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/pratos/bulk", response_model=List[ResultadoOperacao])
+async def bulk_pratos(lote: Lote):
+    """Criar, atualizar e remover pratos do dia num único lote"""
+    try:
+        return await run_bulk("pratos", lote)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Rotas para Check-in de Refeições
 @app.get("/api/checkins", response_model=List[CheckInRefeicao])
-async def get_checkins():
-    """Obter todos os check-ins de refeições"""
+async def get_checkins(
+    request: Request,
+    response: Response,
+    data: Optional[str] = Query(None, pattern=DATE_PATTERN),
+    de: Optional[str] = Query(None, pattern=DATE_PATTERN),
+    ate: Optional[str] = Query(None, pattern=DATE_PATTERN),
+    params: ListParams = Depends()
+):
+    """Obter check-ins de refeições (todos, de uma data ou de um período)"""
+    async def load():
+        if data is None and de is None and ate is None:
+            return await list_entity("checkins", params)
+        
+        if data is not None:
+            checkins = await storage.get_checkins_por_data(data)
+        else:
+            checkins = await storage.get_checkins_por_periodo(de or "0000-01-01", ate or "9999-12-31")
+        if not params.requested:
+            return json_body(LIST_ADAPTERS["checkins"].dump_json(checkins))
+        return page_response(*paginate_models(
+            checkins, CheckInRefeicao, params.limit, params.cursor, params.sort, params.fields
+        ))
+    
     try:
-        return await google_sheets.get_checkins()
+        period = (data, data) if data is not None else (de, ate)
+        return await conditional_get(request, response, "checkins", load, *period)
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -181,7 +434,19 @@ async def get_checkins():
 async def create_checkin(checkin: CheckInRefeicaoCreate):
     """Registrar check-in de refeição"""
     try:
-        return await google_sheets.create_checkin(checkin)
+        return await storage.create_checkin(checkin)
+    except DuplicateCheckInError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/checkins/bulk", response_model=List[ResultadoOperacao])
+async def bulk_checkins(lote: Lote):
+    """Registrar vários check-ins num único lote"""
+    try:
+        return await run_bulk("checkins", lote)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -191,15 +456,128 @@ async def get_checkins_hoje():
     try:
         from datetime import datetime
         hoje = datetime.now().strftime("%Y-%m-%d")
-        return await google_sheets.get_checkins_por_data(hoje)
+        return await storage.get_checkins_por_data(hoje)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Rota do dashboard
+@app.get("/api/dashboard", response_model=DashboardResumo)
+async def get_dashboard():
+    """Obter o resumo do dashboard (contagens, estoque baixo e check-ins de hoje)"""
+    try:
+        return await storage.get_dashboard()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Diário local de escrita
+@app.get("/api/diario", response_model=StatusDiario)
+async def get_status_diario():
+    """Alterações confirmadas e ainda não aplicadas ao Google Sheets (SHEETS_JOURNAL_PATH)"""
+    try:
+        return await storage.journal_status()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Rotas de relatórios
+@app.get("/api/relatorios/refeicoes", response_model=RelatorioRefeicoes)
+async def get_relatorio_refeicoes(
+    de: Optional[str] = Query(None, pattern=DATE_PATTERN),
+    ate: Optional[str] = Query(None, pattern=DATE_PATTERN),
+    agrupar: Literal["dia", "prato", "funcionario"] = "dia"
+):
+    """Refeições de um período (padrão: últimos 30 dias) por dia, prato ou funcionário"""
+    try:
+        from datetime import datetime, timedelta
+        ate = ate or datetime.now().strftime("%Y-%m-%d")
+        de = de or (datetime.strptime(ate, "%Y-%m-%d") - timedelta(days=29)).strftime("%Y-%m-%d")
+        if de > ate:
+            raise HTTPException(status_code=400, detail="'de' deve ser anterior ou igual a 'ate'")
+        return await storage.get_relatorio_refeicoes(de, ate, agrupar)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Rotas para Lista de Compras
+@app.get("/api/lista-compras", response_model=List[ItemListaCompras])
+async def get_lista_compras():
+    """Obter a lista de compras variável (itens abaixo do estoque mínimo, com quantidade sugerida)"""
+    try:
+        return await storage.get_lista_compras()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/listas-fixas", response_model=List[ListaFixa])
+async def get_listas_fixas(request: Request, response: Response):
+    """Obter todas as listas de compras fixas"""
+    try:
+        async def load():
+            return json_body(await storage.list_json("listas_fixas"))
+        return await conditional_get(request, response, "listas_fixas", load)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/listas-fixas", response_model=ListaFixa)
+async def create_lista_fixa(lista: ListaFixaCreate):
+    """Criar nova lista de compras fixa"""
+    try:
+        return await storage.create_lista_fixa(lista)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.put("/api/listas-fixas/{lista_id}", response_model=ListaFixa)
+async def update_lista_fixa(lista_id: int, lista: ListaFixaUpdate):
+    """Atualizar nome e/ou itens de uma lista fixa"""
+    try:
+        return await storage.update_lista_fixa(lista_id, lista)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/listas-fixas/{lista_id}")
+async def delete_lista_fixa(lista_id: int):
+    """Remover lista de compras fixa"""
+    try:
+        await storage.delete_lista_fixa(lista_id)
+        return {"message": "Lista removida com sucesso"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Rota de eventos em tempo real
+@app.get("/api/events")
+async def stream_events(request: Request):
+    """Stream SSE com um evento por criação/atualização/remoção ({entidade, acao, id, item})"""
+    return StreamingResponse(
+        events.stream(request.headers.get("last-event-id"), request.is_disconnected),
+        media_type="text/event-stream",
+        # Sem cache nem buffer em proxies: cada evento deve chegar na hora
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Rotas de cache
+@app.post("/api/cache/refresh")
+async def refresh_cache(planilha: Optional[str] = None):
+    """Recarregar o cache das planilhas (todas ou apenas uma)"""
+    try:
+        planilhas = await storage.refresh_cache(planilha)
+        return {"message": "Cache atualizado com sucesso", "planilhas": planilhas}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Rota de métricas
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Métricas no formato texto do Prometheus: latência por rota, chamadas ao Google Sheets, cache e erros"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 # Rota de saúde
 @app.get("/api/health")
 async def health_check():
     """Verificar saúde da API"""
-    return {"status": "ok", "message": "API funcionando corretamente"}
+    return {
+        "status": "ok",
+        "message": "API funcionando corretamente",
+        "startup_seconds": round(getattr(app.state, "startup_seconds", 0), 3)
+    }
 
 if __name__ == "__main__":
     import uvicorn
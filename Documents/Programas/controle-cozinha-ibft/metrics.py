@@ -0,0 +1,229 @@
+import contextvars
+import functools
+import inspect
+import time
+from typing import Dict, Iterable, List, Tuple
+
+# Limites (segundos) dos histogramas de latência
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+INF_LABEL = 'le="+Inf"'
+
+# Método público do backend que originou a chamada atual (rótulo das chamadas ao Google Sheets)
+current_operation: contextvars.ContextVar[str] = contextvars.ContextVar('current_operation', default='')
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Contador monotônico com rótulos"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos, no formato do Prometheus (_bucket, _sum, _count)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # rótulos -> (contagem por faixa, soma, total)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas exposto em /api/metrics (formato texto do Prometheus)"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    'cozinha_http_request_duration_seconds',
+    'Tempo até o início da resposta, por rota',
+    ('method', 'route', 'status')
+)
+http_errors = registry.counter(
+    'cozinha_http_errors_total',
+    'Respostas de erro por rota, status e tipo da exceção de origem',
+    ('route', 'status', 'type')
+)
+sheets_calls = registry.counter(
+    'cozinha_sheets_calls_total',
+    'Chamadas ao Google Sheets por método do backend, tipo (read, append, update, delete, metadata) e função',
+    ('operation', 'kind', 'call')
+)
+sheets_call_duration = registry.histogram(
+    'cozinha_sheets_call_duration_seconds',
+    'Latência das chamadas ao Google Sheets por método do backend e tipo',
+    ('operation', 'kind')
+)
+sheets_errors = registry.counter(
+    'cozinha_sheets_errors_total',
+    'Chamadas ao Google Sheets que falharam, por método do backend e tipo do erro',
+    ('operation', 'type')
+)
+sheets_retries = registry.counter(
+    'cozinha_sheets_retries_total',
+    'Novas tentativas de chamadas ao Google Sheets por método do backend e status recebido (429 ou 5xx)',
+    ('operation', 'status')
+)
+sheets_coalesced = registry.counter(
+    'cozinha_sheets_coalesced_total',
+    'Leituras atendidas por uma chamada idêntica já em andamento, por método do backend e tipo',
+    ('operation', 'kind')
+)
+sheets_throttle_wait = registry.histogram(
+    'cozinha_sheets_throttle_wait_seconds',
+    'Espera por cota antes de chamar o Google Sheets, por tipo (read ou write)',
+    ('kind',)
+)
+cache_requests = registry.counter(
+    'cozinha_cache_requests_total',
+    'Leituras do cache de planilhas por planilha e resultado (hit, miss ou shared: cache de outro worker)',
+    ('worksheet', 'result')
+)
+
+
+def track_operations(cls):
+    """Decorador de classe: marca cada método público assíncrono como operação de origem das chamadas internas"""
+    # Inclui os métodos herdados (ex.: get_dashboard da classe base)
+    for name in dir(cls):
+        method = getattr(cls, name)
+        if name.startswith('_') or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _tracked(name, method))
+    return cls
+
+
+def _tracked(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        # Só a operação mais externa vale (ex.: get_dashboard que chama get_estoque)
+        if current_operation.get():
+            return await method(*args, **kwargs)
+        token = current_operation.set(name)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def route_label(scope) -> str:
+    """Modelo da rota atendida (ex.: /api/estoque/{item_id}), evitando um rótulo por ID"""
+    route = scope.get('route')
+    return getattr(route, 'path', None) or 'desconhecida'
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede o tempo até o início da resposta de cada rota"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        responded = False
+
+        async def send_wrapper(message):
+            nonlocal responded
+            # Streams (ex.: /api/events) contam só até os cabeçalhos, não a conexão inteira
+            if message['type'] == 'http.response.start' and not responded:
+                responded = True
+                http_request_duration.observe(
+                    time.perf_counter() - started, scope['method'], route_label(scope), str(message['status'])
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            if not responded:
+                http_request_duration.observe(time.perf_counter() - started, scope['method'], route_label(scope), '500')
+                http_errors.inc(route_label(scope), '500', type(e).__name__)
+            raise
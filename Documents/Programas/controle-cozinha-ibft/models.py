@@ -1,7 +1,10 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+# Estoque mínimo usado quando o item não define o próprio (valor da regra antiga)
+ESTOQUE_MINIMO_PADRAO = 10
+
 class EstoqueItem(BaseModel):
     id: int
     nome: str
@@ -10,6 +13,8 @@ class EstoqueItem(BaseModel):
     categoria: str
     data_criacao: str
     data_atualizacao: str
+    estoque_minimo: int = ESTOQUE_MINIMO_PADRAO
+    estoque_alvo: int = ESTOQUE_MINIMO_PADRAO
 
 class Funcionario(BaseModel):
     id: int
@@ -37,3 +42,66 @@ class CheckInRefeicao(BaseModel):
     data: str
     horario: str
     data_criacao: str
+
+class DashboardResumo(BaseModel):
+    data: str
+    total_estoque: int
+    funcionarios_ativos: int
+    pratos_ativos: int
+    total_checkins_hoje: int
+    estoque_baixo: List[EstoqueItem]
+    checkins_hoje: List[CheckInRefeicao]
+
+class ItemListaCompras(BaseModel):
+    estoque_id: int
+    nome: str
+    unidade: str
+    categoria: str
+    quantidade_atual: int
+    estoque_minimo: int
+    estoque_alvo: int
+    quantidade_sugerida: int
+
+class ItemListaFixa(BaseModel):
+    id: str
+    nome: str
+    quantidade: int
+    unidade: str = ''
+    categoria: str = ''
+    comprado: bool = False
+
+class ListaFixa(BaseModel):
+    id: int
+    nome: str
+    itens: List[ItemListaFixa]
+    data_criacao: str
+    data_atualizacao: str
+
+class ResultadoOperacao(BaseModel):
+    acao: str
+    id: Optional[int] = None
+    sucesso: bool
+    item: Optional[dict] = None
+    erro: Optional[str] = None
+
+class ItemRelatorioRefeicoes(BaseModel):
+    # agrupar=dia preenche data; agrupar=prato|funcionario preenche id e nome
+    data: Optional[str] = None
+    id: Optional[int] = None
+    nome: Optional[str] = None
+    refeicoes: int
+
+class RelatorioRefeicoes(BaseModel):
+    de: str
+    ate: str
+    agrupar: str
+    total: int
+    itens: List[ItemRelatorioRefeicoes]
+
+class StatusDiario(BaseModel):
+    ativo: bool
+    pendentes: int
+    mais_antigo: Optional[str] = None
+    falhas_seguidas: int = 0
+    ultimo_erro: Optional[str] = None
+    ultima_aplicacao: Optional[str] = None
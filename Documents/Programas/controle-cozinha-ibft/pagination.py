@@ -0,0 +1,118 @@
+import base64
+import json
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Set, Tuple
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidQueryError(ValueError):
+    """Parâmetros de listagem inválidos (ordenação, campos ou cursor)"""
+
+
+def parse_sort(sort: Optional[str], allowed_fields: Sequence[str]) -> Tuple[str, bool]:
+    """Interpretar 'campo' ou '-campo' (decrescente); padrão é id crescente"""
+    if not sort:
+        return 'id', False
+    descending = sort.startswith('-')
+    field = sort.lstrip('-')
+    if field not in allowed_fields:
+        raise InvalidQueryError(f"Campo de ordenação inválido: {field}")
+    return field, descending
+
+
+def parse_fields(fields: Optional[str], allowed_fields: Sequence[str]) -> Optional[Set[str]]:
+    """Interpretar a projeção 'campo1,campo2'; None significa todos os campos"""
+    if not fields:
+        return None
+    selected = {field.strip() for field in fields.split(',') if field.strip()}
+    invalid = selected - set(allowed_fields)
+    if invalid:
+        raise InvalidQueryError(f"Campos inválidos: {', '.join(sorted(invalid))}")
+    return selected
+
+
+def encode_cursor(payload: Any) -> str:
+    """Codificar a posição da última linha entregue num cursor opaco"""
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Any:
+    """Decodificar um cursor gerado por encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidQueryError("Cursor inválido")
+
+
+def _sort_spec(field: str, descending: bool) -> str:
+    return f"-{field}" if descending else field
+
+
+def encode_position(field: str, descending: bool, value: Any, item_id: int) -> str:
+    """Cursor para continuar depois da linha (value, item_id) na ordenação informada"""
+    return encode_cursor([_sort_spec(field, descending), value, item_id])
+
+
+def decode_position(cursor: str, field: str, descending: bool,
+                    value_types: Tuple[type, ...] = (int, float, str)) -> Tuple[Any, int]:
+    """Decodificar um cursor de encode_position, retornando (valor, id) da última linha entregue.
+
+    O cursor precisa ser da mesma ordenação, com valor de um dos value_types e id inteiro; qualquer
+    outra coisa é InvalidQueryError, como um cursor malformado.
+    """
+    position = decode_cursor(cursor)
+    if not isinstance(position, list) or len(position) != 3 or position[0] != _sort_spec(field, descending):
+        raise InvalidQueryError("Cursor inválido")
+    _, value, item_id = position
+    # bool é subclasse de int: só vale onde o tipo do campo é bool
+    if (isinstance(value, bool) and bool not in value_types) or not isinstance(value, value_types):
+        raise InvalidQueryError("Cursor inválido")
+    if isinstance(item_id, bool) or not isinstance(item_id, int):
+        raise InvalidQueryError("Cursor inválido")
+    return value, item_id
+
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    """Chave de ordenação que aceita números e textos misturados na mesma coluna"""
+    if isinstance(value, (bool, int, float)):
+        return 0, value
+    return 1, str(value)
+
+
+def paginate(rows: Iterable[Any], field: str, descending: bool, limit: Optional[int],
+             cursor: Optional[str], get_value: Callable[[Any, str], Any],
+             get_id: Callable[[Any], int]) -> Tuple[List[Any], Optional[str]]:
+    """Ordenar por (campo, id) e recortar a página após o cursor; retorna (página, próximo cursor)"""
+    keyed = sorted(
+        ((sort_key(get_value(row, field)), get_id(row), row) for row in rows),
+        key=lambda entry: (entry[0], entry[1]),
+        reverse=descending
+    )
+
+    if cursor:
+        value, item_id = decode_position(cursor, field, descending)
+        after = (sort_key(value), item_id)
+        if descending:
+            keyed = [entry for entry in keyed if (entry[0], entry[1]) < after]
+        else:
+            keyed = [entry for entry in keyed if (entry[0], entry[1]) > after]
+
+    if limit is None or len(keyed) <= limit:
+        return [entry[2] for entry in keyed], None
+
+    page = keyed[:limit]
+    # O valor já normalizado por sort_key: número ou texto, que volta à mesma chave
+    (_, last_value), last_id, _ = page[-1]
+    return [entry[2] for entry in page], encode_position(field, descending, last_value, last_id)
+
+
+def paginate_models(items: List[Any], model, limit: Optional[int], cursor: Optional[str],
+                    sort: Optional[str], fields: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+    """Paginar uma lista de modelos pydantic já carregados, devolvendo dicts projetados"""
+    allowed_fields = list(model.model_fields)
+    field, descending = parse_sort(sort, allowed_fields)
+    selected = parse_fields(fields, allowed_fields)
+    page, next_cursor = paginate(items, field, descending, limit, cursor, getattr, lambda item: item.id)
+    return [item.model_dump(include=selected) for item in page], next_cursor
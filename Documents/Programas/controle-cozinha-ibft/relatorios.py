@@ -0,0 +1,121 @@
+import asyncio
+import bisect
+from collections import Counter
+from typing import Dict, List, Tuple
+from views import IncrementalView
+from models import ItemRelatorioRefeicoes, RelatorioRefeicoes
+
+AGRUPAMENTOS = ('dia', 'prato', 'funcionario')
+
+
+# Check-ins contados entre duas pausas da reconstrução: um histórico longo não segura o event loop
+LOTE_RECONSTRUCAO = 5000
+
+
+class Contadores:
+    """Refeições por dia, por prato e por funcionário em cada dia"""
+
+    def __init__(self):
+        # Check-in contado -> (data, prato_id, funcionario_id): torna count idempotente e permite descontar
+        self.contados: Dict[int, Tuple[str, int, int]] = {}
+        self.por_dia: Dict[str, int] = {}
+        self.pratos_por_dia: Dict[str, Counter] = {}
+        self.funcionarios_por_dia: Dict[str, Counter] = {}
+        # Dias com refeições, em ordem, para localizar um período por busca binária
+        self.dias: List[str] = []
+        self.nomes: Dict[str, Dict[int, str]] = {'prato': {}, 'funcionario': {}}
+
+    def count(self, checkin):
+        if checkin.id in self.contados:
+            return
+        data = checkin.data
+        self.contados[checkin.id] = (data, checkin.prato_id, checkin.funcionario_id)
+        if data not in self.por_dia:
+            self.por_dia[data] = 0
+            self.pratos_por_dia[data] = Counter()
+            self.funcionarios_por_dia[data] = Counter()
+            bisect.insort(self.dias, data)
+        self.por_dia[data] += 1
+        self.pratos_por_dia[data][checkin.prato_id] += 1
+        self.funcionarios_por_dia[data][checkin.funcionario_id] += 1
+        self.nomes['prato'].setdefault(checkin.prato_id, checkin.prato_nome)
+        self.nomes['funcionario'].setdefault(checkin.funcionario_id, checkin.funcionario_nome)
+
+    def discount(self, checkin_id: int):
+        counted = self.contados.pop(checkin_id, None)
+        if counted is None:
+            return
+        data, prato_id, funcionario_id = counted
+        self.por_dia[data] -= 1
+        self.pratos_por_dia[data][prato_id] -= 1
+        self.funcionarios_por_dia[data][funcionario_id] -= 1
+        if not self.por_dia[data]:
+            del self.por_dia[data], self.pratos_por_dia[data], self.funcionarios_por_dia[data]
+            self.dias.pop(bisect.bisect_left(self.dias, data))
+
+
+class RefeicoesRollup(IncrementalView):
+    """Contadores de refeições por dia, por prato e por funcionário em cada dia, mantidos a partir
+    das alterações do backend: um relatório soma só os dias do período, sem varrer os check-ins"""
+
+    entities = ('checkins', 'funcionarios', 'pratos')
+
+    def __init__(self, backend, max_age: float = 300):
+        # max_age: a cada quantos segundos reconstruir a partir das leituras completas,
+        # para absorver alterações feitas fora deste processo
+        super().__init__(backend, max_age)
+        self._contadores = Contadores()
+
+    async def rebuild(self):
+        """Reconstruir os contadores numa única passada pelos check-ins, à parte dos atuais,
+        que continuam respondendo aos relatórios até a troca"""
+        checkins, funcionarios, pratos = await asyncio.gather(
+            self.backend.get_checkins(),
+            self.backend.get_funcionarios(),
+            self.backend.get_pratos()
+        )
+        contadores = Contadores()
+        # Nomes atuais têm precedência sobre os gravados no check-in
+        contadores.nomes['funcionario'] = {f.id: f.nome for f in funcionarios}
+        contadores.nomes['prato'] = {p.id: p.nome for p in pratos}
+        for start in range(0, len(checkins), LOTE_RECONSTRUCAO):
+            if start:
+                await asyncio.sleep(0)
+            for checkin in checkins[start:start + LOTE_RECONSTRUCAO]:
+                contadores.count(checkin)
+        self._contadores = contadores
+
+    def update(self, entity: str, action: str, item_id: int, item=None):
+        """Aplicar uma criação/remoção de check-in ou a mudança de nome de um prato/funcionário"""
+        if entity == 'checkins':
+            if action == 'delete':
+                self._contadores.discount(item_id)
+            else:
+                self._contadores.count(item)
+        elif entity in ('funcionarios', 'pratos') and action != 'delete':
+            # Removidos continuam nomeados pelo último nome conhecido
+            self._contadores.nomes['funcionario' if entity == 'funcionarios' else 'prato'][item_id] = item.nome
+
+    async def get_relatorio(self, de: str, ate: str, agrupar: str) -> RelatorioRefeicoes:
+        """Refeições entre de e ate (inclusive), por dia, prato ou funcionário"""
+        if agrupar not in AGRUPAMENTOS:
+            raise ValueError(f"Agrupamento inválido: {agrupar} (use {', '.join(AGRUPAMENTOS)})")
+        await self.ensure_loaded()
+        contadores = self._contadores
+
+        dias = contadores.dias[bisect.bisect_left(contadores.dias, de):bisect.bisect_right(contadores.dias, ate)]
+        total = sum(contadores.por_dia[dia] for dia in dias)
+        if agrupar == 'dia':
+            itens = [ItemRelatorioRefeicoes(data=dia, refeicoes=contadores.por_dia[dia]) for dia in dias]
+        else:
+            por_dia = contadores.pratos_por_dia if agrupar == 'prato' else contadores.funcionarios_por_dia
+            soma = Counter()
+            for dia in dias:
+                soma.update(por_dia[dia])
+            nomes = contadores.nomes[agrupar]
+            itens = [
+                ItemRelatorioRefeicoes(id=item_id, nome=nomes.get(item_id), refeicoes=refeicoes)
+                for item_id, refeicoes in sorted(soma.items(), key=lambda entry: (-entry[1], entry[0]))
+                if refeicoes
+            ]
+        return RelatorioRefeicoes(de=de, ate=ate, agrupar=agrupar, total=total, itens=itens)
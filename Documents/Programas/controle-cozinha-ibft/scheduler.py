@@ -0,0 +1,130 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+from metrics import current_operation, sheets_coalesced, sheets_retries, sheets_throttle_wait
+
+
+class UpstreamBusyError(Exception):
+    """O Google Sheets continuou recusando por cota (429) depois de todas as novas tentativas"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def upstream_status(error: Exception) -> Optional[int]:
+    """Status HTTP de um erro da API (gspread.exceptions.APIError), ou None se não veio da API"""
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and code > 0:
+        return code
+    return getattr(getattr(error, 'response', None), 'status_code', None)
+
+
+class TokenBucket:
+    """Balde de fichas por minuto: permite rajadas curtas sem passar da cota em nenhuma janela de 60s"""
+
+    def __init__(self, per_minute: int, burst: int):
+        self.capacity = max(1, min(burst, per_minute // 2))
+        # Rajada inicial + reposição em 60s somam exatamente a cota
+        self.rate = max(per_minute - self.capacity, 1) / 60
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Consumir uma ficha, esperando a reposição se preciso; retorna os segundos esperados"""
+        started = time.monotonic()
+        # O lock mantém a ordem de chegada enquanto o primeiro da fila espera
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+        return time.monotonic() - started
+
+    def drain(self):
+        """Zerar as fichas após um 429: as próximas chamadas esperam a reposição"""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class UpstreamScheduler:
+    """Fila de chamadas ao Google Sheets: cota por minuto, novas tentativas com espera exponencial
+    e leituras idênticas simultâneas compartilhando uma única chamada"""
+
+    def __init__(self, reads_per_minute: int = 60, writes_per_minute: int = 60, burst: int = 10,
+                 max_retries: int = 5, backoff_base: float = 1, backoff_max: float = 32):
+        # Cotas <= 0 desativam o limite daquele tipo
+        self._buckets: Dict[str, Optional[TokenBucket]] = {
+            'read': TokenBucket(reads_per_minute, burst) if reads_per_minute > 0 else None,
+            'write': TokenBucket(writes_per_minute, burst) if writes_per_minute > 0 else None
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def _backoff(self, attempt: int) -> float:
+        # Espera exponencial com jitter completo: clientes recusados juntos não voltam juntos
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def submit(self, kind: str, call: Callable[[], Awaitable], key: Optional[Hashable] = None,
+                     idempotent: bool = False):
+        """Executar call() respeitando a cota de kind ('read' ou 'write').
+
+        key: chamadas simultâneas com a mesma chave compartilham o resultado da primeira.
+        idempotent: também repetir após erros 5xx (429 é sempre repetido: a API não aplicou o pedido).
+        """
+        if key is None:
+            return await self._execute(kind, call, idempotent)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            sheets_coalesced.inc(current_operation.get() or 'interna', kind)
+        else:
+            task = asyncio.ensure_future(self._execute(kind, call, idempotent))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # shield: se quem iniciou a chamada for cancelado, os demais continuam esperando por ela
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Marca a exceção como consumida mesmo se todos os interessados tiverem desistido
+            task.exception()
+
+    async def _execute(self, kind: str, call: Callable[[], Awaitable], idempotent: bool):
+        bucket = self._buckets[kind]
+        attempt = 0
+        while True:
+            if bucket is not None:
+                sheets_throttle_wait.observe(await bucket.acquire(), kind)
+            try:
+                return await call()
+            except Exception as e:
+                status = upstream_status(e)
+                if status == 429 and bucket is not None:
+                    bucket.drain()
+                retryable = status == 429 or (idempotent and status is not None and status >= 500)
+                if not retryable:
+                    raise
+                delay = self._backoff(attempt)
+                if attempt >= self.max_retries:
+                    if status == 429:
+                        raise UpstreamBusyError(
+                            "Google Sheets sobrecarregado (cota de requisições excedida); tente novamente em instantes",
+                            retry_after=max(delay, 1)
+                        ) from e
+                    raise
+                attempt += 1
+                sheets_retries.inc(current_operation.get() or 'interna', str(status))
+                await asyncio.sleep(delay)
@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Alteração registrada por um processo: (origem, ação, id, registro; None nas remoções)
+SharedChange = Tuple[str, str, int, Optional[dict]]
+
+
+class SharedCache:
+    """Cache compartilhado pelos processos (workers) do mesmo servidor, num arquivo SQLite local: a última
+    leitura de cada aba, uma versão incrementada a cada alteração e o registro das alterações, para que
+    cada processo aplique as dos outros sem reler a planilha. Os métodos públicos rodam numa thread própria:
+    esperar pelo lock de outro processo ou serializar uma aba inteira não bloqueia o event loop"""
+
+    def __init__(self, path: str, max_changes: int = 1000):
+        # max_changes: alterações guardadas por aba; quem ficou mais atrás que isso recarrega a aba
+        self.path = path
+        self.max_changes = max_changes
+        # Identifica as alterações deste processo, que ele mesmo já aplicou
+        self.origin = uuid.uuid4().hex
+        # Uma única thread usa a conexão, na ordem dos pedidos; timeout: espera pelo lock de escrita de outro processo
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-compartilhado")
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Cache: perder as últimas gravações numa queda do servidor só obriga a reler a planilha
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS versoes (
+                planilha TEXT PRIMARY KEY,
+                versao INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS leituras (
+                planilha TEXT PRIMARY KEY,
+                versao INTEGER NOT NULL,
+                lido_em REAL NOT NULL,
+                registros TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS alteracoes (
+                planilha TEXT NOT NULL,
+                versao INTEGER NOT NULL,
+                origem TEXT NOT NULL,
+                acao TEXT NOT NULL,
+                registro_id INTEGER NOT NULL,
+                registro TEXT,
+                PRIMARY KEY (planilha, versao)
+            );
+            CREATE TABLE IF NOT EXISTS ids (
+                planilha TEXT PRIMARY KEY,
+                ultimo INTEGER NOT NULL
+            );
+            -- Incrementada quando uma leitura publicada difere da anterior (edição externa à planilha)
+            CREATE TABLE IF NOT EXISTS conteudo (
+                planilha TEXT PRIMARY KEY,
+                marca INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS estado (
+                chave TEXT PRIMARY KEY,
+                valor TEXT NOT NULL
+            );
+        """)
+        # Época do arquivo: ETags de um arquivo recriado (versões recomeçando do zero) nunca coincidem
+        self.conn.execute("INSERT OR IGNORE INTO estado (chave, valor) VALUES ('epoca', ?)", (uuid.uuid4().hex[:8],))
+        self.epoch = self.conn.execute("SELECT valor FROM estado WHERE chave = 'epoca'").fetchone()[0]
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _transaction(self, func, *args):
+        """Executar func numa transação com o lock de escrita do arquivo (ordena os processos)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(*args)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return result
+
+    def _bump(self, worksheet_name: str) -> int:
+        return self.conn.execute(
+            "INSERT INTO versoes (planilha, versao) VALUES (?, 1) "
+            "ON CONFLICT (planilha) DO UPDATE SET versao = versao + 1 RETURNING versao",
+            (worksheet_name,)
+        ).fetchone()[0]
+
+    def _versions(self, worksheet_names: List[str]) -> Dict[str, int]:
+        placeholders = ', '.join('?' * len(worksheet_names))
+        current = dict(self.conn.execute(
+            f"SELECT planilha, versao FROM versoes WHERE planilha IN ({placeholders})", list(worksheet_names)
+        ))
+        return {name: current.get(name, 0) for name in worksheet_names}
+
+    async def versions(self, worksheet_names: List[str]) -> Dict[str, int]:
+        """Versão atual de cada aba (0 se nunca alterada)"""
+        return await self._run(self._versions, list(worksheet_names))
+
+    def _worksheets(self) -> List[str]:
+        return [name for name, in self.conn.execute("SELECT planilha FROM versoes UNION SELECT planilha FROM leituras")]
+
+    async def worksheets(self) -> List[str]:
+        """Abas conhecidas por algum processo"""
+        return await self._run(self._worksheets)
+
+    def _record_change(self, worksheet_name: str, action: str, record_id: int, payload: Optional[str]) -> int:
+        version = self._bump(worksheet_name)
+        self.conn.execute(
+            "INSERT INTO alteracoes (planilha, versao, origem, acao, registro_id, registro) VALUES (?, ?, ?, ?, ?, ?)",
+            (worksheet_name, version, self.origin, action, record_id, payload)
+        )
+        self.conn.execute(
+            "DELETE FROM alteracoes WHERE planilha = ? AND versao <= ?", (worksheet_name, version - self.max_changes)
+        )
+        return version
+
+    async def record_change(self, worksheet_name: str, action: str, record_id: int,
+                            record: Optional[dict] = None) -> int:
+        """Registrar uma alteração deste processo ('create', 'update' ou 'delete'); retorna a nova versão da aba"""
+        payload = json.dumps(record, ensure_ascii=False) if record is not None else None
+        return await self._run(self._transaction, self._record_change, worksheet_name, action, record_id, payload)
+
+    async def invalidate(self, worksheet_name: str) -> int:
+        """Mudar a versão sem registrar a alteração: os outros processos recarregam a aba"""
+        return await self._run(self._transaction, self._bump, worksheet_name)
+
+    def _changes(self, worksheet_name: str, since: int, until: int) -> Optional[List[SharedChange]]:
+        if since > until:
+            return None
+        rows = self.conn.execute(
+            "SELECT origem, acao, registro_id, registro FROM alteracoes "
+            "WHERE planilha = ? AND versao > ? AND versao <= ? ORDER BY versao",
+            (worksheet_name, since, until)
+        ).fetchall()
+        if len(rows) != until - since:
+            return None
+        return [
+            (origin, action, record_id, json.loads(payload) if payload is not None else None)
+            for origin, action, record_id, payload in rows
+        ]
+
+    async def changes(self, worksheet_name: str, since: int, until: int) -> Optional[List[SharedChange]]:
+        """Alterações entre as versões since (exclusive) e until, em ordem; None se alguma não estiver registrada"""
+        return await self._run(self._changes, worksheet_name, since, until)
+
+    def _load(self, worksheet_name: str, max_age: float) -> Optional[Tuple[int, List[dict]]]:
+        row = self.conn.execute(
+            "SELECT versao, lido_em, registros FROM leituras WHERE planilha = ?", (worksheet_name,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > max_age:
+            return None
+        return row[0], json.loads(row[2])
+
+    async def load(self, worksheet_name: str, max_age: float) -> Optional[Tuple[int, List[dict]]]:
+        """Última leitura da aba, se feita há no máximo max_age segundos: (versão em que foi lida, registros)"""
+        return await self._run(self._load, worksheet_name, max_age)
+
+    def _publish(self, worksheet_name: str, version: int, records: List[dict]):
+        payload = json.dumps(records, ensure_ascii=False)
+        previous = self.conn.execute(
+            "SELECT versao, registros FROM leituras WHERE planilha = ?", (worksheet_name,)
+        ).fetchone()
+        if previous is not None and previous[0] > version:
+            return
+        self.conn.execute(
+            "INSERT INTO leituras (planilha, versao, lido_em, registros) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (planilha) DO UPDATE SET versao = excluded.versao, lido_em = excluded.lido_em, "
+            "registros = excluded.registros",
+            (worksheet_name, version, time.time(), payload)
+        )
+        if previous is not None and previous[1] != payload:
+            self.conn.execute(
+                "INSERT INTO conteudo (planilha, marca) VALUES (?, 1) "
+                "ON CONFLICT (planilha) DO UPDATE SET marca = marca + 1",
+                (worksheet_name,)
+            )
+
+    async def publish(self, worksheet_name: str, version: int, records: List[dict]):
+        """Guardar uma leitura completa feita na versão informada (lida antes de a leitura começar)"""
+        # Cópia rasa: a lista do cache continua sendo alterada pelo event loop durante a serialização
+        await self._run(self._transaction, self._publish, worksheet_name, version, list(records))
+
+    def _tag(self, worksheet_names: List[str]) -> str:
+        placeholders = ', '.join('?' * len(worksheet_names))
+        stamps = self.conn.execute(
+            f"SELECT planilha, versao, 0 FROM versoes WHERE planilha IN ({placeholders}) "
+            f"UNION ALL SELECT planilha, 0, marca FROM conteudo WHERE planilha IN ({placeholders}) "
+            "ORDER BY 1, 2, 3", list(worksheet_names) * 2
+        ).fetchall()
+        digest = hashlib.sha1(repr(stamps).encode()).hexdigest()[:16]
+        return f"{self.epoch}.{digest}"
+
+    async def tag(self, worksheet_names: List[str]) -> str:
+        """Marca das abas, igual em todos os processos: muda a cada alteração registrada e a cada leitura
+        publicada com conteúdo diferente da anterior (base dos ETags com vários workers)"""
+        return await self._run(self._tag, list(worksheet_names))
+
+    def _reserve_ids(self, worksheet_name: str, size: int, max_id: Optional[int]) -> Optional[Tuple[int, int]]:
+        row = self.conn.execute("SELECT ultimo FROM ids WHERE planilha = ?", (worksheet_name,)).fetchone()
+        if row is None and max_id is None:
+            return None
+        start = max(row[0] if row else 0, max_id or 0) + 1
+        end = start + size - 1
+        self.conn.execute(
+            "INSERT INTO ids (planilha, ultimo) VALUES (?, ?) ON CONFLICT (planilha) DO UPDATE SET ultimo = excluded.ultimo",
+            (worksheet_name, end)
+        )
+        return start, end
+
+    async def reserve_ids(self, worksheet_name: str, size: int,
+                          max_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Reservar uma faixa de IDs depois do maior já entregue a qualquer processo: (primeiro, último).
+
+        max_id: maior ID lido da planilha, para semear o contador (ou corrigi-lo após edições externas);
+        sem ele, None se a aba ainda não tiver contador.
+        """
+        return await self._run(self._transaction, self._reserve_ids, worksheet_name, size, max_id)
+
+    async def close(self):
+        await self._run(self.conn.close)
+        self._executor.shutdown(wait=False)
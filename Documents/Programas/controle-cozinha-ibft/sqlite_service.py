@@ -0,0 +1,518 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from checkin_index import DuplicateCheckInError
+from models import ESTOQUE_MINIMO_PADRAO, EstoqueItem, Funcionario, PratoDia, CheckInRefeicao, ListaFixa
+from pagination import decode_position, encode_position, parse_fields, parse_sort
+from storage import ENTITIES, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS estoque (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    unidade TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    data_criacao TEXT NOT NULL,
+    data_atualizacao TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS funcionarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    cargo TEXT NOT NULL,
+    ativo INTEGER NOT NULL,
+    data_criacao TEXT NOT NULL,
+    data_atualizacao TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pratos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    descricao TEXT NOT NULL,
+    data TEXT NOT NULL,
+    ativo INTEGER NOT NULL,
+    data_criacao TEXT NOT NULL,
+    data_atualizacao TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pratos_data ON pratos (data);
+
+CREATE TABLE IF NOT EXISTS checkins (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    funcionario_id INTEGER NOT NULL,
+    funcionario_nome TEXT NOT NULL,
+    prato_id INTEGER NOT NULL,
+    prato_nome TEXT NOT NULL,
+    data TEXT NOT NULL,
+    horario TEXT NOT NULL,
+    data_criacao TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_checkins_data ON checkins (data);
+CREATE INDEX IF NOT EXISTS idx_checkins_funcionario ON checkins (funcionario_id);
+
+CREATE TABLE IF NOT EXISTS listas_compras (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    itens TEXT NOT NULL,
+    data_criacao TEXT NOT NULL,
+    data_atualizacao TEXT NOT NULL
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão do esquema: (tabela, coluna, definição)
+MIGRATIONS = [
+    ('estoque', 'estoque_minimo', f"INTEGER NOT NULL DEFAULT {ESTOQUE_MINIMO_PADRAO}"),
+    ('estoque', 'estoque_alvo', f"INTEGER NOT NULL DEFAULT {ESTOQUE_MINIMO_PADRAO}")
+]
+
+# Tabela -> planilha correspondente no espelho do Google Sheets
+MIRROR_WORKSHEETS = {
+    'estoque': 'Estoque',
+    'funcionarios': 'Funcionarios',
+    'pratos': 'Pratos',
+    'checkins': 'CheckIns',
+    'listas_compras': 'ListasCompras'
+}
+
+# Entidade da API -> tabela do banco
+ENTITY_TABLES = {
+    'estoque': 'estoque',
+    'funcionarios': 'funcionarios',
+    'pratos': 'pratos',
+    'checkins': 'checkins',
+    'listas_fixas': 'listas_compras'
+}
+
+# Colunas booleanas, gravadas como 'True'/'False' na planilha (como faz o backend Sheets)
+BOOLEAN_COLUMNS = {'ativo'}
+
+# Colunas com listas gravadas como JSON
+JSON_COLUMNS = {'itens'}
+
+
+def _column_types(model, field: str) -> tuple:
+    """Tipos Python que a coluna do campo devolve (e que um cursor pode trazer)"""
+    annotation = model.model_fields[field].annotation
+    if annotation is bool:
+        # Gravado como 0/1
+        return (bool, int)
+    if annotation in (int, float):
+        return (int, float)
+    # Textos e listas gravadas como JSON
+    return (str,)
+
+
+class SQLiteService(StorageBackend):
+    def __init__(self):
+        super().__init__()
+        self.db_path = os.getenv("SQLITE_DB_PATH", "cozinha.db")
+
+        # Uma única thread acessa a conexão: as consultas não bloqueiam o event loop
+        # e as escritas ficam naturalmente serializadas
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+        # Espelho opcional no Google Sheets, exportado periodicamente
+        self.mirror_interval = float(os.getenv("SQLITE_SHEETS_MIRROR_INTERVAL", 0))
+        self._mirror = None
+        self._mirror_task = None
+        self._dirty_tables = set()
+
+    def _migrate(self):
+        """Acrescentar colunas novas a bancos criados por versões anteriores"""
+        for table, column, definition in MIGRATIONS:
+            existing = {row['name'] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                with self.conn:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        # Um check-in por funcionário por dia também entre processos (o índice em memória é de cada um)
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_checkins_funcionario_data ON checkins (funcionario_id, data)"
+                )
+        except sqlite3.IntegrityError:
+            logger.warning("Check-ins duplicados no banco: a restrição de um por funcionário por dia não foi criada")
+
+    async def _run(self, func, *args):
+        """Executar uma operação no banco na thread dedicada"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def _query_sync(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def _execute_sync(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self.conn:
+            return self.conn.execute(sql, params)
+
+    async def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Executar uma consulta e retornar as linhas"""
+        return await self._run(self._query_sync, sql, params)
+
+    async def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Executar um comando de escrita numa transação"""
+        return await self._run(self._execute_sync, sql, params)
+
+    async def _insert(self, table: str, values: dict) -> int:
+        """Inserir uma linha e retornar o ID gerado"""
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        cursor = await self._execute(
+            f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", tuple(values.values())
+        )
+        self._dirty_tables.add(table)
+        return cursor.lastrowid
+
+    async def _update(self, table: str, record_id: int, values: dict) -> Optional[sqlite3.Row]:
+        """Atualizar os campos fornecidos (e a data de atualização); None se o ID não existir"""
+        values = {column: value for column, value in values.items() if value is not None}
+        values['data_atualizacao'] = self._get_current_timestamp()
+        assignments = ', '.join(f"{column} = ?" for column in values)
+        cursor = await self._execute(
+            f"UPDATE {table} SET {assignments} WHERE id = ?", tuple(values.values()) + (record_id,)
+        )
+        if cursor.rowcount == 0:
+            return None
+        self._dirty_tables.add(table)
+        rows = await self._query(f"SELECT * FROM {table} WHERE id = ?", (record_id,))
+        return rows[0]
+
+    def _delete_sync(self, table: str, record_id: int) -> Optional[sqlite3.Row]:
+        with self.conn:
+            rows = self.conn.execute(f"SELECT * FROM {table} WHERE id = ?", (record_id,)).fetchall()
+            if rows:
+                self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+        return rows[0] if rows else None
+
+    async def _delete(self, table: str, record_id: int) -> Optional[sqlite3.Row]:
+        """Remover uma linha; retorna a linha removida, ou None se o ID não existir"""
+        row = await self._run(self._delete_sync, table, record_id)
+        if row is not None:
+            self._dirty_tables.add(table)
+        return row
+
+    async def get_version(self, entity: str, de: Optional[str] = None, ate: Optional[str] = None) -> str:
+        """Versão da entidade; data_version muda quando outra conexão grava no mesmo arquivo"""
+        rows = await self._query("PRAGMA data_version")
+        return f"{await super().get_version(entity)}.{rows[0][0]}"
+
+    # Ciclo de vida e espelho no Google Sheets
+    def start(self):
+        """Iniciar a exportação periódica para o Google Sheets, se configurada"""
+        if self.mirror_interval > 0 and self._mirror_task is None:
+            from google_sheets_service import GoogleSheetsService
+            self._mirror = GoogleSheetsService()
+            # Na primeira passada, exportar tudo
+            self._dirty_tables.update(MIRROR_WORKSHEETS)
+            self._mirror_task = asyncio.create_task(self._mirror_loop())
+
+    async def stop(self):
+        """Exportar as últimas alterações e fechar o banco"""
+        if self._mirror_task is not None:
+            self._mirror_task.cancel()
+            try:
+                await self._mirror_task
+            except asyncio.CancelledError:
+                pass
+            self._mirror_task = None
+            try:
+                await self.export_to_mirror()
+            except Exception:
+                logger.exception("Falha ao exportar para o Google Sheets no encerramento")
+            await self._mirror.stop()
+        await self._run(self.conn.close)
+        self._executor.shutdown(wait=False)
+
+    async def _mirror_loop(self):
+        while True:
+            await asyncio.sleep(self.mirror_interval)
+            try:
+                await self.export_to_mirror()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha ao exportar para o Google Sheets")
+
+    async def export_to_mirror(self):
+        """Copiar para o Google Sheets as tabelas alteradas desde a última exportação"""
+        for table in list(self._dirty_tables):
+            self._dirty_tables.discard(table)
+            try:
+                rows = await self._query(f"SELECT * FROM {table} ORDER BY id")
+                values = [
+                    [str(bool(row[column])) if column in BOOLEAN_COLUMNS else row[column] for column in row.keys()]
+                    for row in rows
+                ]
+                await self._mirror.export_rows(MIRROR_WORKSHEETS[table], values)
+            except BaseException:
+                # Tentar de novo na próxima passada
+                self._dirty_tables.add(table)
+                raise
+
+    async def list_page(self, entity: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                        sort: Optional[str] = None, fields: Optional[str] = None):
+        """Paginar com ORDER BY/LIMIT e cursor por chave (campo, id), lendo só as colunas pedidas"""
+        getter, model = ENTITIES[entity]
+        columns = list(model.model_fields)
+        field, descending = parse_sort(sort, columns)
+        selected = parse_fields(fields, columns)
+        output = [column for column in columns if selected is None or column in selected]
+        
+        where, params = "", []
+        if cursor:
+            value, item_id = decode_position(cursor, field, descending, _column_types(model, field))
+            where = f"WHERE ({field}, id) {'<' if descending else '>'} (?, ?)"
+            params = [value, item_id]
+        
+        order = "DESC" if descending else "ASC"
+        read_columns = [column for column in columns if column in output or column in (field, 'id')]
+        sql = f"SELECT {', '.join(read_columns)} FROM {ENTITY_TABLES[entity]} {where} ORDER BY {field} {order}, id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        rows = await self._query(sql, tuple(params))
+        
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_position(field, descending, rows[-1][field], rows[-1]['id'])
+        items = [{column: self._column_value(column, row[column]) for column in output} for row in rows]
+        return items, next_cursor
+    
+    @staticmethod
+    def _column_value(column: str, value):
+        if column in BOOLEAN_COLUMNS:
+            return bool(value)
+        if column in JSON_COLUMNS:
+            return json.loads(value)
+        return value
+    
+    # Métodos para Estoque
+    async def get_estoque(self) -> List[EstoqueItem]:
+        """Obter todos os itens do estoque"""
+        rows = await self._query("SELECT * FROM estoque ORDER BY id")
+        return [EstoqueItem(**dict(row)) for row in rows]
+
+    async def create_estoque_item(self, item_data) -> EstoqueItem:
+        """Criar novo item no estoque"""
+        timestamp = self._get_current_timestamp()
+        values = {
+            'nome': item_data.nome,
+            'quantidade': item_data.quantidade,
+            'unidade': item_data.unidade,
+            'categoria': item_data.categoria,
+            'data_criacao': timestamp,
+            'data_atualizacao': timestamp,
+            'estoque_minimo': item_data.estoque_minimo,
+            'estoque_alvo': item_data.estoque_alvo if item_data.estoque_alvo is not None else item_data.estoque_minimo
+        }
+        item_id = await self._insert('estoque', values)
+        new_item = EstoqueItem(id=item_id, **values)
+        self._notify('estoque', 'create', item_id, new_item)
+        return new_item
+
+    async def update_estoque_item(self, item_id: int, item_data) -> EstoqueItem:
+        """Atualizar item do estoque"""
+        row = await self._update('estoque', item_id, {
+            'nome': item_data.nome,
+            'quantidade': item_data.quantidade,
+            'unidade': item_data.unidade,
+            'categoria': item_data.categoria,
+            'estoque_minimo': item_data.estoque_minimo,
+            'estoque_alvo': item_data.estoque_alvo
+        })
+        if row is None:
+            raise ValueError(f"Item com ID {item_id} não encontrado")
+        updated = EstoqueItem(**dict(row))
+        self._notify('estoque', 'update', item_id, updated)
+        return updated
+
+    async def delete_estoque_item(self, item_id: int):
+        """Deletar item do estoque"""
+        row = await self._delete('estoque', item_id)
+        if row is None:
+            raise ValueError(f"Item com ID {item_id} não encontrado")
+        self._notify('estoque', 'delete', item_id, EstoqueItem(**dict(row)))
+
+    # Métodos para Funcionários
+    async def get_funcionarios(self) -> List[Funcionario]:
+        """Obter todos os funcionários"""
+        rows = await self._query("SELECT * FROM funcionarios ORDER BY id")
+        return [Funcionario(**dict(row)) for row in rows]
+
+    async def create_funcionario(self, funcionario_data) -> Funcionario:
+        """Criar novo funcionário"""
+        timestamp = self._get_current_timestamp()
+        values = {
+            'nome': funcionario_data.nome,
+            'cargo': funcionario_data.cargo,
+            'ativo': funcionario_data.ativo,
+            'data_criacao': timestamp,
+            'data_atualizacao': timestamp
+        }
+        funcionario_id = await self._insert('funcionarios', values)
+        new_funcionario = Funcionario(id=funcionario_id, **values)
+        self._notify('funcionarios', 'create', funcionario_id, new_funcionario)
+        return new_funcionario
+
+    async def update_funcionario(self, funcionario_id: int, funcionario_data) -> Funcionario:
+        """Atualizar funcionário"""
+        row = await self._update('funcionarios', funcionario_id, {
+            'nome': funcionario_data.nome,
+            'cargo': funcionario_data.cargo,
+            'ativo': funcionario_data.ativo
+        })
+        if row is None:
+            raise ValueError(f"Funcionário com ID {funcionario_id} não encontrado")
+        updated = Funcionario(**dict(row))
+        self._notify('funcionarios', 'update', funcionario_id, updated)
+        return updated
+
+    async def delete_funcionario(self, funcionario_id: int):
+        """Deletar funcionário"""
+        row = await self._delete('funcionarios', funcionario_id)
+        if row is None:
+            raise ValueError(f"Funcionário com ID {funcionario_id} não encontrado")
+        self._notify('funcionarios', 'delete', funcionario_id, Funcionario(**dict(row)))
+
+    # Métodos para Pratos do Dia
+    async def get_pratos(self) -> List[PratoDia]:
+        """Obter todos os pratos do dia"""
+        rows = await self._query("SELECT * FROM pratos ORDER BY id")
+        return [PratoDia(**dict(row)) for row in rows]
+
+    async def create_prato(self, prato_data) -> PratoDia:
+        """Criar novo prato do dia"""
+        timestamp = self._get_current_timestamp()
+        values = {
+            'nome': prato_data.nome,
+            'descricao': prato_data.descricao,
+            'data': prato_data.data,
+            'ativo': prato_data.ativo,
+            'data_criacao': timestamp,
+            'data_atualizacao': timestamp
+        }
+        prato_id = await self._insert('pratos', values)
+        new_prato = PratoDia(id=prato_id, **values)
+        self._notify('pratos', 'create', prato_id, new_prato)
+        return new_prato
+
+    async def update_prato(self, prato_id: int, prato_data) -> PratoDia:
+        """Atualizar prato do dia"""
+        row = await self._update('pratos', prato_id, {
+            'nome': prato_data.nome,
+            'descricao': prato_data.descricao,
+            'data': prato_data.data,
+            'ativo': prato_data.ativo
+        })
+        if row is None:
+            raise ValueError(f"Prato com ID {prato_id} não encontrado")
+        updated = PratoDia(**dict(row))
+        self._notify('pratos', 'update', prato_id, updated)
+        return updated
+
+    async def delete_prato(self, prato_id: int):
+        """Deletar prato do dia"""
+        row = await self._delete('pratos', prato_id)
+        if row is None:
+            raise ValueError(f"Prato com ID {prato_id} não encontrado")
+        self._notify('pratos', 'delete', prato_id, PratoDia(**dict(row)))
+
+    # Métodos para Check-ins de Refeições
+    async def get_checkins(self) -> List[CheckInRefeicao]:
+        """Obter todos os check-ins de refeições"""
+        rows = await self._query("SELECT * FROM checkins ORDER BY id")
+        return [CheckInRefeicao(**dict(row)) for row in rows]
+
+    async def create_checkin(self, checkin_data) -> CheckInRefeicao:
+        """Criar novo check-in de refeição"""
+        # Validação, nomes e duplicidade vêm do índice em memória
+        funcionario, prato = await self.checkin_index.reserve(checkin_data)
+        try:
+            values = {
+                'funcionario_id': checkin_data.funcionario_id,
+                'funcionario_nome': funcionario.nome,
+                'prato_id': checkin_data.prato_id,
+                'prato_nome': prato.nome,
+                'data': checkin_data.data,
+                'horario': checkin_data.horario,
+                'data_criacao': self._get_current_timestamp()
+            }
+            try:
+                checkin_id = await self._insert('checkins', values)
+            except sqlite3.IntegrityError:
+                # Gravado ao mesmo tempo por outro processo
+                raise DuplicateCheckInError(
+                    f"{funcionario.nome} já tem check-in registrado em {checkin_data.data}"
+                ) from None
+            new_checkin = CheckInRefeicao(id=checkin_id, **values)
+            self._notify('checkins', 'create', checkin_id, new_checkin)
+        finally:
+            self.checkin_index.release(checkin_data)
+        return new_checkin
+
+    async def get_checkins_por_periodo(self, de: str, ate: str) -> List[CheckInRefeicao]:
+        """Obter check-ins entre duas datas (inclusive), pelo índice idx_checkins_data"""
+        rows = await self._query(
+            "SELECT * FROM checkins WHERE data BETWEEN ? AND ? ORDER BY data, id", (de, ate)
+        )
+        return [CheckInRefeicao(**dict(row)) for row in rows]
+
+    # Métodos para Listas de Compras Fixas
+    def _lista_fixa_from_row(self, row: sqlite3.Row) -> ListaFixa:
+        values = dict(row)
+        values['itens'] = json.loads(values['itens'])
+        return ListaFixa(**values)
+
+    async def get_listas_fixas(self) -> List[ListaFixa]:
+        """Obter todas as listas de compras fixas"""
+        rows = await self._query("SELECT * FROM listas_compras ORDER BY id")
+        return [self._lista_fixa_from_row(row) for row in rows]
+
+    async def create_lista_fixa(self, lista_data) -> ListaFixa:
+        """Criar nova lista de compras fixa"""
+        timestamp = self._get_current_timestamp()
+        itens = [item.model_dump() for item in lista_data.itens]
+        lista_id = await self._insert('listas_compras', {
+            'nome': lista_data.nome,
+            'itens': json.dumps(itens, ensure_ascii=False),
+            'data_criacao': timestamp,
+            'data_atualizacao': timestamp
+        })
+        new_lista = ListaFixa(
+            id=lista_id, nome=lista_data.nome, itens=itens,
+            data_criacao=timestamp, data_atualizacao=timestamp
+        )
+        self._notify('listas_fixas', 'create', lista_id, new_lista)
+        return new_lista
+
+    async def update_lista_fixa(self, lista_id: int, lista_data) -> ListaFixa:
+        """Atualizar nome e/ou itens de uma lista fixa"""
+        itens = None
+        if lista_data.itens is not None:
+            itens = json.dumps([item.model_dump() for item in lista_data.itens], ensure_ascii=False)
+        row = await self._update('listas_compras', lista_id, {'nome': lista_data.nome, 'itens': itens})
+        if row is None:
+            raise ValueError(f"Lista com ID {lista_id} não encontrada")
+        updated = self._lista_fixa_from_row(row)
+        self._notify('listas_fixas', 'update', lista_id, updated)
+        return updated
+
+    async def delete_lista_fixa(self, lista_id: int):
+        """Deletar lista de compras fixa"""
+        row = await self._delete('listas_compras', lista_id)
+        if row is None:
+            raise ValueError(f"Lista com ID {lista_id} não encontrada")
+        self._notify('listas_fixas', 'delete', lista_id, self._lista_fixa_from_row(row))
@@ -0,0 +1,251 @@
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import TypeAdapter
+from cache import TableVersions
+from checkin_index import CheckinIndex
+from dashboard import DashboardState
+from lista_compras import EstoqueBaixo
+from relatorios import RefeicoesRollup
+from models import (
+    EstoqueItem, Funcionario, PratoDia, CheckInRefeicao, DashboardResumo, ItemListaCompras, ListaFixa,
+    RelatorioRefeicoes, ResultadoOperacao
+)
+from pagination import paginate_models
+
+# Entidades listáveis: método de leitura completa e modelo
+ENTITIES = {
+    'estoque': ('get_estoque', EstoqueItem),
+    'funcionarios': ('get_funcionarios', Funcionario),
+    'pratos': ('get_pratos', PratoDia),
+    'checkins': ('get_checkins', CheckInRefeicao),
+    'listas_fixas': ('get_listas_fixas', ListaFixa)
+}
+
+# Serializadores de listas completas (pydantic-core, sem validar de novo nem passar pelo json da biblioteca padrão)
+LIST_ADAPTERS = {entity: TypeAdapter(List[model]) for entity, (_, model) in ENTITIES.items()}
+
+# Métodos de escrita de cada entidade por ação; ações ausentes não são suportadas
+ENTITY_WRITERS = {
+    'estoque': {'create': 'create_estoque_item', 'update': 'update_estoque_item', 'delete': 'delete_estoque_item'},
+    'funcionarios': {'create': 'create_funcionario', 'update': 'update_funcionario', 'delete': 'delete_funcionario'},
+    'pratos': {'create': 'create_prato', 'update': 'update_prato', 'delete': 'delete_prato'},
+    'checkins': {'create': 'create_checkin'}
+}
+
+
+class StorageBackend(ABC):
+    """Interface comum dos backends de armazenamento usados pela API"""
+
+    def __init__(self):
+        self._listeners = []
+        self.versions = TableVersions()
+        # Entidade -> (versão, lista completa já serializada em JSON)
+        self._json_bodies: Dict[str, Tuple[str, bytes]] = {}
+        max_age = float(os.getenv("DASHBOARD_MAX_AGE", 300))
+        self.estoque_baixo = EstoqueBaixo(self, max_age=max_age)
+        self.add_listener(self.estoque_baixo.apply)
+        self.dashboard = DashboardState(self, max_age=max_age)
+        self.add_listener(self.dashboard.apply)
+        self.checkin_index = CheckinIndex(self, max_age=float(os.getenv("CHECKIN_INDEX_MAX_AGE") or max_age))
+        self.add_listener(self.checkin_index.apply)
+        self.refeicoes = RefeicoesRollup(self, max_age=max_age)
+        self.add_listener(self.refeicoes.apply)
+
+    def add_listener(self, listener):
+        """Registrar função chamada a cada alteração: listener(entidade, ação, id, item)"""
+        self._listeners.append(listener)
+
+    def _notify(self, entity: str, action: str, item_id: int, item=None):
+        """Avisar os ouvintes sobre uma criação ('create'), atualização ('update') ou remoção ('delete')"""
+        self.versions.bump(entity)
+        for listener in self._listeners:
+            listener(entity, action, item_id, item)
+
+    async def get_version(self, entity: str, de: Optional[str] = None, ate: Optional[str] = None) -> str:
+        """Versão atual de uma entidade, usada nos ETags das listagens; de/ate: período consultado (check-ins)"""
+        return self.versions.tag(entity)
+
+    async def list_json(self, entity: str) -> bytes:
+        """Lista completa da entidade em JSON, serializada de novo só quando a versão muda"""
+        # A versão é lida antes dos dados: uma alteração no meio só faz a próxima chamada serializar de novo
+        version = await self.get_version(entity)
+        cached = self._json_bodies.get(entity)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        body = await self._serialize_list(entity)
+        self._json_bodies[entity] = (version, body)
+        return body
+
+    async def _serialize_list(self, entity: str) -> bytes:
+        """Serializar a lista completa de uma entidade a partir dos modelos"""
+        getter, _ = ENTITIES[entity]
+        return LIST_ADAPTERS[entity].dump_json(await getattr(self, getter)())
+
+    async def get_dashboard(self) -> DashboardResumo:
+        """Obter o resumo do dashboard, mantido incrementalmente"""
+        return await self.dashboard.get_resumo()
+
+    async def get_lista_compras(self) -> List[ItemListaCompras]:
+        """Obter a lista de compras variável (itens abaixo do estoque mínimo)"""
+        return await self.estoque_baixo.get_lista()
+
+    async def journal_status(self) -> Dict[str, Any]:
+        """Pendências do diário local de escrita (backends sem diário: inativo)"""
+        return {'ativo': False, 'pendentes': 0}
+
+    async def get_relatorio_refeicoes(self, de: str, ate: str, agrupar: str) -> RelatorioRefeicoes:
+        """Obter as refeições de um período agrupadas por dia, prato ou funcionário"""
+        return await self.refeicoes.get_relatorio(de, ate, agrupar)
+
+    async def warm_up(self):
+        """Conectar e pré-carregar o que a primeira requisição precisaria (dashboard, estoque baixo,
+        check-in e relatórios de refeições)"""
+        await self.get_dashboard()
+        await self.checkin_index.ensure_loaded()
+        await self.refeicoes.ensure_loaded()
+
+    def start(self):
+        """Iniciar tarefas de fundo do backend"""
+
+    async def stop(self):
+        """Gravar pendências e liberar recursos do backend"""
+
+    async def refresh_cache(self, worksheet_name: Optional[str] = None) -> List[str]:
+        """Recarregar caches internos; backends sem cache não fazem nada"""
+        return []
+
+    async def list_page(self, entity: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                        sort: Optional[str] = None, fields: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """Listar uma página ordenada por (campo, id), com projeção de campos; retorna (itens, próximo cursor)"""
+        getter, model = ENTITIES[entity]
+        items = await getattr(self, getter)()
+        return paginate_models(items, model, limit, cursor, sort, fields)
+
+    async def bulk(self, entity: str, operations: List[Tuple[str, Optional[int], Any]]) -> List[ResultadoOperacao]:
+        """Aplicar operações (ação, id, dados) já validadas, na ordem; retorna um resultado por operação"""
+        writers = ENTITY_WRITERS[entity]
+        results = []
+        for action, item_id, data in operations:
+            method = getattr(self, writers[action])
+            try:
+                item = None
+                if action == 'create':
+                    item = await method(data)
+                    item_id = item.id
+                elif action == 'update':
+                    item = await method(item_id, data)
+                else:
+                    await method(item_id)
+            except ValueError as e:
+                results.append(ResultadoOperacao(acao=action, id=item_id, sucesso=False, erro=str(e)))
+            else:
+                results.append(ResultadoOperacao(
+                    acao=action, id=item_id, sucesso=True, item=item.model_dump() if item else None
+                ))
+        return results
+
+    def _get_current_timestamp(self) -> str:
+        """Obter timestamp atual formatado"""
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Estoque
+    @abstractmethod
+    async def get_estoque(self) -> List[EstoqueItem]:
+        """Obter todos os itens do estoque"""
+
+    @abstractmethod
+    async def create_estoque_item(self, item_data) -> EstoqueItem:
+        """Criar novo item no estoque"""
+
+    @abstractmethod
+    async def update_estoque_item(self, item_id: int, item_data) -> EstoqueItem:
+        """Atualizar item do estoque"""
+
+    @abstractmethod
+    async def delete_estoque_item(self, item_id: int):
+        """Deletar item do estoque"""
+
+    # Funcionários
+    @abstractmethod
+    async def get_funcionarios(self) -> List[Funcionario]:
+        """Obter todos os funcionários"""
+
+    @abstractmethod
+    async def create_funcionario(self, funcionario_data) -> Funcionario:
+        """Criar novo funcionário"""
+
+    @abstractmethod
+    async def update_funcionario(self, funcionario_id: int, funcionario_data) -> Funcionario:
+        """Atualizar funcionário"""
+
+    @abstractmethod
+    async def delete_funcionario(self, funcionario_id: int):
+        """Deletar funcionário"""
+
+    # Pratos do Dia
+    @abstractmethod
+    async def get_pratos(self) -> List[PratoDia]:
+        """Obter todos os pratos do dia"""
+
+    @abstractmethod
+    async def create_prato(self, prato_data) -> PratoDia:
+        """Criar novo prato do dia"""
+
+    @abstractmethod
+    async def update_prato(self, prato_id: int, prato_data) -> PratoDia:
+        """Atualizar prato do dia"""
+
+    @abstractmethod
+    async def delete_prato(self, prato_id: int):
+        """Deletar prato do dia"""
+
+    # Check-ins de Refeições
+    @abstractmethod
+    async def get_checkins(self) -> List[CheckInRefeicao]:
+        """Obter todos os check-ins de refeições"""
+
+    @abstractmethod
+    async def create_checkin(self, checkin_data) -> CheckInRefeicao:
+        """Criar novo check-in de refeição"""
+
+    @abstractmethod
+    async def get_checkins_por_periodo(self, de: str, ate: str) -> List[CheckInRefeicao]:
+        """Obter check-ins entre duas datas no formato YYYY-MM-DD (inclusive)"""
+
+    async def get_checkins_por_data(self, data: str) -> List[CheckInRefeicao]:
+        """Obter check-ins de uma data específica"""
+        return await self.get_checkins_por_periodo(data, data)
+
+    # Listas de compras fixas
+    @abstractmethod
+    async def get_listas_fixas(self) -> List[ListaFixa]:
+        """Obter todas as listas de compras fixas"""
+
+    @abstractmethod
+    async def create_lista_fixa(self, lista_data) -> ListaFixa:
+        """Criar nova lista de compras fixa"""
+
+    @abstractmethod
+    async def update_lista_fixa(self, lista_id: int, lista_data) -> ListaFixa:
+        """Atualizar nome e/ou itens de uma lista fixa"""
+
+    @abstractmethod
+    async def delete_lista_fixa(self, lista_id: int):
+        """Deletar lista de compras fixa"""
+
+
+def create_storage() -> StorageBackend:
+    """Criar o backend escolhido pela variável STORAGE_BACKEND (sheets ou sqlite)"""
+    backend = os.getenv("STORAGE_BACKEND", "sheets").lower()
+
+    # Importações tardias: cada backend só carrega as próprias dependências
+    if backend == "sheets":
+        from google_sheets_service import GoogleSheetsService
+        return GoogleSheetsService()
+    if backend == "sqlite":
+        from sqlite_service import SQLiteService
+        return SQLiteService()
+
+    raise ValueError(f"STORAGE_BACKEND inválido: {backend} (use 'sheets' ou 'sqlite')")
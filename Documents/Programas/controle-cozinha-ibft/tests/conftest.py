@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from benchmarks.fake_gspread import Client, Upstream
+
+SHEET_ID = 'planilha-de-teste'
+
+
+@pytest.fixture
+def upstream():
+    """Google Sheets simulado sem latência nem cota"""
+    return Upstream(read_latency=0, write_latency=0, jitter=0, reads_per_minute=0, writes_per_minute=0)
+
+
+@pytest.fixture
+def spreadsheet(upstream):
+    return Client(upstream).open_by_key(SHEET_ID)
+
+
+@pytest.fixture
+def sheets(monkeypatch, upstream, spreadsheet):
+    """Fábrica de GoogleSheetsService ligados à planilha simulada; variáveis de ambiente extras por parâmetro"""
+    monkeypatch.setenv('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credenciais-de-teste.json')
+    monkeypatch.setenv('GOOGLE_SHEET_ID', SHEET_ID)
+    monkeypatch.setenv('SHEETS_READS_PER_MINUTE', '0')
+    monkeypatch.setenv('SHEETS_WRITES_PER_MINUTE', '0')
+
+    def build(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        from google_sheets_service import GoogleSheetsService
+        service = GoogleSheetsService()
+        service.client, service.sheet = Client(upstream), spreadsheet
+        service._initialize_sheets()
+        return service
+
+    return build
+
+
+@pytest.fixture
+def sqlite(monkeypatch, tmp_path):
+    """SQLiteService com banco vazio num diretório temporário"""
+    monkeypatch.setenv('SQLITE_DB_PATH', str(tmp_path / 'cozinha.db'))
+    monkeypatch.setenv('SQLITE_SHEETS_MIRROR_INTERVAL', '0')
+    from sqlite_service import SQLiteService
+    service = SQLiteService()
+    yield service
+    asyncio.run(service.stop())
+
+
+@pytest.fixture
+def api(monkeypatch, sqlite):
+    """Cliente HTTP da API servindo o SQLiteService de teste"""
+    monkeypatch.setenv('STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setenv('WARM_UP_ON_START', 'false')
+    from fastapi.testclient import TestClient
+    import main
+    monkeypatch.setattr(main, 'storage', sqlite)
+    return TestClient(main.app)
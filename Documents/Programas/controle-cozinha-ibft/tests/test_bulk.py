@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google_sheets_service import SHEET_HEADERS
+
+TIMESTAMP = '2026-01-01 08:00:00'
+
+
+@pytest.fixture
+def estoque(spreadsheet):
+    """Aba Estoque com os itens 1 a 6 (linhas 2 a 7)"""
+    return spreadsheet.seed_worksheet('Estoque', SHEET_HEADERS['Estoque'], [
+        [i, f"Item {i}", 10, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20] for i in range(1, 7)
+    ])
+
+
+def _novo(nome: str):
+    return SimpleNamespace(nome=nome, quantidade=1, unidade='kg', categoria='Grãos', estoque_minimo=5, estoque_alvo=None)
+
+
+def _quantidade(quantidade: int):
+    return SimpleNamespace(nome=None, quantidade=quantidade, unidade=None, categoria=None, estoque_minimo=None, estoque_alvo=None)
+
+
+def _ids_and_quantities(worksheet):
+    return [(int(row[0]), int(row[2])) for row in worksheet._values()[1:]]
+
+
+def _listen(service):
+    changes = []
+    service.add_listener(lambda entity, action, item_id, item=None: changes.append((action, item_id)))
+    return changes
+
+
+def test_lote_misto_vira_poucas_chamadas_agrupadas(sheets, upstream, estoque):
+    service = sheets()
+    operations = [
+        ('update', 2, _quantidade(20)),
+        ('create', None, _novo('Novo A')),
+        ('delete', 3, None),
+        ('update', 5, _quantidade(50)),
+        ('delete', 4, None),
+        ('create', None, _novo('Novo B')),
+    ]
+    before = upstream.snapshot()
+
+    results = asyncio.run(service.bulk('estoque', operations))
+
+    calls = upstream.snapshot() - before
+    assert all(result.sucesso for result in results)
+    assert [result.id for result in results] == [2, 7, 3, 5, 4, 8]
+    # Uma leitura, um batch_update das linhas, uma remoção compactada e um append_rows
+    assert calls['Worksheet.get_all_values'] == 1
+    assert calls['Worksheet.batch_update'] == 1
+    assert calls['Spreadsheet.batch_update'] == 1
+    assert calls['Worksheet.append_rows'] == 1
+    assert sum(calls.values()) == 4
+    assert _ids_and_quantities(estoque) == [(1, 10), (2, 20), (5, 50), (6, 10), (7, 1), (8, 1)]
+
+
+def test_falhas_por_operacao_nao_impedem_as_outras(sheets, estoque):
+    service = sheets()
+    changes = _listen(service)
+    operations = [
+        ('update', 99, _quantidade(1)),
+        ('delete', 2, None),
+        # O mesmo ID de novo depois da remoção
+        ('delete', 2, None),
+        ('update', 2, _quantidade(7)),
+        ('update', 1, _quantidade(11)),
+        ('delete', 98, None),
+    ]
+
+    results = asyncio.run(service.bulk('estoque', operations))
+
+    assert [result.sucesso for result in results] == [False, True, False, False, True, False]
+    assert all('não encontrado' in result.erro for result in results if not result.sucesso)
+    assert results[4].item['quantidade'] == 11
+    assert _ids_and_quantities(estoque) == [(1, 11), (3, 10), (4, 10), (5, 10), (6, 10)]
+    assert sorted(changes) == [('delete', 2), ('update', 1)]
+
+
+def test_remocoes_deslocam_as_linhas_das_operacoes_seguintes(sheets, upstream, estoque):
+    service = sheets()
+
+    async def scenario():
+        # Faixa contígua (2 e 3) e uma isolada (5): as linhas abaixo sobem
+        await service.bulk('estoque', [('delete', 2, None), ('delete', 3, None), ('delete', 5, None)])
+        rows = {item_id: service.row_index.get('Estoque', item_id) for item_id in (1, 4, 6)}
+        # Sem nova leitura: as escritas avulsas usam o índice de linhas já deslocado
+        before = upstream.snapshot()
+        await service.update_estoque_item(6, _quantidade(60))
+        await service.delete_estoque_item(4)
+        return rows, upstream.snapshot() - before
+
+    rows, calls = asyncio.run(scenario())
+    assert rows == {1: 2, 4: 3, 6: 4}
+    assert calls['Worksheet.get_all_values'] == 0
+    assert _ids_and_quantities(estoque) == [(1, 10), (6, 60)]
+
+
+def test_falha_parcial_desfaz_o_estado_local_das_operacoes_nao_gravadas(sheets, monkeypatch, spreadsheet, estoque):
+    service = sheets()
+    changes = _listen(service)
+
+    def failing_batch_update(body):
+        raise RuntimeError('Planilha indisponível')
+
+    # As atualizações são gravadas; a remoção compactada falha
+    monkeypatch.setattr(spreadsheet, 'batch_update', failing_batch_update)
+
+    async def scenario():
+        await service.get_estoque()
+        results = await service.bulk('estoque', [('update', 1, _quantidade(15)), ('delete', 2, None)])
+        return results, service.cache.get('Estoque'), await service.get_estoque()
+
+    results, cached, items = asyncio.run(scenario())
+    assert [result.sucesso for result in results] == [True, False]
+    assert 'Planilha indisponível' in results[1].erro
+    # Só a operação gravada é avisada; o cache é descartado e a leitura seguinte reflete a planilha
+    assert changes == [('update', 1)]
+    assert cached is None
+    assert [(item.id, item.quantidade) for item in items] == [(1, 15), (2, 10), (3, 10), (4, 10), (5, 10), (6, 10)]
+
+
+def test_falha_nas_atualizacoes_nao_tenta_as_remocoes(sheets, monkeypatch, upstream, estoque):
+    service = sheets()
+    changes = _listen(service)
+
+    def failing_batch_update(data, **kwargs):
+        raise RuntimeError('Planilha indisponível')
+
+    monkeypatch.setattr(estoque, 'batch_update', failing_batch_update)
+    before = upstream.snapshot()
+
+    results = asyncio.run(service.bulk('estoque', [
+        ('update', 1, _quantidade(15)), ('delete', 2, None), ('create', None, _novo('Novo'))
+    ]))
+
+    assert [result.sucesso for result in results] == [False, False, True]
+    assert (upstream.snapshot() - before)['Spreadsheet.batch_update'] == 0
+    assert changes == [('create', 7)]
+    assert _ids_and_quantities(estoque) == [(i, 10) for i in range(1, 7)] + [(7, 1)]
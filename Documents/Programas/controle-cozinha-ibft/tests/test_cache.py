@@ -0,0 +1,78 @@
+from cache import RowIndex, WorksheetCache, apply_change
+
+
+def _records(*ids):
+    return [{'ID': record_id, 'Nome': f"Item {record_id}"} for record_id in ids]
+
+
+def test_cache_expira_mas_guarda_a_ultima_leitura(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('cache.time.monotonic', lambda: now[0])
+    cache = WorksheetCache(ttl=30)
+    cache.set('Estoque', _records(1, 2))
+
+    assert [r['ID'] for r in cache.get('Estoque')] == [1, 2]
+    now[0] += 31
+    assert cache.get('Estoque') is None
+    assert [r['ID'] for r in cache.stale('Estoque')] == [1, 2]
+
+
+def test_cache_desativado_com_ttl_zero():
+    cache = WorksheetCache(ttl=0)
+    cache.set('Estoque', _records(1))
+    assert cache.get('Estoque') is None
+    assert cache.stale('Estoque') is None
+
+
+def test_escrita_direta_no_cache():
+    cache = WorksheetCache(ttl=30)
+    cache.set('Estoque', _records(1, 2, 3))
+
+    cache.append('Estoque', {'ID': 4, 'Nome': 'Novo'})
+    cache.replace('Estoque', {'ID': 2, 'Nome': 'Alterado'})
+    cache.remove('Estoque', 1)
+
+    assert cache.get('Estoque') == [
+        {'ID': 2, 'Nome': 'Alterado'}, {'ID': 3, 'Nome': 'Item 3'}, {'ID': 4, 'Nome': 'Novo'}
+    ]
+
+
+def test_substituir_registro_ausente_descarta_o_cache():
+    cache = WorksheetCache(ttl=30)
+    cache.set('Estoque', _records(1))
+    cache.replace('Estoque', {'ID': 9, 'Nome': 'Desconhecido'})
+    assert cache.get('Estoque') is None
+
+
+def test_apply_change_e_idempotente():
+    records = _records(1, 2)
+
+    assert apply_change(records, 'create', 3, {'ID': 3, 'Nome': 'Novo'}) == (True, None)
+    assert apply_change(records, 'create', 3, {'ID': 3, 'Nome': 'Novo'}) == (False, None)
+    assert apply_change(records, 'update', 1, {'ID': 1, 'Nome': 'Alterado'}) == (True, {'ID': 1, 'Nome': 'Item 1'})
+    assert apply_change(records, 'delete', 2, None) == (True, {'ID': 2, 'Nome': 'Item 2'})
+    assert apply_change(records, 'delete', 2, None) == (False, None)
+    assert apply_change(records, 'update', 2, {'ID': 2, 'Nome': 'Removido'}) == (False, None)
+
+    assert records == [{'ID': 1, 'Nome': 'Alterado'}, {'ID': 3, 'Nome': 'Novo'}]
+
+
+def test_row_index_desloca_linhas_abaixo_da_removida():
+    index = RowIndex()
+    index.build('Estoque', _records(1, 2, 3, 4))
+    index.add('Estoque', 5, 6)
+
+    index.remove('Estoque', 2)
+
+    assert [index.get('Estoque', record_id) for record_id in (1, 2, 3, 4, 5)] == [2, None, 3, 4, 5]
+
+
+def test_row_index_descarta_planilha_ao_remover_id_desconhecido():
+    index = RowIndex()
+    index.build('Estoque', _records(1, 2))
+    index.build('Pratos', _records(1))
+
+    index.remove('Estoque', 9)
+
+    assert index.get('Estoque', 1) is None
+    assert index.get('Pratos', 1) == 2
@@ -0,0 +1,95 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from checkin_index import DuplicateCheckInError
+
+DATA = '2026-10-16'
+
+
+def _cadastrar(service):
+    """Um funcionário e um prato ativos; retorna o corpo de um check-in deles"""
+    async def cadastrar():
+        funcionario = await service.create_funcionario(SimpleNamespace(nome='Ana', cargo='Cozinheira', ativo=True))
+        prato = await service.create_prato(SimpleNamespace(nome='Feijoada', descricao='', data=DATA, ativo=True))
+        return funcionario, prato
+
+    funcionario, prato = asyncio.run(cadastrar())
+    return SimpleNamespace(funcionario_id=funcionario.id, prato_id=prato.id, data=DATA, horario='12:00')
+
+
+def test_checkin_duplicado_retorna_409(api, sqlite):
+    checkin = _cadastrar(sqlite)
+
+    first = api.post('/api/checkins', json=vars(checkin))
+    second = api.post('/api/checkins', json=vars(checkin))
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert 'já tem check-in' in second.json()['detail']
+
+
+def test_reservas_simultaneas_do_mesmo_funcionario_e_data(sqlite):
+    checkin = _cadastrar(sqlite)
+
+    async def scenario():
+        return await asyncio.gather(*(sqlite.create_checkin(checkin) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert sum(not isinstance(result, Exception) for result in results) == 1
+    assert all(isinstance(result, DuplicateCheckInError) for result in results if isinstance(result, Exception))
+    assert len(asyncio.run(sqlite.get_checkins())) == 1
+
+
+@pytest.fixture
+def outro_processo(sqlite):
+    """Segundo SQLiteService no mesmo banco, com o próprio índice em memória (outro worker)"""
+    from sqlite_service import SQLiteService
+    service = SQLiteService()
+    yield service
+    asyncio.run(service.stop())
+
+
+def test_duplicata_gravada_por_outro_processo_e_rejeitada_pelo_banco(sqlite, outro_processo):
+    checkin = _cadastrar(sqlite)
+    # Os dois índices já carregados, antes de qualquer check-in
+    asyncio.run(sqlite.checkin_index.ensure_loaded())
+    asyncio.run(outro_processo.checkin_index.ensure_loaded())
+
+    asyncio.run(sqlite.create_checkin(checkin))
+    with pytest.raises(DuplicateCheckInError):
+        asyncio.run(outro_processo.create_checkin(checkin))
+
+
+def test_funcionario_cadastrado_por_outro_processo_e_conferido_antes_de_rejeitar(sqlite, outro_processo):
+    checkin = _cadastrar(sqlite)
+    asyncio.run(outro_processo.checkin_index.ensure_loaded())
+    novo = asyncio.run(sqlite.create_funcionario(SimpleNamespace(nome='Bia', cargo='Copeira', ativo=True)))
+
+    created = asyncio.run(outro_processo.create_checkin(SimpleNamespace(**{**vars(checkin), 'funcionario_id': novo.id})))
+
+    assert created.funcionario_nome == 'Bia'
+    with pytest.raises(ValueError, match='não encontrado'):
+        asyncio.run(outro_processo.create_checkin(SimpleNamespace(**{**vars(checkin), 'funcionario_id': 999})))
+
+
+def test_banco_com_duplicatas_antigas_continua_abrindo(tmp_path, monkeypatch):
+    path = tmp_path / 'antigo.db'
+    monkeypatch.setenv('SQLITE_DB_PATH', str(path))
+    monkeypatch.setenv('SQLITE_SHEETS_MIRROR_INTERVAL', '0')
+    from sqlite_service import SCHEMA, SQLiteService
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO checkins (funcionario_id, funcionario_nome, prato_id, prato_nome, data, horario, data_criacao) "
+        "VALUES (1, 'Ana', 1, 'Feijoada', ?, '12:00', ?)", [(DATA, DATA)] * 2
+    )
+    conn.commit()
+    conn.close()
+
+    service = SQLiteService()
+    try:
+        assert len(asyncio.run(service.get_checkins())) == 2
+    finally:
+        asyncio.run(service.stop())
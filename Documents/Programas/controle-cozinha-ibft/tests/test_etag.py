@@ -0,0 +1,45 @@
+
+def _novo_item(nome: str) -> dict:
+    return dict(nome=nome, quantidade=1, unidade='kg', categoria='Grãos')
+
+
+def test_listagem_responde_304_enquanto_o_etag_vale(api):
+    api.post('/api/estoque', json=_novo_item('Arroz'))
+    first = api.get('/api/estoque')
+    etag = first.headers['ETag']
+
+    same = api.get('/api/estoque', headers={'If-None-Match': etag})
+    weak = api.get('/api/estoque', headers={'If-None-Match': f'"outro", W/{etag}'})
+    other = api.get('/api/estoque', headers={'If-None-Match': '"outro"'})
+
+    assert first.status_code == 200 and [item['nome'] for item in first.json()] == ['Arroz']
+    assert same.status_code == 304 and same.content == b'' and same.headers['ETag'] == etag
+    assert weak.status_code == 304
+    assert other.status_code == 200 and other.headers['ETag'] == etag
+
+
+def test_alteracao_muda_o_etag(api):
+    etag = api.get('/api/estoque').headers['ETag']
+    api.post('/api/estoque', json=_novo_item('Feijão'))
+
+    after = api.get('/api/estoque', headers={'If-None-Match': etag})
+
+    assert after.status_code == 200
+    assert after.headers['ETag'] != etag
+    assert [item['nome'] for item in after.json()] == ['Feijão']
+    # Outras entidades não mudam de versão
+    funcionarios = api.get('/api/funcionarios')
+    assert api.get('/api/funcionarios', headers={'If-None-Match': funcionarios.headers['ETag']}).status_code == 304
+
+
+def test_pagina_tambem_leva_etag(api):
+    for nome in ('Arroz', 'Feijão', 'Sal'):
+        api.post('/api/estoque', json=_novo_item(nome))
+    params = {'limit': 2, 'sort': 'nome', 'fields': 'id,nome'}
+    page = api.get('/api/estoque', params=params)
+
+    again = api.get('/api/estoque', params=params, headers={'If-None-Match': page.headers['ETag']})
+
+    assert page.json() == [{'id': 1, 'nome': 'Arroz'}, {'id': 2, 'nome': 'Feijão'}]
+    assert 'X-Next-Cursor' in page.headers
+    assert again.status_code == 304
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from events import EventBroker
+
+
+class Client:
+    """Cliente SSE: lê as mensagens do stream e desconecta quando pedido"""
+
+    def __init__(self, broker: EventBroker, last_event_id=None):
+        self.connected = True
+        self.stream = broker.stream(last_event_id, self.is_disconnected)
+
+    async def is_disconnected(self) -> bool:
+        return not self.connected
+
+    async def next(self) -> str:
+        return await asyncio.wait_for(self.stream.__anext__(), timeout=1)
+
+
+def _data(message: str) -> dict:
+    return json.loads(message.split('data: ', 1)[1])
+
+
+def test_inscrever_publicar_e_desconectar():
+    broker = EventBroker(heartbeat=0.05)
+
+    async def scenario():
+        client = Client(broker)
+        retry = await client.next()
+        assert len(broker._subscribers) == 1
+        broker.publish('estoque', 'delete', 3)
+        message = await client.next()
+        client.connected = False
+        # A desconexão é conferida antes de esperar o próximo evento
+        tail = [message async for message in client.stream]
+        return retry, message, tail
+
+    retry, message, tail = asyncio.run(scenario())
+    assert retry == 'retry: 3000\n\n'
+    assert message.startswith(f"id: {broker.epoch}-1\n")
+    assert _data(message) == {'entidade': 'estoque', 'acao': 'delete', 'id': 3, 'item': None}
+    assert tail == []
+    assert broker._subscribers == set()
+
+
+def test_escritas_do_backend_chegam_ao_cliente(sqlite):
+    broker = EventBroker()
+    sqlite.add_listener(broker.publish)
+
+    async def scenario():
+        client = Client(broker)
+        await client.next()
+        created = await sqlite.create_estoque_item(SimpleNamespace(
+            nome='Arroz', quantidade=1, unidade='kg', categoria='Grãos', estoque_minimo=5, estoque_alvo=None
+        ))
+        message = await client.next()
+        broker.close()
+        tail = [message async for message in client.stream]
+        return created, message, tail
+
+    created, message, tail = asyncio.run(scenario())
+    data = _data(message)
+    assert (data['entidade'], data['acao'], data['id']) == ('estoque', 'create', created.id)
+    assert data['item']['nome'] == 'Arroz'
+    # close() encerra o stream e desinscreve o cliente
+    assert tail == []
+    assert broker._subscribers == set()
+
+
+def test_reconexao_retoma_de_last_event_id():
+    broker = EventBroker(history=2)
+    for item_id in (1, 2, 3):
+        broker.publish('estoque', 'delete', item_id)
+
+    async def first_messages(last_event_id):
+        client = Client(broker, last_event_id)
+        messages = [await client.next(), await client.next()]
+        await client.stream.aclose()
+        return messages
+
+    _, resumed = asyncio.run(first_messages(f"{broker.epoch}-2"))
+    # Fora do histórico, de outro processo ou inválido: o cliente é mandado recarregar
+    resets = [asyncio.run(first_messages(last_event_id))[1] for last_event_id in (f"{broker.epoch}-0", 'outro-3', 'lixo')]
+    assert _data(resumed)['id'] == 3
+    assert all('event: reset\n' in message and f"id: {broker.epoch}-3\n" in message for message in resets)
+    assert broker._subscribers == set()
+
+
+def test_cliente_lento_recebe_reset_e_e_desinscrito():
+    broker = EventBroker(queue_size=2)
+
+    async def scenario():
+        client = Client(broker)
+        await client.next()
+        for item_id in (1, 2, 3):
+            broker.publish('estoque', 'delete', item_id)
+        subscribed = len(broker._subscribers)
+        return subscribed, [message async for message in client.stream]
+
+    subscribed, messages = asyncio.run(scenario())
+    assert subscribed == 0
+    assert len(messages) == 1 and 'event: reset\n' in messages[0]
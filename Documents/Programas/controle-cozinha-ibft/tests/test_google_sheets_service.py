@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google_sheets_service import SHEET_HEADERS
+
+TIMESTAMP = '2026-01-01 08:00:00'
+
+
+@pytest.fixture
+def estoque(spreadsheet):
+    """Aba Estoque com os itens 1, 2 e 3"""
+    return spreadsheet.seed_worksheet('Estoque', SHEET_HEADERS['Estoque'], [
+        [i, f"Item {i}", 10, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20] for i in range(1, 4)
+    ])
+
+
+def _novo_item(nome: str):
+    return SimpleNamespace(nome=nome, quantidade=1, unidade='kg', categoria='Grãos', estoque_minimo=5, estoque_alvo=None)
+
+
+def _slow_reads(service, delay: float):
+    """Fazer as leituras completas terminarem delay segundos depois de lerem a planilha"""
+    original = service._read_records
+
+    async def read_records(worksheet):
+        records = await original(worksheet)
+        await asyncio.sleep(delay)
+        return records
+
+    service._read_records = read_records
+    return original
+
+
+def test_leitura_iniciada_antes_de_uma_criacao_nao_a_desfaz(sheets, estoque):
+    service = sheets(SHEETS_CACHE_TTL=30)
+
+    async def scenario():
+        original = _slow_reads(service, 0.1)
+        reading = asyncio.create_task(service.get_estoque())
+        await asyncio.sleep(0.02)
+        service._read_records = original
+        created = await service.create_estoque_item(_novo_item('Novo'))
+        await reading
+        return created, [item.id for item in await service.get_estoque()]
+
+    created, ids = asyncio.run(scenario())
+    assert ids == [1, 2, 3, created.id]
+    assert service.row_index.get('Estoque', created.id) == 5
+
+
+def test_leitura_iniciada_antes_de_uma_remocao_nao_a_desfaz(sheets, estoque):
+    service = sheets(SHEETS_CACHE_TTL=30)
+
+    async def scenario():
+        await service.get_estoque()
+        service.cache.invalidate('Estoque')
+        original = _slow_reads(service, 0.1)
+        reading = asyncio.create_task(service.get_estoque())
+        await asyncio.sleep(0.02)
+        service._read_records = original
+        await service.delete_estoque_item(2)
+        await reading
+        return [item.id for item in await service.get_estoque()]
+
+    assert asyncio.run(scenario()) == [1, 3]
+    assert [row[0] for row in estoque._values()[1:]] == ['1', '3']
+
+
+def test_escrita_mais_lenta_que_o_timeout_e_concluida(sheets, upstream, estoque):
+    service = sheets(SHEETS_CALL_TIMEOUT=0.05)
+    upstream.write_latency = 0.2
+
+    created = asyncio.run(service.create_estoque_item(_novo_item('Lento')))
+
+    assert [row[1] for row in estoque._values()[1:]] == ['Item 1', 'Item 2', 'Item 3', 'Lento']
+    assert service.row_index.get('Estoque', created.id) == 5
+
+
+def test_atualizacao_depois_de_remocao_usa_a_linha_deslocada(sheets, upstream, estoque):
+    service = sheets(SHEETS_CACHE_TTL=30)
+    changes = SimpleNamespace(nome=None, quantidade=42, unidade=None, categoria=None, estoque_minimo=None, estoque_alvo=None)
+
+    async def scenario():
+        await service.get_estoque()
+        await service.delete_estoque_item(1)
+        reads = upstream.calls['Worksheet.get_all_records'] + upstream.calls['Worksheet.get_all_values']
+        await service.update_estoque_item(3, changes)
+        return reads, upstream.calls['Worksheet.get_all_records'] + upstream.calls['Worksheet.get_all_values']
+
+    reads_before, reads_after = asyncio.run(scenario())
+    assert reads_after == reads_before
+    assert [(row[0], row[2]) for row in estoque._values()[1:]] == [('2', '10'), ('3', '42')]
+
+
+def _checkin_row(checkin_id: int, data: str):
+    return [checkin_id, 1, 'Funcionário 1', 1, 'Prato 1', data, '12:00', TIMESTAMP]
+
+
+@pytest.fixture
+def particoes(spreadsheet):
+    """Aba CheckIns antiga vazia e uma partição por mês, de setembro a novembro de 2026"""
+    spreadsheet.seed_worksheet('CheckIns', SHEET_HEADERS['CheckIns'], [])
+    for checkin_id, mes in enumerate(('09', '10', '11'), start=1):
+        spreadsheet.seed_worksheet(
+            f'CheckIns_2026_{mes}', SHEET_HEADERS['CheckIns'], [_checkin_row(checkin_id, f'2026-{mes}-15')]
+        )
+
+
+def test_versao_de_um_periodo_so_le_as_particoes_do_periodo(sheets, particoes):
+    service = sheets(CHECKIN_PARTITIONS='monthly')
+
+    async def scenario():
+        await service.get_version('checkins', '2026-10-01', '2026-10-31')
+        return [checkin.id for checkin in await service.get_checkins_por_periodo('2026-10-01', '2026-10-31')]
+
+    assert asyncio.run(scenario()) == [2]
+    assert service.cache.get('CheckIns_2026_10') is not None
+    assert service.cache.get('CheckIns_2026_09') is None
+    assert service.cache.get('CheckIns_2026_11') is None
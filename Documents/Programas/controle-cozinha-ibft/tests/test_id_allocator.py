@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from id_allocator import IdAllocator
+
+
+class MaxId:
+    """Maior ID da planilha, contando quantas vezes foi consultado"""
+
+    def __init__(self, value: int):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.value
+
+
+def test_semeia_uma_vez_e_segue_em_memoria():
+    allocator = IdAllocator()
+    max_id = MaxId(7)
+
+    async def scenario():
+        return [await allocator.allocate('Estoque', max_id) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [8, 9, 10]
+    assert max_id.calls == 1
+    assert allocator.is_seeded('Estoque')
+
+
+def test_ids_unicos_sob_concorrencia():
+    allocator = IdAllocator()
+    max_id = MaxId(0)
+
+    async def scenario():
+        return await asyncio.gather(*(allocator.allocate('Estoque', max_id) for _ in range(50)))
+
+    assert sorted(asyncio.run(scenario())) == list(range(1, 51))
+    assert max_id.calls == 1
+
+
+def test_reset_nunca_volta_atras():
+    allocator = IdAllocator()
+
+    async def scenario():
+        await allocator.allocate('Estoque', MaxId(10))
+        allocator.reset('Estoque')
+        # A releitura ainda não enxerga o ID 11 já entregue
+        after_reset = await allocator.allocate('Estoque', MaxId(5))
+        allocator.reset()
+        after_growth = await allocator.allocate('Estoque', MaxId(20))
+        return after_reset, after_growth
+
+    assert asyncio.run(scenario()) == (12, 21)
+
+
+def test_blocos_reservados_entre_processos():
+    reserved = []
+    last = {'Estoque': 0}
+
+    async def reserve_block(worksheet_name, get_max_id, size):
+        start = max(last[worksheet_name], await get_max_id()) + 1
+        last[worksheet_name] = start + size - 1
+        reserved.append((start, last[worksheet_name]))
+        return start, last[worksheet_name]
+
+    first, second = IdAllocator(3, reserve_block), IdAllocator(3, reserve_block)
+
+    async def scenario():
+        ids = [await allocator.allocate('Estoque', MaxId(4)) for allocator in (first, second, first, first, first)]
+        first.reset()
+        ids.append(await first.allocate('Estoque', MaxId(4)))
+        return ids
+
+    assert asyncio.run(scenario()) == [5, 8, 6, 7, 11, 12]
+    assert reserved == [(5, 7), (8, 10), (11, 13)]
+
+
+def test_blocos_exigem_reserve_block():
+    with pytest.raises(ValueError):
+        IdAllocator(block_size=10)
@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google_sheets_service import SHEET_HEADERS
+from journal import JournalInUseError, WriteJournal
+
+TIMESTAMP = '2026-01-01 08:00:00'
+
+
+@pytest.fixture
+def estoque(spreadsheet):
+    """Aba Estoque com os itens 1, 2 e 3"""
+    return spreadsheet.seed_worksheet('Estoque', SHEET_HEADERS['Estoque'], [
+        [i, f"Item {i}", 10, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20] for i in range(1, 4)
+    ])
+
+
+def _novo_item(nome: str):
+    return SimpleNamespace(nome=nome, quantidade=1, unidade='kg', categoria='Grãos', estoque_minimo=5, estoque_alvo=None)
+
+
+def _ids(worksheet):
+    return [int(row[0]) for row in worksheet._values()[1:]]
+
+
+def test_alteracoes_gravadas_ficam_no_diario_ate_a_confirmacao(tmp_path):
+    path = str(tmp_path / 'diario.db')
+    applied = []
+
+    async def failing(entries):
+        applied.append([entry.registro_id for entry in entries])
+        raise RuntimeError('Planilha indisponível')
+
+    async def write_and_fail():
+        journal = WriteJournal(path, failing)
+        await journal.append('Estoque', 'update', 1, {'ID': 1})
+        await journal.append('Estoque', 'delete', 2)
+        with pytest.raises(RuntimeError):
+            await journal.replay()
+        await journal.stop()
+
+    asyncio.run(write_and_fail())
+
+    async def reopen_and_confirm():
+        journal = WriteJournal(path, None)
+
+        async def confirm(entries):
+            await journal.complete(entries[:1])
+            raise RuntimeError('Falha depois da primeira')
+
+        journal.apply_batch = confirm
+        pending = journal.pending
+        with pytest.raises(RuntimeError):
+            await journal.replay()
+        left = journal.pending
+        await journal.stop()
+        return pending, left, WriteJournal(path, None)
+
+    pending, left, reopened = asyncio.run(reopen_and_confirm())
+    assert applied == [[1, 2]]
+    # Depois de um reinício, as pendências voltam marcadas para conferir na planilha antes de reaplicar
+    assert [(entry.acao, entry.registro_id, entry.dados, entry.incerta) for entry in pending] == [
+        ('update', 1, {'ID': 1}, True), ('delete', 2, None, True)
+    ]
+    # Só a confirmada sai do arquivo
+    assert [entry.registro_id for entry in left] == [2]
+    assert [entry.registro_id for entry in reopened.pending] == [2]
+    asyncio.run(reopened.stop())
+
+
+def test_segundo_processo_no_mesmo_diario_falha_ao_iniciar(tmp_path):
+    path = str(tmp_path / 'diario.db')
+    first = WriteJournal(path, None)
+    with pytest.raises(JournalInUseError):
+        WriteJournal(path, None)
+    asyncio.run(first.stop())
+    # Liberado no encerramento
+    asyncio.run(WriteJournal(path, None).stop())
+
+
+@pytest.fixture
+def journal_env(tmp_path):
+    return dict(SHEETS_JOURNAL_PATH=tmp_path / 'diario.db', SHEETS_CACHE_TTL=30)
+
+
+def test_reaplicar_criacao_que_ja_chegou_a_planilha_nao_duplica(sheets, estoque, journal_env):
+    crashed = sheets(**journal_env)
+
+    async def create_and_crash():
+        created = await crashed.create_estoque_item(_novo_item('Novo'))
+        # A linha chegou à planilha, mas o processo caiu antes de confirmar no diário
+        estoque.append_row(crashed.journal.pending[0].dados)
+        await crashed.stop()
+        return created
+
+    created = asyncio.run(create_and_crash())
+    restarted = sheets(**journal_env)
+
+    async def replay():
+        await restarted.journal.replay()
+        return restarted.journal.pending
+
+    pending = asyncio.run(replay())
+    assert pending == []
+    assert _ids(estoque) == [1, 2, 3, created.id]
+    asyncio.run(restarted.stop())
+
+
+def test_reaplicar_remocao_de_linha_que_nao_existe_mais(sheets, estoque, journal_env):
+    crashed = sheets(**journal_env)
+
+    async def delete_and_crash():
+        await crashed.delete_estoque_item(2)
+        await crashed.update_estoque_item(3, SimpleNamespace(
+            nome='Renomeado', quantidade=None, unidade=None, categoria=None, estoque_minimo=None, estoque_alvo=None
+        ))
+        # A remoção chegou à planilha antes da queda; a atualização não
+        estoque.delete_rows(3)
+        await crashed.stop()
+
+    asyncio.run(delete_and_crash())
+    restarted = sheets(**journal_env)
+
+    async def replay_twice():
+        await restarted.journal.replay()
+        pending = restarted.journal.pending
+        # Nada a reaplicar numa segunda vez
+        await restarted.journal.replay()
+        return pending
+
+    pending = asyncio.run(replay_twice())
+    assert pending == []
+    assert _ids(estoque) == [1, 3]
+    assert estoque._values()[2][1] == 'Renomeado'
+    asyncio.run(restarted.stop())
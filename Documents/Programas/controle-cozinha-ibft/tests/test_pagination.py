@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google_sheets_service import SHEET_HEADERS
+from models import EstoqueItem
+from pagination import InvalidQueryError, encode_cursor, encode_position, paginate_models
+
+TIMESTAMP = '2026-01-01 08:00:00'
+# Quantidades repetidas: a ordem entre empates vem do id
+QUANTIDADES = [5, 3, 5, 1, 3, 5]
+
+
+def _item(item_id: int, quantidade: int) -> EstoqueItem:
+    return EstoqueItem(
+        id=item_id, nome=f"Item {item_id}", quantidade=quantidade, unidade='kg', categoria='Grãos',
+        data_criacao=TIMESTAMP, data_atualizacao=TIMESTAMP
+    )
+
+
+ITENS = [_item(item_id, quantidade) for item_id, quantidade in enumerate(QUANTIDADES, start=1)]
+
+
+def _all_pages(fetch, limit: int):
+    """Percorrer as páginas seguindo os cursores; retorna as páginas"""
+    pages, cursor = [], None
+    while True:
+        page, cursor = fetch(limit, cursor)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('sort, expected', [
+    ('quantidade', [4, 2, 5, 1, 3, 6]),
+    ('-quantidade', [6, 3, 1, 5, 2, 4]),
+    (None, [1, 2, 3, 4, 5, 6]),
+])
+def test_ordem_estavel_entre_paginas(sort, expected):
+    pages = _all_pages(lambda limit, cursor: paginate_models(ITENS, EstoqueItem, limit, cursor, sort, 'id'), 4)
+    assert [item['id'] for page in pages for item in page] == expected
+    assert [len(page) for page in pages] == [4, 2]
+
+
+def test_projecao_de_campos():
+    page, _ = paginate_models(ITENS, EstoqueItem, 2, None, 'nome', 'id,nome')
+    assert page == [{'id': 1, 'nome': 'Item 1'}, {'id': 2, 'nome': 'Item 2'}]
+    with pytest.raises(InvalidQueryError):
+        paginate_models(ITENS, EstoqueItem, 2, None, None, 'id,senha')
+    with pytest.raises(InvalidQueryError):
+        paginate_models(ITENS, EstoqueItem, 2, None, 'senha', None)
+
+
+CURSORES_INVALIDOS = [
+    'não é base64!',
+    encode_cursor({'a': 1}),
+    encode_cursor([3, 4]),
+    # Formato antigo ([chave, id]) ou de outra ordenação
+    encode_cursor([[0, 3], 4]),
+    encode_position('nome', False, 3, 4),
+    encode_position('quantidade', True, 3, 4),
+    # Tipos que não combinam com o campo ou id que não é inteiro
+    encode_position('quantidade', False, [3], 4),
+    encode_position('quantidade', False, None, 4),
+    encode_position('quantidade', False, 3, '4'),
+    encode_position('quantidade', False, 3, 4.5),
+    encode_position('quantidade', False, 3, True),
+]
+
+
+@pytest.mark.parametrize('cursor', CURSORES_INVALIDOS)
+def test_cursor_invalido(cursor):
+    with pytest.raises(InvalidQueryError, match='Cursor inválido'):
+        paginate_models(ITENS, EstoqueItem, 2, cursor, 'quantidade', None)
+
+
+@pytest.fixture
+def estoque_sqlite(sqlite):
+    async def create():
+        for item in ITENS:
+            await sqlite.create_estoque_item(SimpleNamespace(
+                nome=item.nome, quantidade=item.quantidade, unidade='kg', categoria='Grãos',
+                estoque_minimo=5, estoque_alvo=None
+            ))
+    asyncio.run(create())
+    return sqlite
+
+
+def test_sqlite_ordem_estavel_e_projecao(estoque_sqlite):
+    pages = _all_pages(
+        lambda limit, cursor: asyncio.run(estoque_sqlite.list_page('estoque', limit, cursor, '-quantidade', 'nome')), 4
+    )
+    assert [item['nome'] for page in pages for item in page] == [f"Item {i}" for i in (6, 3, 1, 5, 2, 4)]
+    assert all(set(item) == {'nome'} for page in pages for item in page)
+
+
+@pytest.mark.parametrize('cursor', CURSORES_INVALIDOS)
+def test_sqlite_cursor_invalido(estoque_sqlite, cursor):
+    with pytest.raises(InvalidQueryError, match='Cursor inválido'):
+        asyncio.run(estoque_sqlite.list_page('estoque', 2, cursor, 'quantidade', None))
+
+
+def test_sqlite_cursor_com_tipo_diferente_da_coluna(estoque_sqlite):
+    with pytest.raises(InvalidQueryError, match='Cursor inválido'):
+        asyncio.run(estoque_sqlite.list_page('estoque', 2, encode_position('nome', False, 3, 4), 'nome', None))
+    with pytest.raises(InvalidQueryError, match='Cursor inválido'):
+        asyncio.run(estoque_sqlite.list_page('estoque', 2, encode_position('quantidade', False, '3', 4), 'quantidade', None))
+
+
+def test_sheets_percorre_as_paginas_pelo_cursor(sheets, spreadsheet):
+    spreadsheet.seed_worksheet('Estoque', SHEET_HEADERS['Estoque'], [
+        [item.id, item.nome, item.quantidade, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20] for item in ITENS
+    ])
+    service = sheets()
+    pages = _all_pages(lambda limit, cursor: asyncio.run(service.list_page('estoque', limit, cursor, 'quantidade', 'id')), 4)
+    assert [item['id'] for page in pages for item in page] == [4, 2, 5, 1, 3, 6]
+    with pytest.raises(InvalidQueryError):
+        asyncio.run(service.list_page('estoque', 2, encode_position('quantidade', False, 3, 'x'), 'quantidade', None))
+
+
+def test_api_responde_400_para_cursor_invalido(api):
+    for cursor in ('lixo', encode_position('quantidade', False, 'x', 'y')):
+        response = api.get('/api/estoque', params={'limit': 2, 'sort': 'quantidade', 'cursor': cursor})
+        assert response.status_code == 400
+        assert response.json()['detail'] == 'Cursor inválido'
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from models import CheckInRefeicao, Funcionario, PratoDia
+from relatorios import RefeicoesRollup
+
+TIMESTAMP = '2026-01-01 08:00:00'
+
+
+def _checkin(checkin_id: int, data: str, funcionario_id: int, prato_id: int) -> CheckInRefeicao:
+    return CheckInRefeicao(
+        id=checkin_id, funcionario_id=funcionario_id, funcionario_nome=f"Funcionário {funcionario_id}",
+        prato_id=prato_id, prato_nome=f"Prato {prato_id}", data=data, horario='12:00', data_criacao=TIMESTAMP
+    )
+
+
+def _funcionario(funcionario_id: int, nome: str) -> Funcionario:
+    return Funcionario(id=funcionario_id, nome=nome, cargo='', ativo=True, data_criacao=TIMESTAMP, data_atualizacao=TIMESTAMP)
+
+
+def _prato(prato_id: int, nome: str) -> PratoDia:
+    return PratoDia(
+        id=prato_id, nome=nome, descricao='', data='2026-03-01', ativo=True, data_criacao=TIMESTAMP, data_atualizacao=TIMESTAMP
+    )
+
+
+class Backend:
+    """Leituras completas em memória, contando as vezes que os check-ins são lidos"""
+
+    def __init__(self):
+        self.checkins = [
+            _checkin(1, '2026-03-01', 1, 1),
+            _checkin(2, '2026-03-01', 2, 1),
+            _checkin(3, '2026-03-02', 1, 2),
+            _checkin(4, '2026-03-05', 1, 1),
+        ]
+        self.funcionarios = [_funcionario(1, 'Ana'), _funcionario(2, 'Bia')]
+        self.pratos = [_prato(1, 'Feijoada'), _prato(2, 'Moqueca')]
+        self.reads = 0
+
+    async def get_checkins(self):
+        self.reads += 1
+        return list(self.checkins)
+
+    async def get_funcionarios(self):
+        return list(self.funcionarios)
+
+    async def get_pratos(self):
+        return list(self.pratos)
+
+
+def _itens(relatorio):
+    return [(item.data or item.nome, item.refeicoes) for item in relatorio.itens]
+
+
+def test_agrupamentos_por_dia_prato_e_funcionario():
+    rollup = RefeicoesRollup(Backend())
+
+    async def scenario():
+        return [await rollup.get_relatorio('2026-03-01', '2026-03-02', agrupar) for agrupar in ('dia', 'prato', 'funcionario')]
+
+    dia, prato, funcionario = asyncio.run(scenario())
+    assert dia.total == prato.total == funcionario.total == 3
+    assert _itens(dia) == [('2026-03-01', 2), ('2026-03-02', 1)]
+    assert _itens(prato) == [('Feijoada', 2), ('Moqueca', 1)]
+    assert _itens(funcionario) == [('Ana', 2), ('Bia', 1)]
+
+
+def test_agrupamento_invalido():
+    with pytest.raises(ValueError):
+        asyncio.run(RefeicoesRollup(Backend()).get_relatorio('2026-03-01', '2026-03-31', 'mes'))
+
+
+def test_alteracoes_sao_aplicadas_sem_reler_os_checkins():
+    backend = Backend()
+    rollup = RefeicoesRollup(backend)
+
+    async def scenario():
+        await rollup.ensure_loaded()
+        rollup.apply('checkins', 'create', 5, _checkin(5, '2026-03-02', 2, 2))
+        # Repetida (por exemplo, reaplicada depois de uma reconstrução): contada uma vez só
+        rollup.apply('checkins', 'create', 5, _checkin(5, '2026-03-02', 2, 2))
+        rollup.apply('checkins', 'delete', 1)
+        rollup.apply('checkins', 'delete', 1)
+        rollup.apply('pratos', 'update', 2, _prato(2, 'Moqueca baiana'))
+        rollup.apply('estoque', 'create', 9)
+        return (
+            await rollup.get_relatorio('2026-03-01', '2026-03-31', 'dia'),
+            await rollup.get_relatorio('2026-03-01', '2026-03-31', 'prato'),
+        )
+
+    dia, prato = asyncio.run(scenario())
+    assert _itens(dia) == [('2026-03-01', 1), ('2026-03-02', 2), ('2026-03-05', 1)]
+    assert _itens(prato) == [('Feijoada', 2), ('Moqueca baiana', 2)]
+    assert backend.reads == 1
+
+
+def test_dia_sem_refeicoes_sai_do_relatorio():
+    rollup = RefeicoesRollup(Backend())
+
+    async def scenario():
+        await rollup.ensure_loaded()
+        rollup.apply('checkins', 'delete', 3)
+        return await rollup.get_relatorio('2026-03-02', '2026-03-05', 'dia')
+
+    relatorio = asyncio.run(scenario())
+    assert _itens(relatorio) == [('2026-03-05', 1)]
+
+
+def test_reconstrucao_em_segundo_plano_mantem_o_relatorio_atual():
+    backend = Backend()
+    rollup = RefeicoesRollup(backend, max_age=0)
+
+    async def scenario():
+        await rollup.ensure_loaded()
+        backend.checkins.append(_checkin(6, '2026-03-05', 2, 2))
+        # Velho: responde com os contadores atuais e reconstrói em segundo plano
+        during = await rollup.get_relatorio('2026-03-05', '2026-03-05', 'dia')
+        rollup.apply('checkins', 'create', 7, _checkin(7, '2026-03-05', 1, 2))
+        await rollup._refreshing
+        return during, await rollup.get_relatorio('2026-03-05', '2026-03-05', 'dia')
+
+    during, after = asyncio.run(scenario())
+    assert during.total == 1
+    # A lida na reconstrução (6) e a feita durante ela (7)
+    assert after.total == 3
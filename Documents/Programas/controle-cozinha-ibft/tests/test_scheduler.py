@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from scheduler import TokenBucket, UpstreamBusyError, UpstreamScheduler
+
+
+class ApiError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def _failing(*codes):
+    """Chamada que falha com os status informados, em ordem, e depois responde 'ok'"""
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        if len(attempts) <= len(codes):
+            raise ApiError(codes[len(attempts) - 1])
+        return 'ok'
+
+    return call, attempts
+
+
+def _scheduler(**kwargs):
+    return UpstreamScheduler(reads_per_minute=0, writes_per_minute=0, backoff_base=0, **kwargs)
+
+
+def test_balde_limita_rajada_e_reposicao():
+    bucket = TokenBucket(per_minute=60, burst=10)
+    assert bucket.capacity == 10
+    assert bucket.rate == pytest.approx(50 / 60)
+
+    async def scenario():
+        waits = [await bucket.acquire() for _ in range(10)]
+        bucket.drain()
+        return waits, bucket._tokens
+
+    waits, tokens = asyncio.run(scenario())
+    assert max(waits) < 0.05
+    assert tokens <= 0
+
+
+def test_leituras_simultaneas_com_a_mesma_chave_compartilham_a_chamada():
+    scheduler = _scheduler()
+    calls = []
+
+    async def read():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ['linha']
+
+    async def scenario():
+        return await asyncio.gather(*(scheduler.submit('read', read, key='Estoque') for _ in range(5)))
+
+    assert asyncio.run(scenario()) == [['linha']] * 5
+    assert len(calls) == 1
+
+
+def test_429_e_repetido():
+    call, attempts = _failing(429, 429)
+    assert asyncio.run(_scheduler().submit('write', call)) == 'ok'
+    assert len(attempts) == 3
+
+
+def test_5xx_so_e_repetido_se_idempotente():
+    call, attempts = _failing(503)
+    assert asyncio.run(_scheduler().submit('write', call, idempotent=True)) == 'ok'
+    assert len(attempts) == 2
+
+    call, attempts = _failing(503)
+    with pytest.raises(ApiError):
+        asyncio.run(_scheduler().submit('write', call))
+    assert len(attempts) == 1
+
+
+def test_429_persistente_vira_upstream_busy():
+    call, attempts = _failing(*[429] * 10)
+    with pytest.raises(UpstreamBusyError):
+        asyncio.run(_scheduler(max_retries=2).submit('write', call))
+    assert len(attempts) == 3
+
+
+def _max_id(value: int):
+    async def get_max_id():
+        return value
+    return get_max_id
+
+
+def _count_tokens(service):
+    """Contar as fichas consumidas nos baldes de leitura e escrita"""
+    acquired = []
+    for kind, bucket in service.scheduler._buckets.items():
+        acquire = bucket.acquire
+
+        async def counting(kind=kind, acquire=acquire):
+            acquired.append(kind)
+            return await acquire()
+
+        bucket.acquire = counting
+    return acquired
+
+
+def test_reserva_de_ids_usa_uma_ficha_por_chamada(sheets, upstream):
+    service = sheets(SHEETS_ID_BLOCK_SIZE=10, SHEETS_READS_PER_MINUTE=6000, SHEETS_WRITES_PER_MINUTE=6000)
+    acquired = _count_tokens(service)
+    before = upstream.total_calls
+
+    async def scenario():
+        return await asyncio.gather(*(service._reserve_id_block('Estoque', _max_id(3), 10) for _ in range(2)))
+
+    first, second = asyncio.run(scenario())
+
+    assert sorted([first, second]) == [(4, 13), (14, 23)]
+    assert len(acquired) == upstream.total_calls - before
+
+
+def test_criacao_de_particao_usa_uma_ficha_por_chamada(sheets, upstream, spreadsheet):
+    service = sheets(CHECKIN_PARTITIONS='monthly', SHEETS_READS_PER_MINUTE=6000, SHEETS_WRITES_PER_MINUTE=6000)
+    acquired = _count_tokens(service)
+    before = upstream.total_calls
+
+    asyncio.run(service._get_checkin_worksheet('CheckIns_2026_01'))
+
+    assert acquired == ['write', 'write']
+    assert upstream.total_calls - before == 2
+    assert spreadsheet.worksheet('CheckIns_2026_01')._values()[0][0] == 'ID'
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from google_sheets_service import SHEET_HEADERS
+from shared_cache import SharedCache
+
+TIMESTAMP = '2026-01-01 08:00:00'
+
+
+@pytest.fixture
+def estoque(spreadsheet):
+    """Aba Estoque com os itens 1, 2 e 3"""
+    return spreadsheet.seed_worksheet('Estoque', SHEET_HEADERS['Estoque'], [
+        [i, f"Item {i}", 10, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20] for i in range(1, 4)
+    ])
+
+
+@pytest.fixture
+def workers(sheets, tmp_path, estoque):
+    """Dois processos (workers) com o mesmo arquivo de cache compartilhado e a mesma planilha"""
+    env = dict(SHEETS_SHARED_CACHE_PATH=tmp_path / 'compartilhado.db', SHEETS_CACHE_TTL=30)
+    return sheets(**env), sheets(**env)
+
+
+def _novo_item(nome: str):
+    return SimpleNamespace(nome=nome, quantidade=1, unidade='kg', categoria='Grãos', estoque_minimo=5, estoque_alvo=None)
+
+
+def _stop(*services):
+    async def stop():
+        for service in services:
+            await service.stop()
+    asyncio.run(stop())
+
+
+def test_escritas_de_um_worker_aparecem_no_outro_sem_ler_a_planilha(workers, upstream, estoque):
+    a, b = workers
+
+    async def scenario():
+        await a.get_estoque()
+        await b.get_estoque()
+        reads = upstream.calls['Worksheet.get_all_values']
+        created = await a.create_estoque_item(_novo_item('Novo'))
+        after_create = {item.id: item.nome for item in await b.get_estoque()}
+        await b.update_estoque_item(2, SimpleNamespace(
+            nome=None, quantidade=42, unidade=None, categoria=None, estoque_minimo=None, estoque_alvo=None
+        ))
+        after_update = {item.id: item.quantidade for item in await a.get_estoque()}
+        await a.delete_estoque_item(1)
+        after_delete = [item.id for item in await b.get_estoque()]
+        return created, after_create, after_update, after_delete, upstream.calls['Worksheet.get_all_values'] - reads
+
+    try:
+        created, after_create, after_update, after_delete, reads = asyncio.run(scenario())
+    finally:
+        _stop(a, b)
+    assert after_create[created.id] == 'Novo'
+    assert after_update[2] == 42
+    assert after_delete == [2, 3, created.id]
+    assert reads == 0
+
+
+def test_leitura_de_um_worker_e_reaproveitada_pelo_outro(workers, upstream, estoque):
+    a, b = workers
+
+    async def scenario():
+        await a.get_estoque()
+        reads = upstream.calls['Worksheet.get_all_values']
+        items = await b.get_estoque()
+        return [item.id for item in items], upstream.calls['Worksheet.get_all_values'] - reads
+
+    try:
+        ids, reads = asyncio.run(scenario())
+    finally:
+        _stop(a, b)
+    assert ids == [1, 2, 3]
+    assert reads == 0
+
+
+def _count_max_id(service, counter: list):
+    original = service._get_max_id
+
+    async def get_max_id(worksheet_name):
+        counter.append(worksheet_name)
+        return await original(worksheet_name)
+
+    service._get_max_id = get_max_id
+
+
+def test_ids_sao_unicos_entre_workers_e_o_maior_id_e_lido_uma_vez(workers):
+    a, b = workers
+    max_id_reads = []
+    _count_max_id(a, max_id_reads)
+    _count_max_id(b, max_id_reads)
+
+    async def scenario():
+        first = await a.create_estoque_item(_novo_item('Primeiro'))
+        created = await asyncio.gather(*(
+            service.create_estoque_item(_novo_item(f"Novo {i}")) for i in range(5) for service in (a, b)
+        ))
+        return [first.id] + [item.id for item in created]
+
+    try:
+        ids = asyncio.run(scenario())
+    finally:
+        _stop(a, b)
+    assert sorted(ids) == list(range(4, 15))
+    # Só a primeira reserva semeia o contador compartilhado com o maior ID da planilha
+    assert max_id_reads == ['Estoque']
+
+
+def test_contador_de_ids_e_semeado_de_novo_depois_de_uma_recarga(workers, spreadsheet, estoque):
+    a, b = workers
+
+    async def scenario():
+        first = await a.create_estoque_item(_novo_item('Primeiro'))
+        # Linha incluída direto na planilha, fora dos workers
+        estoque.append_row([20, 'Manual', 1, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20])
+        await b.refresh_cache('Estoque')
+        second = await b.create_estoque_item(_novo_item('Segundo'))
+        return first.id, second.id
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        _stop(a, b)
+    assert first == 4
+    assert second == 21
+
+
+def test_cache_compartilhado_nao_usa_a_thread_do_event_loop(tmp_path):
+    cache = SharedCache(str(tmp_path / 'compartilhado.db'))
+    threads = []
+    original = cache._versions
+
+    def versions(names):
+        threads.append(threading.current_thread().name)
+        return original(names)
+
+    cache._versions = versions
+
+    async def scenario():
+        await cache.publish('Estoque', 0, [{'ID': 1}])
+        await cache.record_change('Estoque', 'create', 2, {'ID': 2})
+        versions = await cache.versions(['Estoque', 'Pratos'])
+        loaded = await cache.load('Estoque', 30)
+        changes = await cache.changes('Estoque', 0, versions['Estoque'])
+        await cache.close()
+        return versions, loaded, changes
+
+    versions, loaded, changes = asyncio.run(scenario())
+    assert versions == {'Estoque': 1, 'Pratos': 0}
+    assert loaded == (0, [{'ID': 1}])
+    assert [(action, record_id) for _, action, record_id, _ in changes] == [('create', 2)]
+    assert all(name.startswith('cache-compartilhado') for name in threads)
+
+
+def test_etag_e_o_mesmo_nos_workers_e_muda_com_escritas_e_edicoes_externas(sheets, tmp_path, estoque):
+    env = dict(SHEETS_SHARED_CACHE_PATH=tmp_path / 'compartilhado.db', SHEETS_CACHE_TTL=0.2)
+    a, b = sheets(**env), sheets(**env)
+
+    async def scenario():
+        tags = [await a.get_version('estoque'), await b.get_version('estoque')]
+        await a.create_estoque_item(_novo_item('Novo'))
+        tags += [await a.get_version('estoque'), await b.get_version('estoque')]
+        # Linha incluída direto na planilha, percebida na próxima leitura completa de um dos workers
+        estoque.append_row([20, 'Manual', 1, 'kg', 'Grãos', TIMESTAMP, TIMESTAMP, 5, 20])
+        await asyncio.sleep(0.3)
+        await a.get_estoque()
+        tags += [await b.get_version('estoque'), await a.get_version('estoque')]
+        return tags
+
+    try:
+        before_a, before_b, written_a, written_b, external_b, external_a = asyncio.run(scenario())
+    finally:
+        _stop(a, b)
+    assert before_a == before_b
+    assert written_a == written_b != before_a
+    assert external_a == external_b != written_a
@@ -0,0 +1,20 @@
+import asyncio
+from types import SimpleNamespace
+
+from models import ItemListaFixa
+
+
+def test_paginacao_de_listas_fixas(sqlite):
+    itens = [ItemListaFixa(id='a', nome='Arroz', quantidade=2)]
+
+    async def scenario():
+        for nome in ('Semanal', 'Mensal', 'Feira'):
+            await sqlite.create_lista_fixa(SimpleNamespace(nome=nome, itens=itens))
+        first, cursor = await sqlite.list_page('listas_fixas', limit=2, sort='nome', fields='id,nome,itens')
+        rest, end = await sqlite.list_page('listas_fixas', limit=2, cursor=cursor, sort='nome', fields='id,nome,itens')
+        return first, rest, end
+
+    first, rest, end = asyncio.run(scenario())
+    assert [lista['nome'] for lista in first + rest] == ['Feira', 'Mensal', 'Semanal']
+    assert first[0] == {'id': 3, 'nome': 'Feira', 'itens': [itens[0].model_dump()]}
+    assert end is None
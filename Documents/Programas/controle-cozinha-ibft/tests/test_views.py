@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from views import IncrementalView
+
+
+class Clock:
+    """Relógio controlado pelo teste (só o da visão; o do event loop continua o real)"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Ids(IncrementalView):
+    """Visão mínima: IDs do estoque, lidos de uma lista que faz as vezes do backend"""
+
+    entities = ('estoque',)
+
+    def __init__(self, source, max_age: float = 300, clock=None):
+        super().__init__(backend=None, max_age=max_age, clock=clock or Clock())
+        self.source = source
+        self.ids = set()
+        self.rebuilds = 0
+
+    async def rebuild(self):
+        self.rebuilds += 1
+        snapshot = set(self.source)
+        await asyncio.sleep(0.01)
+        self.ids = snapshot
+
+    def update(self, entity, action, item_id, item=None):
+        if action == 'delete':
+            self.ids.discard(item_id)
+        else:
+            self.ids.add(item_id)
+
+
+def test_subclasse_precisa_de_rebuild_e_update():
+    class Incompleta(IncrementalView):
+        async def rebuild(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incompleta(backend=None)
+
+
+def test_reaplica_alteracoes_feitas_durante_a_reconstrucao():
+    view = Ids([1, 2])
+
+    async def scenario():
+        loading = asyncio.create_task(view.ensure_loaded())
+        await asyncio.sleep(0)
+        view.apply('estoque', 'create', 3)
+        view.apply('estoque', 'delete', 1)
+        view.apply('pratos', 'create', 9)
+        await loading
+        await view.ensure_loaded()
+
+    asyncio.run(scenario())
+    assert view.ids == {2, 3}
+    assert view.rebuilds == 1
+
+
+def test_ignora_alteracoes_antes_da_primeira_carga_e_reconstroi_apos_max_age():
+    source, clock = [1], Clock()
+    view = Ids(source, max_age=60, clock=clock)
+
+    view.apply('estoque', 'create', 5)
+    asyncio.run(view.ensure_loaded())
+    assert view.ids == {1}
+
+    source.append(7)
+    clock.now += 30
+    asyncio.run(view.ensure_loaded())
+    assert view.ids == {1}
+
+    clock.now += 31
+
+    async def refresh():
+        await view.ensure_loaded()
+        await view._refreshing
+
+    asyncio.run(refresh())
+    assert view.ids == {1, 7}
+    assert view.rebuilds == 2
+
+
+def test_estado_velho_continua_servindo_durante_a_reconstrucao():
+    source, clock = [1], Clock()
+    view = Ids(source, max_age=60, clock=clock)
+    asyncio.run(view.ensure_loaded())
+    source.append(7)
+    clock.now += 61
+
+    async def scenario():
+        await view.ensure_loaded()
+        # A consulta não esperou: a reconstrução segue em segundo plano, com o estado anterior em uso
+        during = set(view.ids)
+        view.apply('estoque', 'create', 8)
+        with_change = set(view.ids)
+        await view.ensure_loaded()
+        await view._refreshing
+        return during, with_change
+
+    during, with_change = asyncio.run(scenario())
+    assert during == {1}
+    assert with_change == {1, 8}
+    assert view.ids == {1, 7, 8}
+    assert view.rebuilds == 2
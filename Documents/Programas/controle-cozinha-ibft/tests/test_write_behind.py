@@ -0,0 +1,92 @@
+import asyncio
+
+from write_behind import WriteBehindQueue
+
+
+class Sheet:
+    """Destino lento das gravações: registra os lotes e se cada um era nova tentativa"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.rows = []
+        self.calls = []
+
+    async def flush_batch(self, rows, retrying):
+        self.calls.append((len(rows), retrying))
+        if retrying:
+            rows = [row for row in rows if row not in self.rows]
+        await asyncio.sleep(self.delay)
+        self.rows.extend(rows)
+
+
+def test_grava_em_lote_ao_atingir_max_items():
+    sheet = Sheet()
+
+    async def scenario():
+        queue = WriteBehindQueue(sheet.flush_batch, interval=60, max_items=2)
+        queue.start()
+        queue.put([1])
+        queue.put([2])
+        await asyncio.sleep(0.01)
+        pending = queue.pending
+        await queue.stop()
+        return pending
+
+    assert asyncio.run(scenario()) == []
+    assert sheet.rows == [[1], [2]]
+    assert sheet.calls == [(2, False)]
+
+
+def test_stop_aguarda_gravacao_em_andamento():
+    sheet = Sheet(delay=0.1)
+
+    async def scenario():
+        queue = WriteBehindQueue(sheet.flush_batch, interval=60, max_items=1)
+        queue.start()
+        queue.put([1])
+        await asyncio.sleep(0.02)
+        await queue.stop()
+        return queue.pending
+
+    assert asyncio.run(scenario()) == []
+    assert sheet.rows == [[1]]
+    assert sheet.calls == [(1, False)]
+
+
+def test_gravacao_cancelada_e_conferida_na_proxima():
+    sheet = Sheet(delay=0.1)
+
+    async def scenario():
+        queue = WriteBehindQueue(sheet.flush_batch, interval=60, max_items=1)
+        queue.put([1])
+        flushing = asyncio.create_task(queue.flush())
+        await asyncio.sleep(0.02)
+        flushing.cancel()
+        await asyncio.gather(flushing, return_exceptions=True)
+        # A gravação cancelada chegou ao destino mesmo assim
+        sheet.rows.append([1])
+        await queue.flush()
+
+    asyncio.run(scenario())
+    assert sheet.rows == [[1]]
+    assert sheet.calls == [(1, False), (1, True)]
+
+
+def test_stop_grava_pendencias_apos_falha():
+    attempts = []
+
+    async def flush_batch(rows, retrying):
+        attempts.append(retrying)
+        if len(attempts) == 1:
+            raise RuntimeError("falha simulada")
+
+    async def scenario():
+        queue = WriteBehindQueue(flush_batch, interval=60, max_items=1, retry_delay=60)
+        queue.start()
+        queue.put([1])
+        await asyncio.sleep(0.02)
+        await queue.stop()
+        return queue.pending
+
+    assert asyncio.run(scenario()) == []
+    assert attempts == [False, True]
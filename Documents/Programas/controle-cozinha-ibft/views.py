@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class IncrementalView(ABC):
+    """Estado derivado mantido a partir das alterações do backend (apply é ouvinte do backend) e
+    reconstruído das leituras completas na primeira vez e a cada max_age, para absorver alterações
+    feitas fora deste processo. A reconstrução periódica roda em segundo plano: as consultas
+    continuam usando o estado atual enquanto isso"""
+
+    # Entidades que alteram o estado; None: todas
+    entities: Optional[Tuple[str, ...]] = None
+
+    def __init__(self, backend, max_age: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.max_age = max_age
+        self._clock = clock
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._loading = False
+        self._pending_changes = []
+        self._refreshing: Optional[asyncio.Task] = None
+
+    def _is_outdated(self) -> bool:
+        """Estado inutilizável sem reconstruir (nunca carregado): a consulta espera pela reconstrução"""
+        return self._loaded_at is None
+
+    def _is_stale(self) -> bool:
+        return self._is_outdated() or self._clock() - self._loaded_at > self.max_age
+
+    @abstractmethod
+    async def rebuild(self):
+        """Reconstruir o estado a partir das leituras completas do backend"""
+
+    @abstractmethod
+    def update(self, entity: str, action: str, item_id: int, item=None):
+        """Aplicar uma alteração ao estado já carregado; deve ser idempotente"""
+
+    async def _load(self):
+        self._loading = True
+        try:
+            await self.rebuild()
+            self._loaded_at = self._clock()
+        finally:
+            self._loading = False
+            # Alterações ocorridas durante a leitura são reaplicadas (update é idempotente)
+            pending, self._pending_changes = self._pending_changes, []
+            for change in pending:
+                self.apply(*change)
+
+    async def ensure_loaded(self):
+        """Carregar o estado na primeira vez e, quando ficar velho, reconstruí-lo em segundo plano"""
+        if self._is_outdated():
+            async with self._lock:
+                if self._is_outdated():
+                    await self._load()
+        elif self._is_stale() and self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh())
+
+    async def _refresh(self):
+        try:
+            async with self._lock:
+                if self._is_stale():
+                    await self._load()
+        except Exception:
+            # O estado atual continua valendo; a próxima consulta tenta de novo
+            logger.exception("Falha ao reconstruir %s", type(self).__name__)
+        finally:
+            self._refreshing = None
+            # Sem reconstrução (já feita por outra consulta), as alterações guardadas já estão no estado
+            self._pending_changes = []
+
+    def apply(self, entity: str, action: str, item_id: int, item=None):
+        """Aplicar uma criação/atualização/remoção avisada pelo backend"""
+        if self.entities is not None and entity not in self.entities:
+            return
+        if self._loading or self._refreshing is not None:
+            # Aplicada também ao estado atual, que continua em uso durante a reconstrução
+            self._pending_changes.append((entity, action, item_id, item))
+        if self._loaded_at is not None:
+            self.update(entity, action, item_id, item)
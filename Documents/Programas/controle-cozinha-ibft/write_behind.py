@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Gravação de um lote: (linhas, é_nova_tentativa) -> None; deve lançar exceção em caso de falha
+FlushBatch = Callable[[List[list], bool], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """Fila de linhas confirmadas ao cliente e gravadas depois, em lotes, por uma tarefa de fundo"""
+
+    def __init__(self, flush_batch: FlushBatch, interval: float = 5, max_items: int = 20,
+                 retry_delay: float = 2, max_retry_delay: float = 60):
+        self.flush_batch = flush_batch
+        self.interval = interval
+        self.max_items = max_items
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._pending: List[list] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._flushing = False
+        self._stopping = False
+
+    @property
+    def pending(self) -> List[list]:
+        """Linhas ainda não gravadas na planilha"""
+        return list(self._pending)
+
+    def put(self, row: list):
+        """Enfileirar uma linha; dispara a gravação ao atingir max_items"""
+        self._pending.append(row)
+        if len(self._pending) >= self.max_items:
+            self._wakeup.set()
+
+    def start(self):
+        """Iniciar a tarefa de gravação em segundo plano"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Parar a tarefa de fundo e tentar gravar o que ainda estiver pendente"""
+        if self._task is not None:
+            self._stopping = True
+            # Uma gravação em andamento termina: a thread do executor não seria interrompida pelo cancelamento
+            if self._flushing:
+                self._wakeup.set()
+            else:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._stopping = False
+        if self._pending:
+            await self.flush()
+
+    async def flush(self):
+        """Gravar as linhas pendentes num único lote"""
+        batch = self._pending[:]
+        if not batch:
+            return
+        try:
+            await self.flush_batch(batch, self._failures > 0)
+        except asyncio.CancelledError:
+            # O lote pode ter chegado à planilha: a próxima gravação confere antes de repetir
+            self._failures += 1
+            raise
+        # Novas linhas podem ter chegado durante a gravação
+        del self._pending[:len(batch)]
+        self._failures = 0
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            self._flushing = True
+            try:
+                await self.flush()
+                delay = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Mantém o lote na fila e tenta de novo com espera exponencial
+                self._failures += 1
+                delay = min(self.retry_delay * 2 ** (self._failures - 1), self.max_retry_delay)
+                logger.exception("Falha ao gravar %d linha(s) pendentes; nova tentativa em %.1fs",
+                                 len(self._pending), delay)
+            finally:
+                self._flushing = False
+            if self._stopping:
+                return
+            if delay:
+                await asyncio.sleep(delay)